@@ -0,0 +1,4 @@
+"""
+Ядро лаунчера Nova: логика, не зависящая от Qt (кэши, сеть, данные).
+Модули этого пакета не должны импортировать PySide6.
+"""
@@ -0,0 +1,142 @@
+"""
+Индекс наличия объектов ассетов.
+
+Объекты ассетов (assets/objects/<2 символа>/<sha1>) общие для всех версий,
+и при переходе на соседнюю версию почти все они уже на месте. Чтобы не
+проверять тысячи файлов (stat и sha1) при каждой установке и запуске,
+проверенные объекты записываются в индекс assets/objects_present.json:
+хэш -> размер. Установщик качает только то, чего в индексе нет.
+
+Изменения на диске в обход лаунчера (удаление, чистка) видны по времени
+изменения папок-префиксов: для каждой из 256 папок в индексе хранится ее
+mtime, и если он другой, папка перечитывается (только ее список файлов).
+Объекты, которых нет в индексе, но которые лежат на диске, HttpClient
+проверяет по sha1 и не перекачивает - после этого они попадают в индекс.
+"""
+import os
+import json
+import threading
+
+OBJECT_INDEX_FILE = "objects_present.json" # В папке assets
+OBJECT_INDEX_FORMAT = 1 # Увеличить при изменении формата файла
+
+
+class AssetObjectIndex:
+    """Проверенные объекты ассетов одной папки данных (потокобезопасно)."""
+
+    def __init__(self, minecraft_directory: str):
+        self.objects_dir = os.path.join(minecraft_directory, "assets", "objects")
+        self.path = os.path.join(minecraft_directory, "assets", OBJECT_INDEX_FILE)
+        self._objects: dict[str, int | None] = {} # sha1 -> размер
+        self._dirs: dict[str, int] = {} # префикс -> mtime_ns папки на момент сохранения
+        self._dirty = set() # Префиксы, пополненные или сверенные с диском после сохранения
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def missing(self, objects: dict) -> list[str]:
+        """
+        Хэши из objects (sha1 -> размер), которых нет в индексе, в порядке сортировки.
+        Папки, изменившиеся после сохранения индекса, перечитываются.
+        """
+        with self._lock:
+            self._load_locked()
+            changed = {}
+            for prefix in {filehash[:2] for filehash in objects}:
+                mtime = self._changed_mtime_locked(prefix)
+                if mtime is not False:
+                    changed[prefix] = mtime
+            if changed:
+                known = {}
+                for filehash in self._objects:
+                    if filehash[:2] in changed:
+                        known.setdefault(filehash[:2], []).append(filehash)
+                for prefix, mtime in changed.items():
+                    self._rescan_prefix_locked(prefix, mtime, known.get(prefix, []))
+            return [filehash for filehash, size in sorted(objects.items())
+                    if filehash not in self._objects or (size is not None and self._objects[filehash] != size)]
+
+    def add(self, filehash: str, size: int | None):
+        """Отмечает объект как проверенный (вызывается после успешной загрузки или проверки)."""
+        with self._lock:
+            self._objects[filehash] = size
+            self._dirty.add(filehash[:2])
+
+    def save(self):
+        """Атомарно сохраняет индекс, запоминая mtime папок, в которые добавлялись объекты."""
+        with self._lock:
+            if not self._dirty:
+                return
+            for prefix in self._dirty:
+                try:
+                    self._dirs[prefix] = os.stat(os.path.join(self.objects_dir, prefix)).st_mtime_ns
+                except OSError:
+                    self._dirs.pop(prefix, None)
+            self._dirty.clear()
+            data = {"format": OBJECT_INDEX_FORMAT, "dirs": self._dirs, "objects": self._objects}
+            tmp_path = self.path + ".tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except (IOError, OSError) as e:
+                print(f"Ошибка сохранения индекса ассетов '{self.path}': {e}")
+
+    # --- Внутреннее ---
+
+    def _load_locked(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Ошибка чтения индекса ассетов '{self.path}': {e}")
+            return
+        if not isinstance(data, dict) or data.get("format") != OBJECT_INDEX_FORMAT:
+            return
+        self._objects = dict(data.get("objects", {}))
+        self._dirs = dict(data.get("dirs", {}))
+
+    def _changed_mtime_locked(self, prefix: str):
+        """False - папка не менялась с сохранения индекса (или уже сверена в этом сеансе), иначе ее mtime (None - папки нет)."""
+        if prefix in self._dirty:
+            return False
+        try:
+            mtime = os.stat(os.path.join(self.objects_dir, prefix)).st_mtime_ns
+        except OSError:
+            return None
+        return False if self._dirs.get(prefix) == mtime else mtime
+
+    def _rescan_prefix_locked(self, prefix: str, mtime: int | None, known: list[str]):
+        """Убирает из индекса объекты папки, удаленные или подмененные в обход лаунчера."""
+        present = {}
+        if mtime is not None and known:
+            with os.scandir(os.path.join(self.objects_dir, prefix)) as entries:
+                present = {entry.name: entry for entry in entries if entry.name in self._objects}
+        for filehash in known:
+            entry = present.get(filehash)
+            size = self._objects[filehash]
+            try:
+                if entry is None or (size is not None and entry.stat().st_size != size):
+                    del self._objects[filehash] # Удален или подменен - проверит и докачает установщик
+            except OSError:
+                del self._objects[filehash]
+        self._dirty.add(prefix)
+
+
+_indexes: dict[str, AssetObjectIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_object_index(minecraft_directory: str) -> AssetObjectIndex:
+    """Общий индекс папки данных (одновременные установки из очереди пользуются одним)."""
+    key = os.path.normcase(os.path.abspath(minecraft_directory))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = AssetObjectIndex(minecraft_directory)
+        return index
@@ -0,0 +1,325 @@
+"""
+Режим без интерфейса: python main.py --headless <команда> [параметры].
+
+Команды:
+  list-versions [--all] [--installed]  - версии (по фильтрам из настроек)
+  install <версия> [<версия> ...]      - установить/докачать версии и Java
+  launch <профиль> [--version V] [--wait] - подготовить и запустить игру профиля
+  serve-cache [--port P] [--bind ADDR] [--no-fetch] - раздавать кэш по локальной сети
+  shared-libraries                     - библиотеки, общие для нескольких установленных версий
+
+Для скриптов каждая строка stdout - JSON-событие, например
+{"event": "progress", "value": 10, "total": 250}. Обычные сообщения
+лаунчера (print) в этом режиме идут в stderr. Результат - код выхода EXIT_*.
+PySide6 здесь не импортируется.
+"""
+import os
+import sys
+import json
+import argparse
+import threading
+
+from core.settings import SettingsManager, ProfileManager, MINECRAFT_VERSION
+from core.launch import LAUNCHER_VERSION
+from core.jobs import get_scheduler, PRIORITY_HIGH
+
+# --- Коды выхода ---
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2 # Неверные аргументы (так же завершается argparse)
+EXIT_NOT_FOUND = 3 # Нет такой версии или профиля
+EXIT_NETWORK = 4 # Нужна сеть, а она недоступна
+EXIT_INTERRUPTED = 130
+
+# Те же файлы, что и у окна лаунчера (main.py)
+VERSION_MANIFEST_CACHE_FILE = os.path.join("Resources", "cache", "versions", "version_manifest_v2.json")
+VERSION_FILTERS = {
+    "release": "show_releases",
+    "snapshot": "show_snapshots",
+    "old_beta": "show_betas",
+    "old_alpha": "show_alphas",
+}
+
+
+class EventWriter:
+    """Пишет JSON-события построчно в поток (из любого потока)."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields):
+        line = json.dumps(dict(event=event, **fields), ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def installer_callback(self) -> dict:
+        """Callback-словарь для core.installer: прогресс - не чаще смены процента."""
+        state = {"max": 0, "percent": -1}
+
+        def set_max(value):
+            state["max"] = value + 1 # Установщик передает число элементов - 1 (как minecraft_launcher_lib)
+            state["percent"] = -1
+
+        def set_progress(value):
+            maximum = state["max"]
+            percent = value * 100 // maximum if maximum > 0 else 100
+            if percent != state["percent"]:
+                state["percent"] = percent
+                self.emit("progress", value=value, total=maximum)
+
+        return {
+            "setStatus": lambda status: self.emit("status", status=status),
+            "setProgress": set_progress,
+            "setMax": set_max,
+        }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py --headless", description="Nova Launcher без интерфейса")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list-versions", help="Список версий")
+    list_parser.add_argument("--all", action="store_true", help="Не применять фильтры версий из настроек")
+    list_parser.add_argument("--installed", action="store_true", help="Только установленные версии")
+
+    install_parser = commands.add_parser("install", help="Установить версии")
+    install_parser.add_argument("versions", nargs="+", metavar="version",
+                                help="Несколько версий ставятся через очередь установки (общие файлы качаются один раз)")
+
+    launch_parser = commands.add_parser("launch", help="Запустить игру профиля")
+    launch_parser.add_argument("profile", help="UUID, название профиля или имя игрока")
+    launch_parser.add_argument("--version", help="Версия (по умолчанию - версия профиля)")
+    launch_parser.add_argument("--wait", action="store_true", help="Дождаться выхода из игры и вернуть ее код")
+
+    serve_parser = commands.add_parser("serve-cache", help="Раздавать свой кэш другим лаунчерам (зеркало)")
+    serve_parser.add_argument("--port", type=int, help="Порт (по умолчанию - из настроек)")
+    serve_parser.add_argument("--bind", default="0.0.0.0", help="Адрес, на котором слушать")
+    serve_parser.add_argument("--no-fetch", action="store_true",
+                              help="Отдавать только то, что уже скачано (не докачивать из источника)")
+
+    commands.add_parser("shared-libraries", help="Библиотеки, общие для нескольких установленных версий")
+    return parser
+
+
+def _configure_network(settings: SettingsManager):
+    """То же, что NovaLauncher._configure_network, но проверка сети не нужна заранее."""
+    from core.http import configure_client
+    from core.versions import set_manifest_cache_file
+    from core.connectivity import get_monitor
+    set_manifest_cache_file(VERSION_MANIFEST_CACHE_FILE)
+    get_monitor().set_forced_offline(settings.get("offline_mode"))
+    configure_client(
+        timeout=settings.get("http_timeout_sec"),
+        retries=settings.get("http_retries"),
+        max_per_host=settings.get("http_max_per_host"),
+        bandwidth_limit=settings.get("download_limit_kbps") * 1024,
+        user_agent=f"NovaLauncher/{LAUNCHER_VERSION}",
+        mirror=settings.get("mirror_url"),
+    )
+
+
+def _exit_code(error: BaseException) -> int:
+    """Код выхода по исключению (с учетом цепочки причин)."""
+    import requests
+    from minecraft_launcher_lib.exceptions import VersionNotFound
+    while error is not None:
+        if isinstance(error, VersionNotFound):
+            return EXIT_NOT_FOUND
+        if isinstance(error, requests.exceptions.RequestException):
+            return EXIT_NETWORK
+        error = error.__cause__
+    return EXIT_ERROR
+
+
+def _install(version: str, settings: SettingsManager, events: EventWriter, minecraft_directory: str) -> str:
+    """
+    Установка через общий планировщик (как в окне лаунчера). Ctrl+C отменяет
+    задачу; недокачанные файлы докачиваются при следующем запуске команды.
+    """
+    from core import installer
+    job = installer.submit_install(version, minecraft_directory, settings.get("java_path") or None,
+                                   events.installer_callback(), PRIORITY_HIGH)
+    try:
+        return job.result()
+    except KeyboardInterrupt:
+        job.cancel()
+        raise
+
+
+# --- Команды ---
+
+def cmd_list_versions(args, settings: SettingsManager, events: EventWriter) -> int:
+    import requests
+    from core.launch import get_minecraft_directory
+    from core.versions import get_version_list, get_installed_versions
+
+    installed = dict(get_installed_versions(get_minecraft_directory()))
+    versions = []
+    code = EXIT_OK
+    if not args.installed:
+        try:
+            versions = [(v["id"], v.get("type")) for v in get_version_list()]
+        except requests.exceptions.RequestException as e:
+            events.emit("error", message=f"Не удалось получить список версий: {e}")
+            code = EXIT_NETWORK
+    # Установленные версии, которых нет в манифесте (модлоадеры), - в начале списка
+    known = {version_id for version_id, _ in versions}
+    versions = [item for item in installed.items() if item[0] not in known] + versions
+
+    for version_id, version_type in versions:
+        if not args.all and version_id not in installed and not settings.get(VERSION_FILTERS.get(version_type, "")):
+            continue
+        events.emit("version", id=version_id, type=version_type, installed=version_id in installed)
+    return code
+
+
+def cmd_install(args, settings: SettingsManager, events: EventWriter) -> int:
+    from core.launch import get_minecraft_directory
+    versions = list(dict.fromkeys(args.versions))
+    if len(versions) == 1:
+        java_path = _install(versions[0], settings, events, get_minecraft_directory())
+        events.emit("done", version=versions[0], java=java_path)
+        return EXIT_OK
+    return _install_many(versions, settings, events, get_minecraft_directory())
+
+
+def _install_many(versions: list[str], settings: SettingsManager, events: EventWriter, minecraft_directory: str) -> int:
+    """
+    Установка нескольких версий через очередь (без сохранения на диск).
+    Событие "queue" - смена статуса, этапа или процента версии, с общим прогрессом.
+    Код выхода - по первой неудачной версии.
+    """
+    from core.install_queue import InstallQueue, STATUS_DONE
+    queue = InstallQueue(minecraft_directory, max_parallel=settings.get("install_queue_parallel"),
+                         java_path=settings.get("java_path") or None, priority=PRIORITY_HIGH)
+
+    def on_changed(version):
+        if version is None:
+            return
+        entry = next((e for e in queue.entries() if e.version == version), None)
+        if entry is None:
+            return
+        percent, done, total = queue.overall_progress()
+        events.emit("queue", version=version, status=entry.status, stage=entry.stage, percent=entry.percent,
+                    overall=percent, installed=done, total=total)
+
+    queue.add_listener(on_changed)
+    queue.add(versions)
+    queue.start()
+    try:
+        while not queue.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        queue.cancel_all()
+        raise
+
+    code = EXIT_OK
+    for entry in queue.entries():
+        if entry.status == STATUS_DONE:
+            events.emit("done", version=entry.version)
+        else:
+            events.emit("error", version=entry.version, message=entry.error or entry.status)
+            if code == EXIT_OK:
+                code = _exit_code(entry.exception) if entry.exception is not None else EXIT_ERROR
+    return code
+
+
+def _find_profile(profiles: ProfileManager, key: str) -> tuple[str, dict] | None:
+    """Профиль по UUID, названию или имени игрока (без учета регистра)."""
+    if key in profiles.profiles:
+        return key, profiles.profiles[key]
+    for field in ("name", "username"):
+        for profile_uuid, profile in profiles.get_all_profiles().items():
+            if str(profile.get(field, "")).lower() == key.lower():
+                return profile_uuid, profile
+    return None
+
+
+def cmd_launch(args, settings: SettingsManager, events: EventWriter) -> int:
+    from core.launch import get_minecraft_directory, build_command, start_game
+
+    profiles = ProfileManager()
+    found = _find_profile(profiles, args.profile)
+    if found is None:
+        events.emit("error", message=f"Профиль не найден: {args.profile}",
+                    profiles=[p.get("name") for p in profiles.get_all_profiles().values()])
+        return EXIT_NOT_FOUND
+    profile_uuid, profile = found
+    version = args.version or profile.get("version") or MINECRAFT_VERSION
+    min_mem, max_mem = settings.memory_limits(profile)
+
+    minecraft_directory = get_minecraft_directory()
+    java_path = _install(version, settings, events, minecraft_directory)
+    # Установку могли начать с другой Java (очередь) - для запуска берем ту, что нужна именно этой версии
+    from core import installer
+    java_path = installer.resolve_java(version, minecraft_directory, settings.get("java_path") or None) or java_path
+    command = build_command(version, minecraft_directory, java_path, profile["username"], min_mem, max_mem)
+    process = start_game(command, minecraft_directory)
+    events.emit("launched", profile=profile_uuid, version=version, pid=process.pid)
+    if not args.wait:
+        return EXIT_OK
+    code = process.wait()
+    events.emit("exited", code=code)
+    return code
+
+
+def cmd_serve_cache(args, settings: SettingsManager, events: EventWriter) -> int:
+    """Раздача до Ctrl+C (код выхода EXIT_INTERRUPTED)."""
+    from core.launch import get_minecraft_directory
+    from core.mirror import CacheServer
+    server = CacheServer(get_minecraft_directory(), host=args.bind, port=args.port or settings.get("serve_cache_port"),
+                         fetch_missing=not args.no_fetch)
+    try:
+        server.start()
+    except OSError as e:
+        events.emit("error", message=f"Не удалось открыть порт: {e}")
+        return EXIT_ERROR
+    events.emit("serving", host=args.bind, port=server.port)
+    server.serve_forever()
+    return EXIT_OK
+
+
+def cmd_shared_libraries(args, settings: SettingsManager, events: EventWriter) -> int:
+    """Событие "library" на каждый общий файл, затем "shared" - итог (сколько места экономит общая папка)."""
+    from core.launch import get_minecraft_directory
+    from core.libraries import get_resolver
+    minecraft_directory = get_minecraft_directory()
+    shared = get_resolver(minecraft_directory).shared_libraries()
+    saved_bytes = 0
+    for path, versions in shared.items():
+        size = os.path.getsize(path) if os.path.isfile(path) else None
+        saved_bytes += (size or 0) * (len(versions) - 1)
+        events.emit("library", path=os.path.relpath(path, minecraft_directory), versions=versions, size=size)
+    events.emit("shared", libraries=len(shared), saved_bytes=saved_bytes)
+    return EXIT_OK
+
+
+COMMANDS = {
+    "list-versions": cmd_list_versions,
+    "install": cmd_install,
+    "launch": cmd_launch,
+    "serve-cache": cmd_serve_cache,
+    "shared-libraries": cmd_shared_libraries,
+}
+
+
+def main(argv: list[str]) -> int:
+    """Точка входа режима --headless. Возвращает код выхода."""
+    args = _build_parser().parse_args([arg for arg in argv if arg != "--headless"])
+    events = EventWriter(sys.stdout)
+    sys.stdout = sys.stderr # stdout - только для событий
+    try:
+        settings = SettingsManager()
+        _configure_network(settings)
+        return COMMANDS[args.command](args, settings, events)
+    except KeyboardInterrupt:
+        events.emit("error", message="Прервано")
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        events.emit("error", message=str(e) or type(e).__name__)
+        return _exit_code(e)
+    finally:
+        get_scheduler().shutdown()
+        sys.stdout = events.stream
@@ -0,0 +1,201 @@
+import time
+import socket
+import threading
+import ipaddress
+import urllib.parse
+
+# --- Константы проверки сети ---
+# Проверяем доступность именно тех хостов, с которыми работает лаунчер:
+# DNS-запрос + TCP-рукопожатие, без TLS и HTTP
+PROBE_HOSTS = (
+    ("launchermeta.mojang.com", 443),
+    ("piston-meta.mojang.com", 443),
+    ("resources.download.minecraft.net", 443),
+)
+PROBE_DEADLINE = 2.0 # сек на всю проверку
+ONLINE_TTL = 5 * 60 # Сколько доверяем результату "в сети"
+OFFLINE_TTL = 15 # Как часто перепроверяем в офлайне
+
+
+def is_local_url(url: str) -> bool:
+    """Адрес в локальной сети (localhost, 127.x, 10.x, 192.168.x ...) - доступен и без интернета."""
+    host = (urllib.parse.urlsplit(url).hostname or "").lower()
+    if host in ("", "localhost") or host.endswith(".local"):
+        return True
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return address.is_loopback or address.is_private or address.is_link_local
+
+
+class ConnectivityMonitor:
+    """
+    Следит за доступностью серверов Mojang.
+
+    Проверка - параллельные TCP-подключения к PROBE_HOSTS с общим коротким
+    дедлайном; достаточно одного успешного. Результат кэшируется
+    (ONLINE_TTL / OFFLINE_TTL), повторные вызовы check_async() во время
+    проверки ничего не запускают. Успешные и неудачные запросы HTTP-клиента
+    тоже сообщаются сюда (report_success / report_failure), так что лишних
+    проверок почти не бывает. Офлайн-режим можно включить принудительно.
+    """
+
+    def __init__(self, hosts=PROBE_HOSTS, deadline: float = PROBE_DEADLINE):
+        self.hosts = tuple(hosts)
+        self.deadline = deadline
+        self._online = None # None - еще не проверяли
+        self._checked_at = 0.0
+        self._forced_offline = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._done.set()
+        self._listeners = [] # callback(online: bool)
+
+    # --- Состояние ---
+
+    @property
+    def online(self) -> bool | None:
+        """Последний известный результат (None - неизвестно)."""
+        if self._forced_offline:
+            return False
+        return self._online
+
+    @property
+    def forced_offline(self) -> bool:
+        return self._forced_offline
+
+    def set_forced_offline(self, forced: bool):
+        """Принудительный офлайн-режим (настройка пользователя)."""
+        forced = bool(forced)
+        if forced == self._forced_offline:
+            return
+        before = self.online
+        self._forced_offline = forced
+        if not forced:
+            self.check_async(force=True)
+        self._notify(before)
+
+    def is_offline(self, wait: bool = True) -> bool:
+        """
+        True, если сеть недоступна. Если проверка еще идет, ждет ее не дольше
+        дедлайна, чтобы первые запросы не упирались в длинные таймауты.
+        """
+        if self._forced_offline:
+            return True
+        if self._is_stale():
+            self.check_async()
+        if wait and self._online is None:
+            self._done.wait(self.deadline)
+        return self._online is False
+
+    def _is_stale(self) -> bool:
+        if self._online is None:
+            return True
+        ttl = ONLINE_TTL if self._online else OFFLINE_TTL
+        return time.monotonic() - self._checked_at > ttl
+
+    def add_listener(self, callback):
+        """Подписка на смену состояния: callback(online). Вызывается из фонового потока."""
+        self._listeners.append(callback)
+
+    # --- Проверка ---
+
+    def check_async(self, force: bool = False):
+        """Запускает фоновую проверку, если результат устарел и проверка еще не идет."""
+        with self._lock:
+            if not self._done.is_set() or (not force and not self._is_stale()):
+                return
+            self._done.clear()
+        threading.Thread(target=self._run_check, name="ConnectivityCheck", daemon=True).start()
+
+    def check(self) -> bool:
+        """Синхронная проверка (не дольше дедлайна)."""
+        self.check_async(force=True)
+        self._done.wait(self.deadline + 0.5)
+        return self.online is True
+
+    def _run_check(self):
+        try:
+            self._set_online(self._probe())
+        finally:
+            self._done.set()
+
+    def _probe(self) -> bool:
+        found = threading.Event()
+        remaining = [len(self.hosts)]
+        finished = threading.Event()
+        lock = threading.Lock()
+
+        def probe(address):
+            try:
+                with socket.create_connection(address, timeout=self.deadline):
+                    found.set()
+            except OSError:
+                pass
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    if remaining[0] == 0:
+                        finished.set()
+
+        for address in self.hosts:
+            threading.Thread(target=probe, args=(address,), name="ConnectivityProbe", daemon=True).start()
+
+        # Ждем первого успеха, но не дольше дедлайна и не дольше, чем все пробы завершатся
+        end = time.monotonic() + self.deadline
+        while not found.is_set() and not finished.is_set():
+            left = end - time.monotonic()
+            if left <= 0:
+                break
+            found.wait(min(left, 0.05))
+        return found.is_set()
+
+    # --- Пассивные сигналы от HTTP-клиента ---
+
+    def report_success(self):
+        """Запрос к удаленному хосту прошел - значит, сеть есть."""
+        if self._online is not True:
+            self._set_online(True)
+        else:
+            self._checked_at = time.monotonic()
+
+    def report_failure(self):
+        """Ошибка соединения - перепроверяем сеть в фоне."""
+        self.check_async(force=True)
+
+    def _set_online(self, online: bool):
+        before = self.online
+        self._online = online
+        self._checked_at = time.monotonic()
+        self._notify(before)
+
+    def _notify(self, before):
+        after = self.online
+        if before == after or after is None:
+            return # Состояние пока неизвестно (офлайн-режим выключили до первой проверки) - сообщит проверка
+        print(f"Состояние сети: {'в сети' if after else 'офлайн'}")
+        for callback in list(self._listeners):
+            try:
+                callback(bool(after))
+            except Exception as e:
+                print(f"Ошибка обработчика состояния сети: {e}")
+
+
+# --- Общий монитор лаунчера ---
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> ConnectivityMonitor:
+    """Возвращает общий монитор сети (создается при первом обращении)."""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = ConnectivityMonitor()
+    return _monitor
+
+
+def is_offline(wait: bool = True) -> bool:
+    return get_monitor().is_offline(wait)
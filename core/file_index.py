@@ -0,0 +1,117 @@
+"""
+Индекс проверенных файлов установки.
+
+Библиотеки, jar клиента, индексы ассетов, конфигурации логирования и файлы
+Java Runtime при каждой установке и запуске сверяются с описанием версии по
+sha1, а чтение и хэширование сотен мегабайт заметно дольше самой проверки. Поэтому
+файл, прошедший проверку (или только что скачанный с верной суммой),
+записывается в индекс verified_files.json в папке данных: путь -> размер,
+mtime и sha1. Пока размер и время изменения файла на диске те же, а
+ожидаемая сумма не поменялась, HttpClient его не перечитывает.
+
+Объекты ассетов сюда не попадают - у них свой индекс (core.assets).
+"""
+import os
+import json
+import threading
+
+FILE_INDEX_FILE = "verified_files.json" # В папке данных
+FILE_INDEX_FORMAT = 1 # Увеличить при изменении формата файла
+
+
+class VerifiedFileIndex:
+    """Проверенные файлы одной папки данных (потокобезопасно)."""
+
+    def __init__(self, minecraft_directory: str):
+        self.root = os.path.abspath(minecraft_directory)
+        self.path = os.path.join(minecraft_directory, FILE_INDEX_FILE)
+        self._files: dict[str, list] = {} # относительный путь -> [размер, mtime_ns, sha1]
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+
+    def is_verified(self, path: str, sha1: str, size: int | None = None) -> bool:
+        """Файл уже проверен на эту sha1 и с тех пор не менялся (размер и mtime те же)."""
+        key = self._key(path)
+        if key is None:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        with self._lock:
+            self._load_locked()
+            entry = self._files.get(key)
+        return (entry is not None and entry == [stat.st_size, stat.st_mtime_ns, sha1]
+                and (size is None or stat.st_size == size))
+
+    def add(self, path: str, sha1: str):
+        """Отмечает файл как проверенный (вызывается после успешной загрузки или проверки)."""
+        key = self._key(path)
+        if key is None:
+            return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self._load_locked()
+            self._files[key] = [stat.st_size, stat.st_mtime_ns, sha1]
+            self._dirty = True
+
+    def save(self):
+        """Атомарно сохраняет индекс, если он пополнялся."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = {"format": FILE_INDEX_FORMAT, "files": self._files}
+            tmp_path = self.path + ".tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except (IOError, OSError) as e:
+                print(f"Ошибка сохранения индекса файлов '{self.path}': {e}")
+
+    # --- Внутреннее ---
+
+    def _key(self, path: str) -> str | None:
+        """Путь относительно папки данных (None - файл вне ее)."""
+        relative = os.path.relpath(os.path.abspath(path), self.root)
+        if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+            return None
+        return os.path.normcase(relative).replace(os.sep, "/")
+
+    def _load_locked(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Ошибка чтения индекса файлов '{self.path}': {e}")
+            return
+        if not isinstance(data, dict) or data.get("format") != FILE_INDEX_FORMAT:
+            return
+        files = data.get("files")
+        if isinstance(files, dict):
+            self._files = {key: entry for key, entry in files.items() if isinstance(entry, list) and len(entry) == 3}
+
+
+_indexes: dict[str, VerifiedFileIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_file_index(minecraft_directory: str) -> VerifiedFileIndex:
+    """Общий индекс папки данных (одновременные установки из очереди пользуются одним)."""
+    key = os.path.normcase(os.path.abspath(minecraft_directory))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = VerifiedFileIndex(minecraft_directory)
+        return index
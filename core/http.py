@@ -0,0 +1,432 @@
+import os
+import time
+import hashlib
+import threading
+import email.utils
+import urllib.parse
+from contextlib import contextmanager
+from concurrent.futures import Future, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core import connectivity
+
+# --- Константы сети ---
+USER_AGENT = "NovaLauncher"
+POOL_CONNECTIONS = 16 # Сколько хостов держим в пуле
+DEFAULT_TIMEOUT = 15 # сек (подключение и чтение)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5 # 0.5, 1, 2, ... сек между повторами
+DEFAULT_MAX_PER_HOST = 8 # Одновременных запросов к одному хосту
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_RESUME_ATTEMPTS = 3 # Сколько раз продолжать загрузку после обрыва посреди файла
+PART_SUFFIX = ".part" # Недокачанный файл (докачивается запросом Range)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MIRROR_RETRY_AFTER = 60 # сек; после сетевой ошибки зеркала столько времени качаем напрямую
+DEFAULT_MAX_AGE = 24 * 60 * 60 # Сколько считать ответ свежим, если сервер не прислал Cache-Control/Expires
+
+
+class ChecksumError(Exception):
+    """Контрольная сумма загруженного файла не совпала с ожидаемой."""
+    def __init__(self, url: str, path: str, expected: str, actual: str):
+        super().__init__(f"Неверная контрольная сумма {path} ({url}): ожидалась {expected}, получена {actual}")
+        self.url = url
+        self.path = path
+        self.expected = expected
+        self.actual = actual
+
+
+class SizeMismatchError(ChecksumError):
+    """Размер загруженного файла не совпал с ожидаемым (лишние байты даже не дописываются)."""
+    def __init__(self, url: str, path: str, expected: int, actual: int):
+        super().__init__(url, path, str(expected), str(actual))
+        self.args = (f"Неверный размер {path} ({url}): ожидалось {expected} байт, получено {actual}",)
+
+
+class OfflineError(requests.exceptions.ConnectionError):
+    """Лаунчер в офлайн-режиме: запрос к удаленному хосту даже не отправлялся."""
+    def __init__(self, url: str):
+        super().__init__(f"Нет соединения с сетью, запрос пропущен: {url}")
+        self.url = url
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты по алгоритму token bucket.
+    Первые `burst` токенов выдаются сразу, дальше - не быстрее `rate` в секунду.
+    Запрос большего числа токенов, чем `burst`, уводит ведро "в долг" -
+    так им можно ограничивать и запросы, и байты (кусками любого размера).
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """Блокирует поток, пока не накопится нужное количество токенов."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            deficit = -self._tokens
+        if deficit > 0:
+            time.sleep(deficit / self.rate)
+
+
+class HttpClient:
+    """
+    Единый HTTP-клиент лаунчера.
+
+    Одна requests.Session с пулом keep-alive соединений (TLS и TCP
+    устанавливаются один раз на хост), повторы с экспоненциальной
+    задержкой, таймауты по умолчанию, ограничение одновременных запросов
+    к одному хосту и общий лимит скорости загрузки. Потокобезопасен.
+    Один и тот же файл одновременно качается только один раз: остальные
+    вызовы download() для того же пути ждут первую загрузку.
+
+    В офлайн-режиме (core.connectivity) запросы к удаленным хостам сразу
+    завершаются OfflineError - подклассом ConnectionError, поэтому код,
+    который уже обрабатывает сетевые ошибки, просто берет данные из кэша.
+    Адреса в локальной сети (зеркала, тестовые серверы) доступны всегда.
+
+    Если задано зеркало (core.mirror), файлы с хостов Mojang сначала
+    запрашиваются с него; при ошибке зеркала, отсутствии файла на нем или
+    неверной контрольной сумме загрузка идет с исходного адреса.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, max_per_host: int = DEFAULT_MAX_PER_HOST,
+                 bandwidth_limit: int = 0, user_agent: str = USER_AGENT, mirror: str | None = None):
+        self.timeout = timeout
+        self.mirror = (mirror or "").strip() or None
+        self._mirror_down_until = 0.0
+        self.max_per_host = max(1, int(max_per_host))
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+        self._bandwidth = None
+        self.set_bandwidth_limit(bandwidth_limit)
+        self._downloads: dict[str, Future] = {} # путь -> идущая загрузка
+        self._downloads_lock = threading.Lock()
+        self._received = 0 # Всего получено байт тел ответов (для расчета скорости)
+        self._received_lock = threading.Lock()
+
+        retry = Retry(
+            total=retries, connect=retries, read=retries, status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False, # Последний ответ отдаем вызывающему коду (raise_for_status)
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=self.max_per_host, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    # --- Настройки ---
+
+    def set_bandwidth_limit(self, bytes_per_second: int):
+        """Общий лимит скорости загрузки (0 - без ограничения)."""
+        bytes_per_second = max(0, int(bytes_per_second or 0))
+        self._bandwidth = RateLimiter(bytes_per_second, burst=bytes_per_second) if bytes_per_second else None
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    # --- Запросы ---
+
+    def is_offline(self, url: str) -> bool:
+        """True, если запрос к url сейчас будет пропущен из-за офлайн-режима (зеркало в локальной сети доступно и так)."""
+        mirrored = self._mirror_url(url)
+        if mirrored is not None and connectivity.is_local_url(mirrored):
+            return False
+        return not connectivity.is_local_url(url) and connectivity.is_offline()
+
+    def _send(self, url: str, **kwargs) -> requests.Response:
+        """Отправляет GET с учетом офлайн-режима и сообщает монитору сети о результате."""
+        remote = not connectivity.is_local_url(url)
+        if remote and connectivity.is_offline():
+            raise OfflineError(url)
+        try:
+            response = self.session.get(url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if remote:
+                connectivity.get_monitor().report_failure()
+            raise
+        if remote:
+            connectivity.get_monitor().report_success()
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET с полностью прочитанным телом (слот хоста освобождается сразу)."""
+        with self.stream(url, **kwargs) as response:
+            content = b"".join(self.iter_content(response))
+            response._content = content
+            response._content_consumed = True
+        return response
+
+    def get_json(self, url: str, **kwargs):
+        response = self.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    @contextmanager
+    def stream(self, url: str, use_mirror: bool = True, **kwargs):
+        """
+        Потоковый GET: слот хоста занят, пока открыт блок with.
+        Тело читается через iter_content() клиента, чтобы учитывался лимит скорости.
+        Зеркало (если задано) пробуется первым; ответ с ошибкой от него не отдается.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs["stream"] = True
+        mirrored = self._mirror_url(url) if use_mirror else None
+        for candidate in ([mirrored] if mirrored else []) + [url]:
+            from_mirror = candidate is mirrored
+            with self._host_slot(candidate):
+                try:
+                    response = self._send(candidate, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    if not from_mirror:
+                        raise
+                    self._mirror_unavailable(e)
+                    continue
+                if from_mirror and response.status_code >= 400 and response.status_code != 416:
+                    print(f"Зеркало вернуло {response.status_code} для {url}, загрузка из источника.")
+                    response.close()
+                    continue
+                try:
+                    yield response
+                finally:
+                    response.close()
+                return
+
+    def _mirror_url(self, url: str) -> str | None:
+        if self.mirror is None or time.monotonic() < self._mirror_down_until:
+            return None
+        from core.mirror import mirror_url
+        return mirror_url(self.mirror, url)
+
+    def _mirror_unavailable(self, error: Exception):
+        """Зеркало не отвечает: какое-то время не тратим на него время на каждом файле."""
+        print(f"Зеркало {self.mirror} недоступно ({error}), {MIRROR_RETRY_AFTER} сек качаем из источника.")
+        self._mirror_down_until = time.monotonic() + MIRROR_RETRY_AFTER
+
+    def iter_content(self, response: requests.Response, chunk_size: int = DOWNLOAD_CHUNK_SIZE):
+        """Итерирует тело ответа с учетом общего лимита скорости."""
+        for chunk in response.iter_content(chunk_size):
+            if self._bandwidth is not None:
+                self._bandwidth.acquire(len(chunk))
+            with self._received_lock:
+                self._received += len(chunk)
+            yield chunk
+
+    def received_bytes(self) -> int:
+        """Сколько байт получено клиентом с момента создания."""
+        with self._received_lock:
+            return self._received
+
+    def download(self, url: str, path: str, sha1: str | None = None, overwrite: bool = False,
+                 cancel_token=None, use_mirror: bool = True, size: int | None = None, verified=None) -> bool:
+        """
+        Загружает файл в path и проверяет sha1 и размер, если они указаны.
+        Возвращает False, если корректный файл уже был на месте.
+        verified (core.file_index.VerifiedFileIndex) - индекс проверенных
+        файлов: файл, записанный в нем с той же sha1 и не менявшийся с тех пор,
+        не хэшируется, а проверенный или скачанный файл в него добавляется.
+
+        Данные пишутся в path + ".part" и хэшируются по мере записи - файл
+        не перечитывается с диска; на место он переименовывается, только если
+        сумма и размер совпали. Загрузка, превысившая size, обрывается сразу.
+        Лежащий на месте файл другого размера не хэшируется, а перекачивается.
+        Если .part остался от прерванной
+        загрузки (отмена, обрыв связи), докачивается только недостающее -
+        запросом Range. cancel_token (core.jobs.CancelToken) проверяется между
+        кусками; при отмене .part сохраняется для следующей попытки.
+
+        Если тот же path уже качает другой поток (общие библиотеки и ассеты
+        версий из очереди установки), вызов ждет его и возвращает False;
+        если та загрузка не удалась, качает сам. Если не прошел проверку
+        докачанный файл, он один раз качается заново целиком (испорченным
+        мог быть сам .part); файл с неверной суммой с зеркала перекачивается
+        из источника.
+        """
+        key = os.path.normcase(os.path.abspath(path))
+        while True:
+            with self._downloads_lock:
+                running = self._downloads.get(key)
+                if running is None:
+                    running = self._downloads[key] = Future()
+                    break
+            while not wait([running], timeout=0.25).done:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+            if running.exception() is None:
+                return False
+
+        error = None
+        try:
+            try:
+                result = self._download(url, path, sha1, overwrite, cancel_token, use_mirror, size, verified)
+            except ChecksumError as e:
+                if not use_mirror or self._mirror_url(url) is None:
+                    raise
+                print(f"С зеркала получен поврежденный файл ({e}), загрузка из источника.")
+                result = self._download(url, path, sha1, overwrite, cancel_token, False, size, verified)
+        except BaseException as e:
+            error = e
+        with self._downloads_lock:
+            del self._downloads[key] # Путь освобождаем до публикации результата ожидающим
+        if error is not None:
+            running.set_exception(error)
+            raise error
+        running.set_result(result)
+        return result
+
+    def _download(self, url: str, path: str, sha1: str | None, overwrite: bool, cancel_token,
+                  use_mirror: bool = True, size: int | None = None, verified=None) -> bool:
+        if os.path.isfile(path) and not overwrite:
+            if verified is not None and sha1 is not None and verified.is_verified(path, sha1, size):
+                return False # Проверен раньше и с тех пор не менялся
+            # Размер сверяется до хэша: файл другого размера не читается вовсе
+            if (size is None or os.path.getsize(path) == size) and (sha1 is None or file_sha1(path) == sha1):
+                if verified is not None and sha1 is not None:
+                    verified.add(path, sha1)
+                return False
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        part_path = path + PART_SUFFIX
+        hasher = hashlib.sha1()
+        offset = 0
+        if os.path.isfile(part_path):
+            if size is not None and os.path.getsize(part_path) > size:
+                os.remove(part_path) # Длиннее целого файла - докачивать нечего
+            else:
+                offset = _hash_file_into(part_path, hasher) # Уже скачанное хэшируем один раз
+        resumed_from = offset
+
+        attempt = 0
+        while size is None or offset < size: # .part полного размера докачивать не нужно
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            try:
+                with self.stream(url, use_mirror=use_mirror, headers=headers) as response:
+                    if offset and response.status_code == 416:
+                        # Диапазон за концом файла: .part уже полный (или испорчен - проверит sha1)
+                        break
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        offset, hasher = 0, hashlib.sha1() # Сервер не умеет Range - качаем заново
+                    with open(part_path, 'ab' if offset else 'wb') as f:
+                        for chunk in self.iter_content(response):
+                            if cancel_token is not None:
+                                cancel_token.raise_if_cancelled()
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            offset += len(chunk)
+                            if size is not None and offset > size:
+                                break # Сервер отдает лишнее - файл уже заведомо неверный
+                break
+            except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                # Обрыв посреди тела: urllib3 его не повторяет, продолжаем с места обрыва
+                attempt += 1
+                if attempt > DOWNLOAD_RESUME_ATTEMPTS or isinstance(e, OfflineError) or not offset:
+                    raise
+                print(f"Загрузка {url} прервалась на {offset} байт ({e}), продолжаем...")
+
+        actual = hasher.hexdigest()
+        if (size is not None and offset != size) or (sha1 is not None and actual != sha1):
+            os.remove(part_path) # Докачивать испорченный файл бессмысленно
+            if resumed_from:
+                # Виноват, скорее всего, оставшийся .part (чужие байты, другой файл) - один раз качаем целиком
+                print(f"Докачанный файл {path} не прошел проверку, загрузка заново.")
+                return self._download(url, path, sha1, True, cancel_token, use_mirror, size, verified)
+            if size is not None and offset != size:
+                raise SizeMismatchError(url, path, size, offset)
+            raise ChecksumError(url, path, sha1, actual)
+        os.replace(part_path, path)
+        if verified is not None and sha1 is not None:
+            verified.add(path, sha1)
+        return True
+
+
+# --- Общий клиент лаунчера ---
+_client = None
+_client_lock = threading.Lock()
+_client_options = {}
+
+
+def configure_client(**options):
+    """
+    Задает параметры общего клиента (timeout, retries, max_per_host, bandwidth_limit, ...).
+    Если клиент уже создан, он пересоздается с новыми параметрами.
+    """
+    global _client
+    with _client_lock:
+        _client_options.update(options)
+        _client = None
+
+
+def get_client() -> HttpClient:
+    """Возвращает общий для лаунчера HTTP-клиент (создается при первом обращении)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(**_client_options)
+    return _client
+
+
+def file_sha1(path: str) -> str:
+    """Считает sha1 файла."""
+    sha1 = hashlib.sha1()
+    _hash_file_into(path, sha1)
+    return sha1.hexdigest()
+
+
+def _hash_file_into(path: str, hasher) -> int:
+    """Добавляет содержимое файла в hasher, возвращает размер."""
+    size = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            hasher.update(block)
+            size += len(block)
+    return size
+
+
+def parse_freshness(headers, now: float | None = None) -> int:
+    """
+    Возвращает время свежести ответа (сек) по заголовкам Cache-Control/Expires.
+    no-cache/no-store означают "проверять при каждом обращении".
+    """
+    now = time.time() if now is None else now
+    cache_control = headers.get("Cache-Control", "") or ""
+    for directive in cache_control.split(","):
+        directive = directive.strip().lower()
+        if directive in ("no-cache", "no-store"):
+            return 0
+        if directive.startswith("max-age="):
+            try:
+                return max(0, int(directive.split("=", 1)[1].strip('"')))
+            except ValueError:
+                pass
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return max(0, int(email.utils.parsedate_to_datetime(expires).timestamp() - now))
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return 0 # Некорректный Expires по RFC означает "уже устарел"
+    return DEFAULT_MAX_AGE
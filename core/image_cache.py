@@ -0,0 +1,344 @@
+import os
+import re
+import json
+import time
+import atexit
+import hashlib
+import threading
+import urllib.parse
+from collections import OrderedDict
+
+import requests
+
+from core.http import HttpClient, get_client, parse_freshness, DEFAULT_MAX_AGE
+
+# --- Константы кэша ---
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024 # 64 МБ
+INDEX_FLUSH_EVERY = 20 # Сколько "касаний" (обновлений last_access) копим до записи индекса
+MAX_REVALIDATIONS = 2 # Одновременных фоновых проверок свежести
+# Имена файлов кэша: sha256 адреса + расширение (см. ImageCache._filename_for)
+_CACHE_FILENAME = re.compile(r"[0-9a-f]{64}(\.[^.\\/]*)?(\.\d+\.part)?")
+
+
+def move_legacy_cache(old_dir: str, new_dir: str):
+    """
+    Переносит картинки и индекс из общей папки кэша, где они лежали раньше,
+    в отдельную папку кэша изображений (один раз, пока новой папки нет).
+    Чужие файлы старой папки не трогаются.
+    """
+    if os.path.isdir(new_dir) or not os.path.isdir(old_dir):
+        return
+    try:
+        os.makedirs(new_dir)
+        for entry in os.scandir(old_dir):
+            if entry.is_file() and (entry.name == INDEX_FILENAME or _CACHE_FILENAME.fullmatch(entry.name)):
+                os.replace(entry.path, os.path.join(new_dir, entry.name))
+    except OSError as e:
+        print(f"Ошибка переноса кэша изображений в '{new_dir}': {e}")
+
+
+class ImageCache:
+    """
+    Ограниченный по размеру дисковый кэш изображений с LRU-вытеснением.
+
+    Рядом с файлами хранится индекс (URL -> файл, размер, время последнего
+    доступа, ETag, Last-Modified, срок свежести). Индекс держится в памяти,
+    поэтому поиск по URL не делает ни одного обращения к файловой системе.
+    Устаревшие записи отдаются сразу, а в фоне проверяются условным запросом
+    (If-None-Match / If-Modified-Since). Все методы потокобезопасны.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, client: HttpClient | None = None):
+        self.cache_dir = cache_dir
+        self._client = client
+        self.max_bytes = max(0, int(max_bytes))
+        self._index_path = os.path.join(cache_dir, INDEX_FILENAME)
+        self._lock = threading.RLock()
+        # url -> {"file", "size", "last_access", "etag", "last_modified", "validated_at", "max_age"};
+        # порядок = LRU (старые в начале)
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._total_bytes = 0
+        self._pending_touches = 0
+        self._revalidating: set[str] = set()
+        self._revalidation_slots = threading.BoundedSemaphore(MAX_REVALIDATIONS)
+        self._listeners = [] # callback(url, path) - вызывается, когда файл в кэше обновился
+        self._load_index()
+        atexit.register(self.flush)
+
+    @property
+    def client(self) -> HttpClient:
+        """HTTP-клиент: переданный явно или общий клиент лаунчера."""
+        return self._client or get_client()
+
+    # --- Индекс ---
+
+    def _load_index(self):
+        """Загружает индекс с диска и удаляет файлы, которых в нем нет."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Ошибка создания папки кэша '{self.cache_dir}': {e}")
+            return
+
+        entries = {}
+        if os.path.exists(self._index_path):
+            try:
+                with open(self._index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+                    entries = data.get("entries", {}) or {}
+                else:
+                    print(f"Предупреждение: Неизвестный формат индекса кэша '{self._index_path}', кэш будет очищен.")
+            except (json.JSONDecodeError, IOError, TypeError) as e:
+                print(f"Ошибка загрузки индекса кэша '{self._index_path}': {e}. Кэш будет очищен.")
+
+        # Сверяем индекс с содержимым папки (один проход при старте)
+        try:
+            files_on_disk = {e.name: e.stat().st_size for e in os.scandir(self.cache_dir) if e.is_file()}
+        except OSError as e:
+            print(f"Ошибка чтения папки кэша '{self.cache_dir}': {e}")
+            files_on_disk = {}
+
+        referenced = set()
+        for url, entry in sorted(entries.items(), key=lambda item: item[1].get("last_access", 0)):
+            filename = entry.get("file")
+            if not filename or filename not in files_on_disk:
+                continue # Файл пропал - запись устарела
+            entry["size"] = files_on_disk[filename]
+            self._entries[url] = entry
+            self._total_bytes += entry["size"]
+            referenced.add(filename)
+
+        # Файлы без записи в индексе (в т.ч. из старых версий лаунчера) никогда не будут
+        # найдены по URL, поэтому просто удаляем их: папка принадлежит только кэшу изображений
+        for filename in files_on_disk:
+            if filename == INDEX_FILENAME or filename in referenced:
+                continue
+            self._remove_file(filename)
+
+        self._evict()
+
+    def flush(self):
+        """Атомарно записывает индекс на диск."""
+        with self._lock:
+            data = {"version": INDEX_VERSION, "entries": dict(self._entries)}
+            self._pending_touches = 0
+            tmp_path = self._index_path + ".tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self._index_path)
+            except (IOError, OSError) as e:
+                print(f"Ошибка сохранения индекса кэша '{self._index_path}': {e}")
+
+    # --- Поиск и запись ---
+
+    def lookup(self, url: str) -> str | None:
+        """Возвращает путь к закэшированному файлу или None (без обращения к диску)."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            entry["last_access"] = time.time()
+            self._entries.move_to_end(url)
+            self._pending_touches += 1
+            if self._pending_touches >= INDEX_FLUSH_EVERY:
+                self.flush()
+            return os.path.join(self.cache_dir, entry["file"])
+
+    def get_path(self, url: str) -> str | None:
+        """
+        Возвращает путь к изображению, при необходимости загружая его.
+        Если запись устарела, возвращает ее сразу и запускает фоновую проверку.
+        """
+        cached = self.lookup(url)
+        if cached:
+            if not self.is_fresh(url) and not self.client.is_offline(url):
+                self.revalidate_async(url)
+            return cached
+        return self.fetch(url)
+
+    def is_fresh(self, url: str) -> bool:
+        """Проверяет, не истек ли срок свежести записи."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return False
+            return time.time() < entry.get("validated_at", 0) + entry.get("max_age", 0)
+
+    def add_listener(self, callback):
+        """Подписка на обновление файлов после фоновой проверки: callback(url, path)."""
+        self._listeners.append(callback)
+
+    def revalidate_async(self, url: str):
+        """Запускает фоновую условную проверку записи (не более одной на URL)."""
+        with self._lock:
+            if url in self._revalidating or url not in self._entries:
+                return
+            self._revalidating.add(url)
+        threading.Thread(target=self._revalidate, args=(url,), name="ImageCacheRevalidate", daemon=True).start()
+
+    def _revalidate(self, url: str):
+        try:
+            with self._revalidation_slots:
+                with self._lock:
+                    entry = dict(self._entries.get(url) or {})
+                if not entry:
+                    return
+                old_etag, old_modified = entry.get("etag"), entry.get("last_modified")
+                path = self.fetch(url, validators=entry)
+                if not path:
+                    return
+                with self._lock:
+                    new_entry = self._entries.get(url) or {}
+                changed = (new_entry.get("etag"), new_entry.get("last_modified")) != (old_etag, old_modified)
+                if changed:
+                    for callback in list(self._listeners):
+                        try:
+                            callback(url, path)
+                        except Exception as e:
+                            print(f"Ошибка обработчика обновления кэша для {url}: {e}")
+        finally:
+            with self._lock:
+                self._revalidating.discard(url)
+
+    def fetch(self, url: str, validators: dict | None = None) -> str | None:
+        """
+        Загружает изображение по URL и помещает его в кэш.
+        Если переданы validators (запись индекса), запрос делается условным,
+        и ответ 304 лишь продлевает свежесть уже сохраненного файла.
+        """
+        if self.client.is_offline(url):
+            return None # Без сети отдаем только то, что уже есть в кэше
+        filename = self._filename_for(url)
+        path = os.path.join(self.cache_dir, filename)
+        tmp_path = f"{path}.{threading.get_ident()}.part"
+        headers = {}
+        if validators:
+            if validators.get("etag"): headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"): headers["If-Modified-Since"] = validators["last_modified"]
+        try:
+            if not validators:
+                print(f"Загрузка изображения из {url}...")
+            with self.client.stream(url, headers=headers) as response:
+                if response.status_code == 304 and validators:
+                    return self._mark_validated(url, response.headers)
+                response.raise_for_status()
+                size = 0
+                with open(tmp_path, 'wb') as f:
+                    for chunk in self.client.iter_content(response):
+                        f.write(chunk)
+                        size += len(chunk)
+            os.replace(tmp_path, path) # Файл появляется в кэше только целиком
+        except requests.exceptions.RequestException as e:
+            print(f"Ошибка сети при загрузке {url}: {e}")
+            self._discard_tmp(tmp_path)
+            return None
+        except (IOError, OSError) as e:
+            print(f"Ошибка ввода/вывода при сохранении кэша для {url}: {e}")
+            self._discard_tmp(tmp_path)
+            return None
+
+        self.store(url, filename, size,
+                   etag=response.headers.get("ETag"),
+                   last_modified=response.headers.get("Last-Modified"),
+                   max_age=parse_freshness(response.headers))
+        print(f"Изображение {'обновлено' if validators else 'сохранено'} в кэше: {path}")
+        return path
+
+    def _mark_validated(self, url: str, headers) -> str | None:
+        """Ответ 304: файл не изменился, продлеваем свежесть записи."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            entry["validated_at"] = time.time()
+            entry["max_age"] = parse_freshness(headers)
+            if headers.get("ETag"): entry["etag"] = headers["ETag"]
+            self.flush()
+            return os.path.join(self.cache_dir, entry["file"])
+
+    def store(self, url: str, filename: str, size: int, etag: str | None = None,
+              last_modified: str | None = None, max_age: int = DEFAULT_MAX_AGE):
+        """Регистрирует уже записанный в папку кэша файл и вытесняет старые записи."""
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old:
+                self._total_bytes -= old.get("size", 0)
+                if old.get("file") != filename:
+                    self._remove_file(old["file"])
+            now = time.time()
+            self._entries[url] = {
+                "file": filename,
+                "size": size,
+                "last_access": now,
+                "etag": etag,
+                "last_modified": last_modified,
+                "validated_at": now,
+                "max_age": max_age,
+            }
+            self._total_bytes += size
+            self._evict(keep=url)
+            self.flush()
+
+    def invalidate(self, url: str):
+        """Удаляет запись (например, если файл оказался поврежден)."""
+        with self._lock:
+            entry = self._entries.pop(url, None)
+            if entry:
+                self._total_bytes -= entry.get("size", 0)
+                self._remove_file(entry["file"])
+                self.flush()
+
+    # --- Размер и вытеснение ---
+
+    def set_max_bytes(self, max_bytes: int):
+        """Меняет бюджет кэша и сразу вытесняет лишнее."""
+        with self._lock:
+            self.max_bytes = max(0, int(max_bytes))
+            if self._evict():
+                self.flush()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _evict(self, keep: str | None = None) -> bool:
+        """Вытесняет самые давно использованные записи, пока кэш не влезет в бюджет."""
+        evicted = False
+        with self._lock:
+            while self._total_bytes > self.max_bytes and self._entries:
+                url, entry = next(iter(self._entries.items()))
+                if url == keep:
+                    break # Только что добавленный файл не трогаем, даже если он больше бюджета
+                del self._entries[url]
+                self._total_bytes -= entry.get("size", 0)
+                self._remove_file(entry["file"])
+                evicted = True
+        return evicted
+
+    # --- Вспомогательные методы ---
+
+    @staticmethod
+    def _filename_for(url: str) -> str:
+        """Имя файла на основе хэша URL с сохранением расширения."""
+        _, ext = os.path.splitext(urllib.parse.urlparse(url).path)
+        if not ext: ext = ".png" # По умолчанию .png, если нет расширения
+        return f"{hashlib.sha256(url.encode()).hexdigest()}{ext}"
+
+    def _remove_file(self, filename: str):
+        try:
+            os.remove(os.path.join(self.cache_dir, filename))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Ошибка удаления файла кэша {filename}: {e}")
+
+    @staticmethod
+    def _discard_tmp(tmp_path: str):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,178 @@
+"""
+Встроенный отчет о времени импорта модулей (аналог `python -X importtime`).
+
+Включается до остальных импортов (install()), затем в ключевые моменты
+запуска ставятся отметки (mark()), а report() печатает самые дорогие
+модули, время импорта до каждой отметки и сравнение с прошлым запуском.
+"""
+import os
+import sys
+import json
+import time
+import threading
+
+# --- Параметры отчета ---
+REPORT_LIMIT = 25 # Сколько самых медленных модулей печатать
+PRE_SPLASH_BUDGET_MS = 350 # Бюджет на импорты до показа сплеша
+REGRESSION_THRESHOLD = 1.2 # Рост относительно прошлого запуска, о котором предупреждаем
+
+_finder = None
+
+
+class _TimingLoader:
+    """Обертка загрузчика: замеряет exec_module, остальное делегирует исходному."""
+
+    def __init__(self, loader, finder):
+        self._loader = loader
+        self._finder = finder
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        self._finder.enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._finder.leave(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder:
+    """
+    Мета-искатель в начале sys.meta_path: находит модуль остальными
+    искателями и подменяет загрузчик замеряющей оберткой. Время считается
+    по потокам: собственное (self) и с учетом вложенных импортов (cumulative).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings = {} # module -> {"self": сек, "cumulative": сек, "thread": имя}
+        self.marks = [] # [(метка, сек с начала, суммарное время импорта к этому моменту)]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "searching", False):
+            return None
+        self._local.searching = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimingLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._local.searching = False
+
+    def enter(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append([time.perf_counter(), 0.0]) # [начало, время вложенных импортов]
+
+    def leave(self, name):
+        stack = self._local.stack
+        started, children = stack.pop()
+        cumulative = time.perf_counter() - started
+        if stack:
+            stack[-1][1] += cumulative
+        with self._lock:
+            self.timings[name] = {
+                "self": cumulative - children,
+                "cumulative": cumulative,
+                "thread": threading.current_thread().name,
+                "top_level": not stack,
+            }
+
+    def total(self) -> float:
+        """Суммарное время импортов верхнего уровня (сек)."""
+        with self._lock:
+            return sum(t["cumulative"] for t in self.timings.values() if t["top_level"])
+
+
+def install():
+    """Включает замеры. Вызывать как можно раньше, до остальных импортов."""
+    global _finder
+    if _finder is None:
+        _finder = _TimingFinder()
+        sys.meta_path.insert(0, _finder)
+
+
+def is_enabled() -> bool:
+    return _finder is not None
+
+
+def mark(label: str):
+    """Отметка этапа запуска: запоминает, сколько времени к этому моменту ушло на импорты."""
+    if _finder is not None:
+        _finder.marks.append((label, time.perf_counter() - _finder.started, _finder.total(), set(_finder.timings)))
+
+
+def report(save_path: str | None = None, watch: tuple = ()):
+    """
+    Печатает отчет и (если указан save_path) сохраняет его для сравнения со следующим запуском.
+    watch - тяжелые модули, которые не должны импортироваться до показа сплеша.
+    """
+    if _finder is None:
+        return
+    with _finder._lock:
+        timings = dict(_finder.timings)
+    total_ms = _finder.total() * 1000
+
+    print(f"--- Время импорта модулей (всего {total_ms:.0f} мс, {len(timings)} модулей) ---")
+    print(f"{'cumulative, мс':>15} | {'self, мс':>9} | модуль")
+    top = sorted(timings.items(), key=lambda item: item[1]["cumulative"], reverse=True)[:REPORT_LIMIT]
+    for name, t in top:
+        thread = "" if t["thread"] == "MainThread" else f"  [{t['thread']}]"
+        print(f"{t['cumulative'] * 1000:15.1f} | {t['self'] * 1000:9.1f} | {name}{thread}")
+
+    marks = {}
+    for label, at, imports, modules in _finder.marks:
+        marks[label] = round(imports * 1000, 1)
+        print(f"Отметка '{label}': {at * 1000:.0f} мс от старта, из них импорты {imports * 1000:.0f} мс")
+        if label == "splash":
+            if imports * 1000 > PRE_SPLASH_BUDGET_MS:
+                print(f"Предупреждение: импорты до сплеша превысили бюджет {PRE_SPLASH_BUDGET_MS} мс")
+            early = [m for m in watch if m in modules]
+            if early:
+                print(f"Предупреждение: до сплеша импортированы тяжелые модули: {', '.join(early)}")
+
+    if save_path:
+        _compare_and_save(save_path, total_ms, marks, timings)
+
+
+def _compare_and_save(path: str, total_ms: float, marks: dict, timings: dict):
+    previous = None
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Ошибка чтения прошлого отчета об импорте '{path}': {e}")
+    if isinstance(previous, dict):
+        for label, value in [("total", total_ms)] + list(marks.items()):
+            before = previous.get("total_ms") if label == "total" else previous.get("marks", {}).get(label)
+            if before and value > before * REGRESSION_THRESHOLD:
+                print(f"Регрессия времени импорта ({label}): {before:.0f} мс -> {value:.0f} мс")
+
+    data = {
+        "total_ms": round(total_ms, 1),
+        "marks": marks,
+        "modules": {name: round(t["cumulative"] * 1000, 2) for name, t in timings.items()},
+    }
+    tmp_path = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+    except (IOError, OSError) as e:
+        print(f"Ошибка сохранения отчета об импорте '{path}': {e}")
@@ -0,0 +1,300 @@
+"""
+Очередь установки версий.
+
+В очередь можно поставить сразу несколько версий (например, весь набор для
+тестовой матрицы). Одновременно ставится не больше max_parallel версий,
+остальные ждут. Каждая установка идет через общий планировщик (core.jobs)
+с ключом ("install", версия) (core.installer.submit_install), поэтому
+запуск версии, которая уже ставится из очереди, присоединяется к этой
+установке: у каждого свой прогресс, а отмена одного не останавливает
+установку для другого. Общие для версий файлы
+(библиотеки, объекты ассетов, Java) скачиваются один раз: одновременные
+загрузки одного файла объединяет HttpClient, runtime Java ставится под
+блокировкой.
+
+Состояние очереди сохраняется в JSON-файл при каждой смене статуса;
+установки, прерванные закрытием лаунчера, при следующем запуске снова
+ждут в очереди и докачиваются. Модуль не зависит от Qt: слушатели
+вызываются из потоков планировщика.
+"""
+import os
+import json
+import threading
+
+from core.jobs import get_scheduler, PRIORITY_NORMAL
+
+# --- Параметры ---
+QUEUE_PARALLEL = 2 # Версий, которые ставятся одновременно (загрузки внутри версии и так параллельны)
+QUEUE_FORMAT_VERSION = 1 # Увеличить при изменении формата файла очереди
+
+# --- Статусы элементов ---
+STATUS_QUEUED = "queued"
+STATUS_INSTALLING = "installing"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_INSTALLING)
+
+
+class QueueEntry:
+    """Версия в очереди: статус, текущий этап установки и его прогресс (0-100)."""
+
+    def __init__(self, version: str, status: str = STATUS_QUEUED, error: str | None = None):
+        self.version = version
+        self.status = status
+        self.error = error
+        self.exception = None # Исключение последней неудачной установки (не сохраняется)
+        self.stage = ""
+        self.percent = 0
+        self.job = None # Задача планировщика, пока версия ставится
+        self._max = 0
+
+    def to_dict(self) -> dict:
+        return {"version": self.version, "status": self.status, "error": self.error}
+
+    def __repr__(self):
+        return f"<QueueEntry {self.version} {self.status} {self.percent}%>"
+
+
+class InstallQueue:
+    """Очередь установки с общим лимитом параллельности и сохранением состояния."""
+
+    def __init__(self, minecraft_directory: str, state_file: str | None = None,
+                 max_parallel: int = QUEUE_PARALLEL, java_path: str | None = None,
+                 priority: int = PRIORITY_NORMAL):
+        self.minecraft_directory = minecraft_directory
+        self.state_file = state_file
+        # Не больше, чем позволяет общий планировщик: иначе установки займут все его потоки
+        self.max_parallel = max(1, min(int(max_parallel), get_scheduler().long_job_limit))
+        self.java_path = java_path
+        self.priority = priority
+        self._entries: dict[str, QueueEntry] = {} # Порядок вставки = порядок установки
+        self._lock = threading.RLock()
+        self._idle = threading.Condition(self._lock)
+        self._listeners = []
+        self._started = False
+        self._closed = False
+        self._load()
+
+    # --- Состояние ---
+
+    def entries(self) -> list[QueueEntry]:
+        with self._lock:
+            return list(self._entries.values())
+
+    def has_active(self) -> bool:
+        """Есть ли версии, ожидающие или идущие установку."""
+        with self._lock:
+            return any(entry.status in ACTIVE_STATUSES for entry in self._entries.values())
+
+    def overall_progress(self) -> tuple[int, int, int]:
+        """
+        Общий прогресс (процент, установлено, всего) по версиям, которые ждут,
+        ставятся или уже поставлены; отмененные и неудачные не учитываются.
+        """
+        with self._lock:
+            counted = [entry for entry in self._entries.values() if entry.status in ACTIVE_STATUSES + (STATUS_DONE,)]
+            done = sum(1 for entry in counted if entry.status == STATUS_DONE)
+            running = sum(entry.percent for entry in counted if entry.status == STATUS_INSTALLING)
+        if not counted:
+            return 0, 0, 0
+        return (done * 100 + running) // len(counted), done, len(counted)
+
+    def add_listener(self, callback):
+        """callback(version) - элемент очереди изменился (None - изменился состав очереди)."""
+        self._listeners.append(callback)
+
+    # --- Управление ---
+
+    def add(self, versions) -> list[str]:
+        """
+        Ставит версии в конец очереди. Уже стоящие в очереди пропускаются,
+        завершенные (в т.ч. с ошибкой) ставятся заново. Возвращает добавленные.
+        """
+        added = []
+        with self._lock:
+            for version in versions:
+                entry = self._entries.get(version)
+                if entry is not None and entry.status in ACTIVE_STATUSES:
+                    continue
+                if entry is not None:
+                    del self._entries[version] # Повторная постановка - в конец очереди
+                self._entries[version] = QueueEntry(version)
+                added.append(version)
+            if added:
+                self._save_locked()
+                self._pump_locked()
+        if added:
+            self._notify(None)
+        return added
+
+    def remove(self, version: str):
+        """Убирает версию из очереди (идущая установка отменяется)."""
+        with self._lock:
+            entry = self._entries.pop(version, None)
+            if entry is None:
+                return
+            if entry.job is not None:
+                entry.job.cancel()
+                entry.job = None
+            self._save_locked()
+            self._pump_locked()
+            self._idle.notify_all()
+        self._notify(None)
+
+    def cancel_all(self):
+        """Отменяет ожидающие и идущие установки (скачанное сохраняется)."""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.status == STATUS_QUEUED:
+                    entry.status = STATUS_CANCELLED
+                elif entry.job is not None:
+                    entry.job.cancel() # Статус выставит _on_job_done
+            self._save_locked()
+            self._idle.notify_all()
+        self._notify(None)
+
+    def retry_failed(self) -> list[str]:
+        """Снова ставит в очередь версии с ошибкой или отмененные."""
+        with self._lock:
+            versions = [entry.version for entry in self._entries.values()
+                        if entry.status in (STATUS_FAILED, STATUS_CANCELLED)]
+        return self.add(versions)
+
+    def clear_finished(self):
+        """Убирает из списка установленные, неудачные и отмененные версии."""
+        with self._lock:
+            self._entries = {version: entry for version, entry in self._entries.items()
+                             if entry.status in ACTIVE_STATUSES}
+            self._save_locked()
+        self._notify(None)
+
+    def start(self):
+        """Начинает установку (до вызова версии только копятся в очереди)."""
+        with self._lock:
+            self._started = True
+            self._pump_locked()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Ждет, пока очередь опустеет. False - истек timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._closed or not self.has_active(), timeout)
+
+    def close(self):
+        """
+        Останавливает очередь при выходе: состояние сохраняется так, что
+        прерванные установки при следующем запуске продолжатся.
+        """
+        with self._lock:
+            self._save_locked() # Идущие установки записываются как ожидающие
+            self._closed = True
+            jobs = [entry.job for entry in self._entries.values() if entry.job is not None]
+            self._idle.notify_all()
+        for job in jobs:
+            job.cancel()
+
+    # --- Внутреннее ---
+
+    def _pump_locked(self):
+        """Запускает установки ожидающих версий, пока не достигнут лимит."""
+        if not self._started or self._closed:
+            return
+        installing = sum(1 for entry in self._entries.values() if entry.status == STATUS_INSTALLING)
+        for entry in list(self._entries.values()):
+            if installing >= self.max_parallel:
+                break
+            if entry.status == STATUS_QUEUED:
+                self._start_locked(entry)
+                installing += 1
+
+    def _start_locked(self, entry: QueueEntry):
+        from core import installer
+        entry.status, entry.stage, entry.percent, entry.error, entry.exception = STATUS_INSTALLING, "", 0, None, None
+        entry.job = installer.submit_install(entry.version, self.minecraft_directory, self.java_path,
+                                             self._installer_callback(entry), self.priority)
+        self._save_locked()
+        entry.job.add_done_callback(lambda job: self._on_job_done(entry, job))
+        print(f"Очередь установки: начата установка {entry.version}")
+
+    def _on_job_done(self, entry: QueueEntry, job):
+        with self._lock:
+            if entry.job is not job or self._closed:
+                return # Версию убрали из очереди или лаунчер закрывается
+            entry.job = None
+            error = job.exception()
+            if job.cancelled:
+                entry.status = STATUS_CANCELLED
+            elif error is not None:
+                entry.status, entry.error, entry.exception = STATUS_FAILED, str(error) or type(error).__name__, error
+                print(f"Очередь установки: ошибка установки {entry.version}: {entry.error}")
+            else:
+                entry.status, entry.percent = STATUS_DONE, 100
+                print(f"Очередь установки: {entry.version} установлена")
+            self._save_locked()
+            self._pump_locked()
+            self._idle.notify_all()
+        self._notify(entry.version)
+
+    def _installer_callback(self, entry: QueueEntry) -> dict:
+        """Callback-словарь для core.installer: слушатели узнают только о смене этапа и процента."""
+        def set_status(status):
+            entry.stage = status
+            self._notify(entry.version)
+
+        def set_max(value):
+            entry._max = value + 1 # Установщик передает число элементов - 1
+            entry.percent = 0
+
+        def set_progress(value):
+            percent = min(100, value * 100 // entry._max) if entry._max > 0 else 100
+            if percent != entry.percent:
+                entry.percent = percent
+                self._notify(entry.version)
+
+        return {"setStatus": set_status, "setProgress": set_progress, "setMax": set_max}
+
+    def _notify(self, version: str | None):
+        for callback in list(self._listeners):
+            try:
+                callback(version)
+            except Exception as e:
+                print(f"Ошибка обработчика очереди установки: {e}")
+
+    def _load(self):
+        """Восстанавливает очередь из файла; прерванные установки снова ждут своей очереди."""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Ошибка чтения очереди установки '{self.state_file}': {e}")
+            return
+        if not isinstance(data, dict) or data.get("format") != QUEUE_FORMAT_VERSION:
+            return
+        for item in data.get("entries", []):
+            version, status = item.get("version"), item.get("status")
+            if not version or status not in ACTIVE_STATUSES + (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED):
+                continue
+            if status == STATUS_INSTALLING:
+                status = STATUS_QUEUED
+            self._entries[version] = QueueEntry(version, status, item.get("error"))
+
+    def _save_locked(self):
+        """Атомарно сохраняет очередь (идущие установки - как ожидающие)."""
+        if not self.state_file or self._closed:
+            return
+        entries = []
+        for entry in self._entries.values():
+            item = entry.to_dict()
+            if entry.status == STATUS_INSTALLING:
+                item["status"] = STATUS_QUEUED
+            entries.append(item)
+        tmp_path = self.state_file + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"format": QUEUE_FORMAT_VERSION, "entries": entries}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_file)
+        except (IOError, OSError) as e:
+            print(f"Ошибка сохранения очереди установки '{self.state_file}': {e}")
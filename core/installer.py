@@ -0,0 +1,523 @@
+"""
+Установка версий Minecraft и Java Runtime через общий HTTP-клиент лаунчера.
+
+Повторяет алгоритм minecraft_launcher_lib.install / runtime (та же структура
+папок, те же проверки sha1), но все загрузки идут через core.http.HttpClient:
+общий пул соединений, повторы, таймауты и лимиты скорости.
+"""
+import os
+import json
+import lzma
+import hashlib
+import shutil
+import platform
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from minecraft_launcher_lib.exceptions import VersionNotFound
+from minecraft_launcher_lib.natives import extract_natives_file
+from minecraft_launcher_lib._helper import check_path_inside_minecraft_directory
+from minecraft_launcher_lib.runtime import get_executable_path
+
+from core.http import HttpClient, ChecksumError, SizeMismatchError, get_client, file_sha1, PART_SUFFIX
+from core.jobs import CancelToken, JobCancelled, get_scheduler, PRIORITY_HIGH
+from core.assets import get_object_index
+from core.file_index import get_file_index
+from core.libraries import get_resolver
+from core.versions import find_version
+from core.version_meta import load_version_data
+
+# --- Адреса и параметры ---
+RESOURCES_URL = "https://resources.download.minecraft.net"
+JVM_MANIFEST_URL = "https://launchermeta.mojang.com/v1/products/java-runtime/2ec0cc96c44e5a76b9c8b7c39df7210883d12871/all.json"
+DOWNLOAD_WORKERS = 8 # Потоков общего пула загрузок (параллельность к одному хосту ограничивает HttpClient)
+
+
+def _empty(*args):
+    pass
+
+
+_runtime_locks: dict[str, threading.Lock] = {}
+_runtime_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _runtime_lock(runtime_dir: str, cancel_token: CancelToken | None = None):
+    """
+    Один runtime одновременно ставит только одна установка (версии из очереди
+    часто требуют одну и ту же Java): остальные ждут ее, а затем лишь проверяют файлы.
+    """
+    with _runtime_locks_guard:
+        lock = _runtime_locks.setdefault(os.path.normcase(os.path.abspath(runtime_dir)), threading.Lock())
+    while not lock.acquire(timeout=0.25):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+_download_pool = None
+_download_pool_lock = threading.Lock()
+
+
+def _get_download_pool() -> ThreadPoolExecutor:
+    """Общий для всех установок пул загрузок (установки из очереди и по кнопке "Играть" делят его)."""
+    global _download_pool
+    with _download_pool_lock:
+        if _download_pool is None:
+            _download_pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="NovaDownload")
+        return _download_pool
+
+
+def _run_parallel(func, items, callback, cancel_token: CancelToken | None = None):
+    """
+    Выполняет func для каждого элемента в общем пуле загрузок, сообщая прогресс.
+    В пуле одновременно не больше DOWNLOAD_WORKERS элементов одной установки,
+    поэтому одновременные установки чередуются, а не ждут друг друга целиком.
+    Отмена проверяется перед каждым элементом; после первой ошибки
+    (или отмены) еще не начатые элементы не запускаются.
+    """
+    def run(item):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        func(item)
+
+    callback.get("setMax", _empty)(max(0, len(items) - 1))
+    pool = _get_download_pool()
+    remaining = iter(items)
+    running = set()
+    count = 0
+    try:
+        while True:
+            for item in remaining:
+                running.add(pool.submit(run, item))
+                if len(running) >= DOWNLOAD_WORKERS:
+                    break
+            if not running:
+                break
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                future.result()
+                count += 1
+                callback.get("setProgress", _empty)(count)
+    except BaseException:
+        for future in running:
+            future.cancel()
+        wait(running) # Начатые загрузки дописывают .part
+        raise
+
+
+# --- Библиотеки ---
+
+def install_libraries(version_data: dict, minecraft_directory: str, callback: dict, client: HttpClient,
+                      cancel_token: CancelToken | None = None):
+    """Загружает библиотеки версии и распаковывает natives."""
+    callback.get("setStatus", _empty)("Download Libraries")
+    natives_dir = os.path.join(minecraft_directory, "versions", version_data["id"], "natives")
+    files = get_resolver(minecraft_directory).downloads(version_data) # Правила и пути - из кэша резолвера
+    file_index = get_file_index(minecraft_directory) # Проверенные раньше библиотеки не хэшируются
+
+    def install_file(entry):
+        check_path_inside_minecraft_directory(minecraft_directory, entry["path"])
+        try:
+            client.download(entry["url"], entry["path"], sha1=entry["sha1"], size=entry["size"],
+                            cancel_token=cancel_token, verified=file_index)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            if not entry.get("optional"):
+                raise
+            print(f"Предупреждение: Не удалось загрузить библиотеку {entry['url']}: {e}")
+            return
+        if entry["extract"] is not None and os.path.isfile(entry["path"]):
+            extract_natives_file(entry["path"], natives_dir, entry["extract"])
+
+    try:
+        _run_parallel(install_file, files, callback, cancel_token)
+    finally:
+        file_index.save()
+
+
+# --- Ассеты ---
+
+def install_assets(version_data: dict, minecraft_directory: str, callback: dict, client: HttpClient,
+                   cancel_token: CancelToken | None = None):
+    """Загружает индекс ассетов и все объекты из него."""
+    if "assetIndex" not in version_data:
+        return # У очень старых версий ассетов нет
+
+    callback.get("setStatus", _empty)("Download Assets")
+    index_path = os.path.join(minecraft_directory, "assets", "indexes", version_data["assets"] + ".json")
+    file_index = get_file_index(minecraft_directory)
+    client.download(version_data["assetIndex"]["url"], index_path, sha1=version_data["assetIndex"]["sha1"],
+                    size=version_data["assetIndex"].get("size"), cancel_token=cancel_token, verified=file_index)
+    file_index.save()
+    with open(index_path, 'r', encoding='utf-8') as f:
+        assets_data = json.load(f)
+
+    sizes = {obj["hash"]: obj.get("size") for obj in assets_data.get("objects", {}).values()}
+    objects_dir = os.path.join(minecraft_directory, "assets", "objects")
+    # Качаются (или проверяются) только объекты, которых нет в индексе проверенных
+    object_index = get_object_index(minecraft_directory)
+    missing = object_index.missing(sizes)
+    if len(missing) < len(sizes):
+        print(f"Ассеты {version_data['assets']}: нужно {len(missing)} из {len(sizes)} объектов")
+
+    def install_object(filehash):
+        client.download(f"{RESOURCES_URL}/{filehash[:2]}/{filehash}", os.path.join(objects_dir, filehash[:2], filehash),
+                        sha1=filehash, size=sizes[filehash], cancel_token=cancel_token)
+        object_index.add(filehash, sizes[filehash])
+
+    try:
+        _run_parallel(install_object, missing, callback, cancel_token)
+    finally:
+        object_index.save() # И при отмене: уже скачанное не проверяется заново
+
+
+# --- Версия целиком ---
+
+def _inherits_from(version: str, minecraft_directory: str, json_path: str) -> str | None:
+    """Родительская версия (inheritsFrom) - из кэша описаний, а пока родитель не скачан - из самого json."""
+    try:
+        return load_version_data(version, minecraft_directory).get("inheritsFrom")
+    except FileNotFoundError:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("inheritsFrom")
+
+
+def install_minecraft_version(version: str, minecraft_directory: str, callback: dict | None = None,
+                              client: HttpClient | None = None, cancel_token: CancelToken | None = None):
+    """
+    Устанавливает (или проверяет и докачивает) версию Minecraft.
+    Аналог minecraft_launcher_lib.install.install_minecraft_version.
+    При отмене через cancel_token бросается JobCancelled; недокачанные файлы
+    остаются рядом с целевыми (.part) и при следующей установке докачиваются.
+    """
+    minecraft_directory = str(minecraft_directory)
+    callback = callback or {}
+    client = client or get_client()
+
+    json_path = os.path.join(minecraft_directory, "versions", version, f"{version}.json")
+    if not os.path.isfile(json_path):
+        info = find_version(version, client)
+        if info is None:
+            raise VersionNotFound(version)
+        check_path_inside_minecraft_directory(minecraft_directory, json_path)
+        client.download(info["url"], json_path, sha1=info["sha1"], cancel_token=cancel_token)
+
+    # Модлоадеры (Forge/Fabric) наследуют ванильную версию - ее ставим первой
+    parent = _inherits_from(version, minecraft_directory, json_path)
+    if parent:
+        try:
+            install_minecraft_version(parent, minecraft_directory, callback, client, cancel_token)
+        except VersionNotFound:
+            pass
+    version_data = load_version_data(version, minecraft_directory) # Уже объединенное с родителем
+
+    install_libraries(version_data, minecraft_directory, callback, client, cancel_token)
+    install_assets(version_data, minecraft_directory, callback, client, cancel_token)
+
+    file_index = get_file_index(minecraft_directory)
+    try:
+        # Конфигурация логирования
+        logging_file = version_data.get("logging", {}).get("client", {}).get("file")
+        if logging_file:
+            logger_path = os.path.join(minecraft_directory, "assets", "log_configs", logging_file["id"])
+            check_path_inside_minecraft_directory(minecraft_directory, logger_path)
+            client.download(logging_file["url"], logger_path, sha1=logging_file.get("sha1"),
+                            size=logging_file.get("size"), cancel_token=cancel_token, verified=file_index)
+
+        # Клиент игры
+        jar_path = os.path.join(minecraft_directory, "versions", version_data["id"], version_data["id"] + ".jar")
+        if "downloads" in version_data and "client" in version_data["downloads"]:
+            client_jar = version_data["downloads"]["client"]
+            client.download(client_jar["url"], jar_path, sha1=client_jar["sha1"], size=client_jar.get("size"),
+                            cancel_token=cancel_token, verified=file_index)
+    finally:
+        file_index.save()
+
+    # Старым версиям Forge нужен jar родительской версии
+    if not os.path.isfile(jar_path) and "inheritsFrom" in version_data:
+        parent = version_data["inheritsFrom"]
+        parent_jar = os.path.join(minecraft_directory, "versions", parent, f"{parent}.jar")
+        if os.path.isfile(parent_jar):
+            shutil.copyfile(parent_jar, jar_path)
+
+    if "javaVersion" in version_data:
+        component = version_data["javaVersion"]["component"]
+        if client.is_offline(JVM_MANIFEST_URL) and get_java_executable(component, minecraft_directory):
+            callback.get("setStatus", _empty)("Installation complete")
+            return # Без сети довольствуемся уже установленным runtime
+        callback.get("setStatus", _empty)("Install java runtime")
+        install_jvm_runtime(version_data["javaVersion"]["component"], minecraft_directory, callback, client, cancel_token)
+
+    callback.get("setStatus", _empty)("Installation complete")
+
+
+# --- Java Runtime ---
+
+def jvm_platform_string() -> str:
+    """Имя платформы в манифесте Java Runtime от Mojang."""
+    system = platform.system()
+    is_32bit = platform.architecture()[0] == "32bit"
+    if system == "Windows":
+        return "windows-x86" if is_32bit else "windows-x64"
+    if system == "Linux":
+        return "linux-i386" if is_32bit else "linux"
+    if system == "Darwin":
+        return "mac-os-arm64" if platform.machine() == "arm64" else "mac-os"
+    return "gamecore"
+
+
+def install_jvm_runtime(jvm_version: str, minecraft_directory: str, callback: dict | None = None,
+                        client: HttpClient | None = None, cancel_token: CancelToken | None = None):
+    """Устанавливает Java Runtime от Mojang. Аналог minecraft_launcher_lib.runtime.install_jvm_runtime."""
+    minecraft_directory = str(minecraft_directory)
+    callback = callback or {}
+    client = client or get_client()
+
+    manifest = client.get_json(JVM_MANIFEST_URL)
+    platform_string = jvm_platform_string()
+    if jvm_version not in manifest.get(platform_string, {}):
+        raise VersionNotFound(jvm_version)
+    if not manifest[platform_string][jvm_version]:
+        return # Для этой платформы runtime нет
+    runtime_info = manifest[platform_string][jvm_version][0]
+    platform_manifest = client.get_json(runtime_info["manifest"]["url"])
+
+    runtime_dir = os.path.join(minecraft_directory, "runtime", jvm_version, platform_string)
+    base_path = os.path.join(runtime_dir, jvm_version)
+    installed_files = {} # Файл -> sha1 из манифеста (проверен при загрузке, второй раз не хэшируется)
+    file_index = get_file_index(minecraft_directory) # Проверенные при прошлых установках файлы не хэшируются
+
+    def install_runtime_file(item):
+        key, value = item
+        current_path = os.path.join(base_path, key)
+        check_path_inside_minecraft_directory(minecraft_directory, current_path)
+
+        if value["type"] == "file":
+            raw = value["downloads"]["raw"]
+            if "lzma" in value["downloads"]:
+                _download_lzma(client, value["downloads"]["lzma"]["url"], current_path, raw["sha1"], cancel_token,
+                               raw.get("size"), file_index)
+            else:
+                client.download(raw["url"], current_path, sha1=raw["sha1"], size=raw.get("size"),
+                                cancel_token=cancel_token, verified=file_index)
+            if value.get("executable") and os.name != "nt":
+                os.chmod(current_path, os.stat(current_path).st_mode | 0o111)
+            installed_files[key] = raw["sha1"]
+        elif value["type"] == "directory":
+            os.makedirs(current_path, exist_ok=True)
+        elif value["type"] == "link":
+            check_path_inside_minecraft_directory(minecraft_directory, os.path.join(base_path, value["target"]))
+            os.makedirs(os.path.dirname(current_path), exist_ok=True)
+            try:
+                os.symlink(value["target"], current_path)
+            except OSError:
+                pass # Ссылка уже есть или ОС их не поддерживает
+
+    callback.get("setStatus", _empty)(f"Install java runtime {jvm_version}")
+    with _runtime_lock(runtime_dir, cancel_token):
+        try:
+            _run_parallel(install_runtime_file, list(platform_manifest["files"].items()), callback, cancel_token)
+        finally:
+            file_index.save()
+
+        # Файлы .version и .sha1 - как у официального лаунчера
+        with open(os.path.join(runtime_dir, ".version"), 'w', encoding='utf-8') as f:
+            f.write(runtime_info["version"]["name"])
+        with open(os.path.join(runtime_dir, f"{jvm_version}.sha1"), 'w', encoding='utf-8') as f:
+            for key in sorted(installed_files):
+                path = os.path.join(base_path, key)
+                f.write(f"{key} /#// {installed_files[key]} {os.stat(path).st_ctime_ns}\n")
+
+
+def _download_lzma(client: HttpClient, url: str, path: str, sha1: str, cancel_token: CancelToken | None = None,
+                   size: int | None = None, verified=None):
+    """
+    Загружает lzma-сжатый файл runtime, распаковывая его на лету в .part;
+    sha1 и размер (size - распакованного файла) проверяются по ходу записи.
+    Докачка здесь невозможна (смещение в сжатом потоке не равно смещению в файле), только отмена.
+    verified - индекс проверенных файлов, как у HttpClient.download.
+    """
+    if os.path.isfile(path):
+        if verified is not None and verified.is_verified(path, sha1, size):
+            return
+        if (size is None or os.path.getsize(path) == size) and file_sha1(path) == sha1:
+            if verified is not None:
+                verified.add(path, sha1)
+            return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    part_path = path + PART_SUFFIX
+    decompressor = lzma.LZMADecompressor()
+    hasher = hashlib.sha1()
+    written = 0
+    with client.stream(url) as response:
+        response.raise_for_status()
+        with open(part_path, 'wb') as f:
+            for chunk in client.iter_content(response):
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                data = decompressor.decompress(chunk)
+                f.write(data)
+                hasher.update(data)
+                written += len(data)
+                if size is not None and written > size:
+                    break
+    if size is not None and written != size:
+        os.remove(part_path)
+        raise SizeMismatchError(url, path, size, written)
+    actual = hasher.hexdigest()
+    if actual != sha1:
+        os.remove(part_path)
+        raise ChecksumError(url, path, sha1, actual)
+    os.replace(part_path, path)
+    if verified is not None:
+        verified.add(path, sha1)
+
+
+def get_java_executable(jvm_version: str, minecraft_directory: str) -> str | None:
+    """Путь к java из установленного runtime (или None)."""
+    return get_executable_path(jvm_version, minecraft_directory)
+
+
+# --- Подготовка к запуску ---
+
+DEFAULT_JVM_VERSION = "jre-legacy" # Runtime для старых версий, в описании которых нет javaVersion
+
+
+def required_jvm_version(version: str, minecraft_directory: str) -> str:
+    """Runtime, который нужен установленной версии (javaVersion.component), или DEFAULT_JVM_VERSION."""
+    java_version = load_version_data(version, minecraft_directory).get("javaVersion") or {}
+    return java_version.get("component") or DEFAULT_JVM_VERSION
+
+
+def resolve_java(version: str, minecraft_directory: str, java_path: str | None = None) -> str | None:
+    """
+    Java для запуска установленной версии: путь пользователя, если файл существует,
+    иначе управляемый runtime, который нужен версии. None - runtime не установлен.
+    """
+    if java_path and os.path.exists(java_path):
+        return java_path
+    return get_java_executable(required_jvm_version(version, minecraft_directory), minecraft_directory)
+
+
+def prepare_version(version: str, minecraft_directory: str, java_path: str | None = None,
+                    callback: dict | None = None, jvm_version: str | None = None,
+                    cancel_token: CancelToken | None = None) -> str:
+    """
+    Готовит версию к запуску: устанавливает/докачивает саму версию и
+    находит (или устанавливает) Java для нее. Возвращает путь к java.
+    Путь java_path, указанный пользователем, используется, если файл существует;
+    иначе берется runtime из javaVersion версии (jvm_version - явный выбор runtime).
+    Отмена через cancel_token - JobCancelled (прерванная установка потом докачивается).
+    """
+    callback = callback or {}
+    set_status = callback.get("setStatus", _empty)
+
+    # 1. Установка/проверка версии Minecraft (заодно ставит runtime из ее javaVersion)
+    set_status(f"Проверка Minecraft {version}...")
+    install_minecraft_version(version, minecraft_directory, callback=callback, cancel_token=cancel_token)
+    print(f"Установка Minecraft {version} завершена.")
+
+    # 2. Определяем путь к Java
+    jvm_version = jvm_version or required_jvm_version(version, minecraft_directory)
+    effective_java_path = java_path
+    if java_path and not os.path.exists(java_path):
+        print(f"Предупреждение: Указанный пользователем путь Java не найден: {java_path}. Попытка установки {jvm_version}.")
+        effective_java_path = None
+    elif not java_path:
+        print(f"Явный путь к Java не указан, ищем существующую ({jvm_version})...")
+        try:
+            effective_java_path = get_java_executable(jvm_version, minecraft_directory)
+        except Exception as e:
+            print(f"Ошибка при поиске Java ({jvm_version}): {e}")
+            effective_java_path = None
+        if effective_java_path:
+            print(f"Найдена управляемая Java ({jvm_version}): {effective_java_path}")
+        else:
+            print(f"Управляемая Java ({jvm_version}) не найдена.")
+
+    # 3. Java не нашлась - устанавливаем runtime от Mojang
+    if not effective_java_path:
+        print(f"Пытаемся установить Java Runtime ({jvm_version})...")
+        set_status(f"Установка среды Java ({jvm_version})...")
+        try:
+            install_jvm_runtime(jvm_version, minecraft_directory, callback, cancel_token=cancel_token)
+            effective_java_path = get_java_executable(jvm_version, minecraft_directory)
+            if not effective_java_path:
+                raise RuntimeError(f"Не удалось найти {jvm_version} даже после попытки установки.")
+        except JobCancelled:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Критическая ошибка: Не удалось установить Java Runtime ({jvm_version}): {e}") from e
+        print(f"Java Runtime ({jvm_version}) успешно установлен: {effective_java_path}")
+
+    if not os.path.exists(effective_java_path):
+        raise RuntimeError("Критическая ошибка: Не удалось определить действительный путь к Java.")
+    print(f"Используемый Java: {effective_java_path}")
+    set_status("Готово к запуску!")
+    return effective_java_path
+
+
+class InstallProgress:
+    """
+    Общий прогресс установки версии: события установщика раздаются всем
+    подписанным callback-словарям, а новый подписчик сразу получает текущее
+    состояние (этап, число элементов и позицию).
+    """
+
+    def __init__(self):
+        self._listeners = []
+        self._state = {} # Последние значения setStatus / setMax / setProgress
+        self._lock = threading.Lock()
+
+    def callback(self) -> dict:
+        """Callback-словарь для prepare_version."""
+        return {name: (lambda value, name=name: self._emit(name, value))
+                for name in ("setStatus", "setMax", "setProgress")}
+
+    def add(self, callback: dict):
+        with self._lock:
+            self._listeners.append(callback)
+            state = dict(self._state)
+        for name in ("setStatus", "setMax", "setProgress"): # Этап, затем максимум и позиция
+            if name in state:
+                callback.get(name, _empty)(state[name])
+
+    def remove(self, callback: dict):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _emit(self, name: str, value):
+        with self._lock:
+            if name == "setMax":
+                self._state.pop("setProgress", None)
+            self._state[name] = value
+            listeners = list(self._listeners)
+        for callback in listeners:
+            callback.get(name, _empty)(value)
+
+
+def submit_install(version: str, minecraft_directory: str, java_path: str | None = None,
+                   callback: dict | None = None, priority: int = PRIORITY_HIGH):
+    """
+    Ставит prepare_version в общий планировщик с ключом ("install", version).
+    Если версия уже ставится (очередь установки, кнопка "Играть", CLI), Job
+    присоединяется к этой установке: callback получает ее прогресс, а отмена
+    Job останавливает установку, только когда ее отменили все, кто ее ждет.
+    """
+    token, progress = CancelToken(), InstallProgress()
+    job = get_scheduler().submit(
+        lambda: prepare_version(version, minecraft_directory, java_path, progress.callback(), cancel_token=token),
+        priority=priority, key=("install", version), cancel_token=token, shared={"progress": progress}
+    )
+    if callback:
+        shared_progress = job.shared["progress"] # Прогресс уже идущей установки, если Job к ней присоединился
+        shared_progress.add(callback)
+        job.add_done_callback(lambda _: shared_progress.remove(callback))
+    return job
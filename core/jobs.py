@@ -0,0 +1,308 @@
+"""
+Общий планировщик фоновых задач на concurrent.futures.
+
+Все фоновые задачи лаунчера (список версий, лента и картинки новостей,
+установка) выполняются в одном пуле с ограниченным числом потоков.
+Ожидающие задачи лежат в куче по приоритету, а в пул отдается не больше
+задач, чем в нем потоков, поэтому срочная задача обгоняет уже поставленные
+фоновые. Задачи с одинаковым ключом не дублируются: пока такая задача ждет
+или выполняется, повторная постановка присоединяется к ней (и может поднять
+ей приоритет), но получает свой Job. Отмена кооперативная: ожидающая задача
+просто снимается с очереди, а выполняющаяся должна сама проверять свой
+CancelToken; общая задача останавливается, только когда ее отменили все,
+кто ее поставил.
+
+Модуль не зависит от Qt. В окне лаунчера результаты в GUI-поток переправляет
+JobWatcher (main.py), в режиме --headless результата просто ждут.
+"""
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, CancelledError, InvalidStateError
+
+# --- Приоритеты (меньше - раньше) ---
+PRIORITY_HIGH = 0 # То, чего пользователь ждет прямо сейчас (установка, видимые картинки)
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20 # Фоновые обновления
+SCHEDULER_WORKERS = 4 # Потоков в общем пуле
+INTERACTIVE_RESERVE = 2 # Потоков пула, которые не занимают длинные задачи (установки из очереди)
+
+
+class JobCancelled(Exception):
+    """Задача остановлена по токену отмены."""
+
+
+class CancelToken:
+    """Флаг отмены, который задача проверяет между шагами своей работы."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """Бросает JobCancelled, если отмена уже запрошена."""
+        if self._event.is_set():
+            raise JobCancelled()
+
+    def wait(self, timeout: float) -> bool:
+        """Пауза, прерываемая отменой. True - отмена запрошена."""
+        return self._event.wait(timeout)
+
+
+class _Task:
+    """Общая работа планировщика: функция, токен отмены, ключ, приоритет и подписчики (Job)."""
+
+    def __init__(self, func, args, kwargs, priority: int, key, token: CancelToken | None, shared: dict | None = None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.token = token or CancelToken()
+        self.future = Future()
+        self.subscribers = [] # Job всех вызывающих, поставивших задачу
+        self.shared = shared if shared is not None else {} # Данные для всех подписчиков (например, общий прогресс)
+        self._dispatched = False
+
+
+class Job:
+    """
+    Задача планировщика для одного вызывающего: future с результатом, ключ и приоритет.
+    Одинаковые задачи (с одним ключом) выполняются один раз, но у каждого
+    вызывающего свой Job: его отмена не мешает остальным.
+    """
+
+    def __init__(self, scheduler, task: _Task):
+        self._scheduler = scheduler
+        self._task = task
+        self.future = Future()
+        self._cancel_requested = False
+
+    @property
+    def key(self):
+        return self._task.key
+
+    @property
+    def priority(self) -> int:
+        return self._task.priority
+
+    @property
+    def token(self) -> CancelToken:
+        """Токен общей работы (его проверяет сама функция задачи)."""
+        return self._task.token
+
+    @property
+    def shared(self) -> dict:
+        """Словарь, общий для всех Job одной работы."""
+        return self._task.shared
+
+    def cancel(self):
+        """
+        Отменяет задачу для этого вызывающего. Сама работа останавливается, когда
+        ее отменили все, кто ее ждет: ожидающая не запустится, выполняющаяся
+        получит сигнал через токен (и Job завершится вместе с ней).
+        """
+        self._scheduler._unsubscribe(self)
+
+    @property
+    def cancelled(self) -> bool:
+        """Задача отменена до запуска или остановилась по токену."""
+        if self.future.cancelled():
+            return True
+        return self.future.done() and isinstance(self.future.exception(), JobCancelled)
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: float | None = None):
+        return self.future.result(timeout)
+
+    def exception(self, timeout: float | None = None) -> BaseException | None:
+        try:
+            return self.future.exception(timeout)
+        except CancelledError as e:
+            return e
+
+    def add_done_callback(self, callback):
+        """callback(job) - в потоке пула или сразу, если задача уже завершена."""
+        self.future.add_done_callback(lambda _: callback(self))
+
+    def __repr__(self):
+        name = getattr(self._task.func, "__name__", repr(self._task.func))
+        return f"<Job {self.key or name} priority={self.priority}>"
+
+
+class JobScheduler:
+    """Пул потоков с приоритетами, отменой и слиянием одинаковых задач."""
+
+    def __init__(self, max_workers: int = SCHEDULER_WORKERS):
+        self.max_workers = max(1, int(max_workers))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="NovaJob")
+        self._lock = threading.Lock()
+        self._heap = [] # (приоритет, порядковый номер, работа)
+        self._counter = itertools.count()
+        self._by_key = {} # ключ -> ожидающая или выполняющаяся работа
+        self._live = set() # Вся незавершенная работа (для shutdown)
+        self._running = 0
+        self._closed = False
+
+    def submit(self, func, *args, priority: int = PRIORITY_NORMAL, key=None,
+               cancel_token: CancelToken | None = None, shared: dict | None = None, **kwargs) -> Job:
+        """
+        Ставит func(*args, **kwargs) в очередь. Если задача с тем же key еще
+        не завершилась (и не отменена), новый Job присоединяется к ней
+        (с приоритетом не ниже запрошенного); cancel_token и shared при этом
+        не используются - у Job будут токен и shared той задачи.
+        После shutdown() возвращается уже отмененная задача.
+        """
+        with self._lock:
+            if self._closed:
+                # После shutdown (закрытие окна) задачи сразу отменяются, а не падают с ошибкой
+                job = Job(self, _Task(func, args, kwargs, priority, key, cancel_token, shared))
+                job.token.cancel()
+                job.future.cancel()
+                return job
+            if key is not None:
+                existing = self._by_key.get(key)
+                if existing is not None and not existing.future.done() and not existing.token.cancelled:
+                    if priority < existing.priority and not existing._dispatched:
+                        existing.priority = priority
+                        heapq.heappush(self._heap, (priority, next(self._counter), existing))
+                    job = Job(self, existing)
+                    existing.subscribers.append(job)
+                    return job
+            task = _Task(func, args, kwargs, priority, key, cancel_token, shared)
+            job = Job(self, task)
+            task.subscribers.append(job)
+            task.future.add_done_callback(lambda _: self._settle(task))
+            if key is not None:
+                self._by_key[key] = task
+            self._live.add(task)
+            heapq.heappush(self._heap, (priority, next(self._counter), task))
+            self._dispatch_locked()
+        return job
+
+    def find(self, key) -> Job | None:
+        """Незавершенная задача с ключом key (или None) - первый ее Job."""
+        with self._lock:
+            task = self._by_key.get(key)
+        return task.subscribers[0] if task is not None and not task.future.done() else None
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len({id(task) for _, _, task in self._heap if not task._dispatched and not task.future.done()})
+
+    @property
+    def long_job_limit(self) -> int:
+        """
+        Сколько длинных задач (установок) можно держать одновременно, чтобы
+        иконкам, новостям, списку версий и установке по кнопке "Играть"
+        всегда оставались свободные потоки.
+        """
+        return max(1, self.max_workers - INTERACTIVE_RESERVE)
+
+    def running_count(self) -> int:
+        with self._lock:
+            return self._running
+
+    def shutdown(self, wait: bool = False):
+        """Отменяет все задачи (выполняющимся - через токен) и останавливает пул."""
+        with self._lock:
+            self._closed = True
+            tasks = list(self._live)
+            self._heap.clear()
+        for task in tasks:
+            task.token.cancel()
+            if task.future.cancel():
+                self._forget(task)
+        self._executor.shutdown(wait=wait)
+
+    # --- Внутреннее ---
+
+    def _dispatch_locked(self):
+        """Отдает в пул задачи с наивысшим приоритетом, пока есть свободные потоки."""
+        while self._heap and self._running < self.max_workers:
+            _, _, task = heapq.heappop(self._heap)
+            if task._dispatched:
+                continue # Устаревшая запись после повышения приоритета
+            task._dispatched = True
+            if task.future.cancelled():
+                continue
+            self._running += 1
+            self._executor.submit(self._run, task)
+
+    def _run(self, task: _Task):
+        outcome, value = None, None
+        if task.future.set_running_or_notify_cancel():
+            try:
+                task.token.raise_if_cancelled()
+                outcome, value = "result", task.func(*task.args, **task.kwargs)
+            except BaseException as e:
+                outcome, value = "exception", e
+        # Ключ освобождаем до публикации результата: обработчик может сразу поставить задачу заново
+        with self._lock:
+            self._running -= 1
+            self._live.discard(task)
+            if task.key is not None and self._by_key.get(task.key) is task:
+                del self._by_key[task.key]
+            if not self._closed:
+                self._dispatch_locked()
+        if outcome == "result":
+            task.future.set_result(value)
+        elif outcome == "exception":
+            task.future.set_exception(value)
+
+    def _unsubscribe(self, job: Job):
+        """Отмена одного Job: работа останавливается, только если ее отменили все подписчики."""
+        task = job._task
+        with self._lock:
+            if job._cancel_requested or job.future.done():
+                return
+            job._cancel_requested = True
+            last = all(other._cancel_requested for other in task.subscribers)
+        if not last:
+            job.future.cancel() # Работа продолжается для остальных
+            return
+        task.token.cancel()
+        if task.future.cancel():
+            self._forget(task)
+
+    def _settle(self, task: _Task):
+        """Передает итог работы всем ее Job (кроме уже отмененных по отдельности)."""
+        for job in list(task.subscribers):
+            try:
+                if task.future.cancelled():
+                    job.future.cancel()
+                elif task.future.exception() is not None:
+                    job.future.set_exception(task.future.exception())
+                else:
+                    job.future.set_result(task.future.result())
+            except InvalidStateError:
+                pass # Этот Job уже отменен сам по себе
+
+    def _forget(self, task: _Task):
+        with self._lock:
+            self._live.discard(task)
+            if task.key is not None and self._by_key.get(task.key) is task:
+                del self._by_key[task.key]
+
+
+# --- Общий планировщик лаунчера ---
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> JobScheduler:
+    """Возвращает общий планировщик задач (создается при первом обращении)."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = JobScheduler()
+    return _scheduler
@@ -0,0 +1,74 @@
+"""
+Запуск игры: папка данных лаунчера и команда запуска Minecraft.
+
+minecraft_launcher_lib импортируется внутри функций - модуль можно
+подключать до того, как тяжелые модули загружены.
+"""
+import os
+import uuid
+import hashlib
+import subprocess
+
+MINECRAFT_DATA_DIR_NAME = "NovaLauncherMC"
+LAUNCHER_NAME = "NovaLauncher"
+LAUNCHER_VERSION = "2.0.0.1"
+
+
+def get_minecraft_directory(create: bool = True) -> str:
+    """Папка данных игры лаунчера (рядом со стандартной папкой .minecraft)."""
+    import minecraft_launcher_lib
+    base_dir = os.path.dirname(minecraft_launcher_lib.utils.get_minecraft_directory())
+    path = os.path.join(base_dir, MINECRAFT_DATA_DIR_NAME)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def offline_uuid(username: str) -> str:
+    """UUID игрока без аккаунта - так же, как его считает сервер в офлайн-режиме."""
+    digest = hashlib.md5(f"OfflinePlayer:{username}".encode("utf-8")).digest()
+    return str(uuid.UUID(bytes=digest, version=3))
+
+
+def build_command(version: str, minecraft_directory: str, java_path: str, username: str,
+                  min_memory: int, max_memory: int) -> list[str]:
+    """
+    Команда запуска версии для офлайн-профиля. Та же, что дает
+    minecraft_launcher_lib.command.get_minecraft_command, но описание версии
+    берется из кэша core.version_meta, а classpath - из core.libraries.
+    """
+    from minecraft_launcher_lib.command import get_arguments, get_arguments_string
+    from core.version_meta import load_version_data
+    from core.libraries import get_resolver
+    path = str(minecraft_directory)
+    data = load_version_data(version, path)
+    natives_directory = os.path.join(path, "versions", data["id"], "natives")
+    options = {
+        "username": username,
+        "uuid": offline_uuid(username),
+        "token": "",
+        "executablePath": java_path,
+        "jvmArguments": [f"-Xms{min_memory}M", f"-Xmx{max_memory}M"],
+        "launcherName": LAUNCHER_NAME,
+        "launcherVersion": LAUNCHER_VERSION,
+        "nativesDirectory": natives_directory,
+    }
+    classpath = get_resolver(path).classpath(data) # Из запомненных фрагментов библиотек
+
+    command = [java_path] + options["jvmArguments"]
+    if isinstance(data.get("arguments"), dict) and "jvm" in data["arguments"]:
+        command += get_arguments(data["arguments"]["jvm"], data, path, options, classpath)
+    else:
+        command += [f"-Djava.library.path={natives_directory}", "-cp", classpath]
+    command.append(data["mainClass"])
+    if "minecraftArguments" in data:
+        command += get_arguments_string(data, path, options, classpath) # Старые версии
+    else:
+        command += get_arguments(data["arguments"]["game"], data, path, options, classpath)
+    return command
+
+
+def start_game(command: list[str], minecraft_directory: str) -> subprocess.Popen:
+    """Запускает игру отдельным процессом в папке данных."""
+    print(f"Запуск: {' '.join(command)}")
+    return subprocess.Popen(command, cwd=minecraft_directory)
@@ -0,0 +1,264 @@
+"""
+Разрешение библиотек версий под текущую платформу.
+
+minecraft_launcher_lib проверяет правила (rules) и natives библиотеки
+заново при каждой установке и каждой сборке classpath, а на Linux и macOS
+каждая такая проверка вызывает platform.architecture() - это запуск
+внешней команды file. Здесь сведения о платформе собираются один раз,
+а результат разрешения библиотеки (нужна ли она здесь, ее пути в classpath
+и файлы для загрузки) запоминается по ее описанию: одинаковые библиотеки
+разных версий разрешаются один раз и делят одни и те же строки путей.
+
+classpath версии собирается из готовых фрагментов библиотек и тоже
+запоминается, пока описание версии (core.version_meta) не поменялось.
+Результат совпадает с minecraft_launcher_lib.command.get_libraries.
+"""
+import os
+import re
+import sys
+import marshal
+import platform
+import threading
+
+LIBRARIES_URL = "https://libraries.minecraft.net"
+
+# Признаки (features) из правил, которые у библиотек всегда выключены (как у parse_rule_list с пустыми options)
+_RULE_FEATURES = ("has_custom_resolution", "is_demo_user", "has_quick_plays_support",
+                  "is_quick_play_singleplayer", "is_quick_play_multiplayer", "is_quick_play_realms")
+_RULE_SYSTEMS = {"windows": "Windows", "osx": "Darwin", "linux": "Linux"} # Имя ОС в правилах -> platform.system()
+_NATIVE_NAMES = {"Windows": "windows", "Darwin": "osx"} # Для остальных систем берутся natives "linux"
+
+
+class PlatformInfo:
+    """Сведения о платформе для правил библиотек (как их проверяет minecraft_launcher_lib)."""
+
+    def __init__(self):
+        self.system = platform.system()
+        self.native_name = _NATIVE_NAMES.get(self.system, "linux")
+        self.is_32bit = platform.architecture()[0] == "32bit"
+        self.arch = "32" if self.is_32bit else "64"
+        if self.system == "Windows":
+            version = sys.getwindowsversion()
+            self.os_version = f"{version.major}.{version.minor}"
+        else:
+            self.os_version = platform.uname().release
+        self.classpath_separator = ";" if self.system == "Windows" else ":"
+
+    def rule_allows(self, rule: dict) -> bool:
+        """Аналог minecraft_launcher_lib._helper.parse_single_rule с пустыми options."""
+        disallow = rule.get("action") == "disallow"
+        for key, value in rule.get("os", {}).items():
+            if key == "name" and value in _RULE_SYSTEMS and _RULE_SYSTEMS[value] != self.system:
+                return disallow
+            if key == "arch" and value == "x86" and not self.is_32bit:
+                return disallow
+            if key == "version" and not re.match(value, self.os_version):
+                return disallow
+        if any(feature in _RULE_FEATURES for feature in rule.get("features", {})):
+            return disallow
+        return not disallow
+
+    def rules_allow(self, rules: list) -> bool:
+        return all(self.rule_allows(rule) for rule in rules)
+
+    def native(self, library: dict) -> str:
+        """Классификатор natives библиотеки для этой платформы ("" - natives нет). Аналог get_natives."""
+        natives = library.get("natives", {}).get(self.native_name)
+        return natives.replace("${arch}", self.arch) if natives else ""
+
+
+_platform = None
+
+
+def current_platform() -> PlatformInfo:
+    global _platform
+    if _platform is None:
+        _platform = PlatformInfo()
+    return _platform
+
+
+def _maven_path(name: str) -> tuple[str, str, str]:
+    """Возвращает (папка, имя файла, native-префикс) для maven-координаты group:artifact:version[@ext]."""
+    group, artifact, version = name.split(":")[0:3]
+    try:
+        version, ext = version.split("@")
+    except ValueError:
+        ext = "jar"
+    folder = "/".join(group.split(".") + [artifact, version])
+    return folder, f"{artifact}-{version}.{ext}", f"{artifact}-{version}"
+
+
+def _library_path(name: str, minecraft_directory: str) -> str:
+    """Путь jar по maven-координате group:artifact:version[:classifier...][@ext] (как get_library_path)."""
+    name, at, suffix = name.partition("@")
+    parts = name.split(":")
+    group, artifact, version = parts[0:3]
+    filename = f"{artifact}-{version}{''.join(f'-{part}' for part in parts[3:])}.{suffix if at else 'jar'}"
+    return os.path.join(minecraft_directory, "libraries", *group.split("."), artifact, version, filename)
+
+
+class ResolvedLibrary:
+    """Библиотека, нужная на этой платформе: пути в classpath и файлы для загрузки."""
+    __slots__ = ("name", "classpath", "fragment", "downloads")
+
+    def __init__(self, name: str, classpath: tuple, downloads: tuple, separator: str):
+        self.name = name
+        self.classpath = classpath
+        self.fragment = "".join(path + separator for path in classpath) # Кусок строки classpath
+        self.downloads = downloads
+
+
+class LibraryResolver:
+    """Разрешенные библиотеки одной папки данных (потокобезопасно, только в памяти)."""
+
+    def __init__(self, minecraft_directory: str):
+        self.minecraft_directory = str(minecraft_directory)
+        self.platform = current_platform()
+        self._resolved: dict[bytes, ResolvedLibrary | None] = {} # marshal описания -> результат
+        self._classpaths: dict[str, tuple] = {} # id версии -> (описание версии, classpath)
+        self._lock = threading.Lock()
+
+    def resolve(self, library: dict) -> ResolvedLibrary | None:
+        """Разрешает библиотеку (None - не нужна на этой платформе по правилам)."""
+        key = marshal.dumps(library)
+        with self._lock:
+            if key in self._resolved:
+                return self._resolved[key]
+        resolved = self._resolve(library)
+        with self._lock:
+            return self._resolved.setdefault(key, resolved)
+
+    def classpath(self, version_data: dict) -> str:
+        """Строка classpath версии (описание - из core.version_meta, запоминается до его смены)."""
+        with self._lock:
+            cached = self._classpaths.get(version_data["id"])
+        if cached is not None and cached[0] is version_data:
+            return cached[1]
+        fragments = [resolved.fragment for resolved in map(self.resolve, version_data.get("libraries", []))
+                     if resolved is not None]
+        jar = version_data.get("jar", version_data["id"])
+        classpath = "".join(fragments) + os.path.join(self.minecraft_directory, "versions", jar, jar + ".jar")
+        with self._lock:
+            self._classpaths[version_data["id"]] = (version_data, classpath)
+        return classpath
+
+    def downloads(self, version_data: dict) -> list[dict]:
+        """Файлы библиотек версии для загрузки (см. library_downloads)."""
+        return [entry for resolved in map(self.resolve, version_data.get("libraries", [])) if resolved is not None
+                for entry in resolved.downloads]
+
+    def shared_libraries(self) -> dict[str, list[str]]:
+        """
+        Файлы библиотек, которые используют несколько установленных версий:
+        путь -> [версии], сначала самые общие.
+        """
+        from core.version_meta import installed_versions, load_version_data
+        users = {}
+        for version, _ in installed_versions(self.minecraft_directory):
+            try:
+                version_data = load_version_data(version, self.minecraft_directory)
+            except Exception as e:
+                print(f"Библиотеки версии {version} не учтены: {e}")
+                continue
+            for path in dict.fromkeys(entry["path"] for entry in self.downloads(version_data)):
+                users.setdefault(path, []).append(version)
+        shared = {path: sorted(versions) for path, versions in users.items() if len(versions) > 1}
+        return dict(sorted(shared.items(), key=lambda item: (-len(item[1]), item[0])))
+
+    def _resolve(self, library: dict) -> ResolvedLibrary | None:
+        if "rules" in library and not self.platform.rules_allow(library["rules"]):
+            return None
+        native = self.platform.native(library)
+        name = library["name"]
+        classpath = [_library_path(name, self.minecraft_directory)]
+        if native:
+            classifier = library.get("downloads", {}).get("classifiers", {}).get(native)
+            if classifier and "path" in classifier:
+                classpath.append(os.path.join(self.minecraft_directory, "libraries", classifier["path"]))
+            else:
+                classpath.append(_library_path(f"{name}-{native}", self.minecraft_directory))
+        downloads = _library_files(library, native, self.minecraft_directory)
+        for entry in downloads:
+            entry["path"] = sys.intern(entry["path"])
+        return ResolvedLibrary(name, tuple(map(sys.intern, classpath)), tuple(downloads),
+                               self.platform.classpath_separator)
+
+
+def _library_files(library: dict, native: str, minecraft_directory: str) -> list[dict]:
+    """Файлы библиотеки, правила которой уже проверены (native - классификатор natives или "")."""
+    libraries_dir = os.path.join(minecraft_directory, "libraries")
+    files = []
+
+    if "downloads" in library:
+        artifact = library["downloads"].get("artifact")
+        if artifact and artifact.get("url") and "path" in artifact:
+            files.append({
+                "url": artifact["url"],
+                "path": os.path.join(libraries_dir, artifact["path"]),
+                "sha1": artifact.get("sha1"),
+                "size": artifact.get("size"),
+                "extract": None,
+            })
+        if native:
+            classifier = library["downloads"].get("classifiers", {}).get(native)
+            if classifier:
+                try:
+                    folder, _, base = _maven_path(library["name"])
+                except ValueError:
+                    return files
+                files.append({
+                    "url": classifier["url"],
+                    "path": os.path.join(libraries_dir, *folder.split("/"), f"{base}-{native}.jar"),
+                    "sha1": classifier.get("sha1"),
+                    "size": classifier.get("size"),
+                    "extract": library.get("extract", {"exclude": []}),
+                })
+        return files
+
+    # Старый формат: только maven-координата и (необязательно) адрес репозитория
+    try:
+        folder, filename, base = _maven_path(library["name"])
+    except ValueError:
+        return []
+    base_url = library.get("url", LIBRARIES_URL).rstrip("/")
+    files.append({
+        "url": f"{base_url}/{folder}/{filename}",
+        "path": os.path.join(libraries_dir, *folder.split("/"), filename),
+        "sha1": None,
+        "size": None,
+        "extract": None,
+        "optional": True, # Старые библиотеки без хэша иногда отсутствуют на сервере
+    })
+    if native:
+        files.append({
+            "url": f"{base_url}/{folder}/{base}-{native}.jar",
+            "path": os.path.join(libraries_dir, *folder.split("/"), f"{base}-{native}.jar"),
+            "sha1": None,
+            "size": None,
+            "extract": library.get("extract", {"exclude": []}),
+            "optional": True,
+        })
+    return files
+
+
+def library_downloads(library: dict, minecraft_directory: str) -> list[dict]:
+    """
+    Список файлов, которые нужны библиотеке на текущей платформе:
+    [{"url", "path", "sha1", "size", "extract"}], где extract - параметры распаковки natives или None.
+    """
+    resolved = get_resolver(minecraft_directory).resolve(library)
+    return list(resolved.downloads) if resolved is not None else []
+
+
+_resolvers: dict[str, LibraryResolver] = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(minecraft_directory: str) -> LibraryResolver:
+    """Общий резолвер папки данных."""
+    key = os.path.normcase(os.path.abspath(str(minecraft_directory)))
+    with _resolvers_lock:
+        resolver = _resolvers.get(key)
+        if resolver is None:
+            resolver = _resolvers[key] = LibraryResolver(minecraft_directory)
+        return resolver
@@ -0,0 +1,227 @@
+"""
+Зеркало загрузок и раздача своего кэша по локальной сети.
+
+Раскладка зеркала: файл https://<хост>/<путь> лежит по адресу
+<база зеркала>/<хост>/<путь>. Зеркалируются только хосты Mojang
+(MIRROR_HOSTS) - манифест версий, библиотеки, ассеты и Java Runtime.
+Такое зеркало можно собрать любым статическим HTTP-сервером (например,
+каталог после wget -x), а можно поднять прямо в лаунчере - CacheServer.
+
+CacheServer отдает файлы из папки данных этой машины (библиотеки и ассеты
+лежат там в той же раскладке), а то, чего нет, один раз скачивает из
+источника через общий HTTP-клиент и сохраняет - так 40 машин в классе
+скачивают каждый файл из интернета один раз. Поддерживаются запросы
+Range, поэтому клиенты докачивают прерванные файлы и через зеркало.
+"""
+import os
+import re
+import time
+import threading
+import posixpath
+import urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# --- Параметры зеркала ---
+MIRROR_HOSTS = (
+    "launchermeta.mojang.com",
+    "piston-meta.mojang.com",
+    "piston-data.mojang.com",
+    "libraries.minecraft.net",
+    "resources.download.minecraft.net",
+)
+UPSTREAM_SCHEME = "https" # Схема исходных адресов, которые CacheServer докачивает при промахе
+SERVE_PORT = 8770
+SERVE_CHUNK_SIZE = 64 * 1024
+MUTABLE_TTL = 10 * 60 # сек; манифесты (не адресуемые по хэшу) перезапрашиваются не чаще
+# Пути, содержимое которых меняется без смены адреса (остальное адресуется хэшем или версией)
+MUTABLE_PATHS = ("/mc/game/", "/v1/products/")
+# Файлы, которые уже лежат в папке данных в раскладке зеркала: хост -> подпапка
+STORE_LAYOUT = {
+    "libraries.minecraft.net": "libraries",
+    "resources.download.minecraft.net": os.path.join("assets", "objects"),
+}
+_SHA1_IN_PATH = re.compile(r"/([0-9a-f]{40})(?:/|$)")
+
+
+def mirror_url(base: str | None, url: str) -> str | None:
+    """Адрес файла на зеркале base или None, если url не зеркалируется."""
+    if not base:
+        return None
+    parts = urllib.parse.urlsplit(url)
+    if parts.netloc.lower() not in MIRROR_HOSTS:
+        return None
+    mirrored = f"{base.rstrip('/')}/{parts.netloc.lower()}{parts.path}"
+    return f"{mirrored}?{parts.query}" if parts.query else mirrored
+
+
+class CacheServer:
+    """
+    HTTP-сервер "раздать мой кэш" в раскладке зеркала (GET и HEAD).
+    Работает в фоновых потоках, от Qt не зависит.
+    """
+
+    def __init__(self, minecraft_directory: str, host: str = "0.0.0.0", port: int = SERVE_PORT,
+                 proxy_dir: str | None = None, fetch_missing: bool = True):
+        self.minecraft_directory = os.path.abspath(minecraft_directory)
+        self.proxy_dir = os.path.abspath(proxy_dir or os.path.join(minecraft_directory, "mirror"))
+        self.fetch_missing = fetch_missing
+        self._address = (host, int(port))
+        self._server = None
+        self._thread = None
+        self.served = 0 # Отдано ответов с файлами (для статистики)
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1] if self._server else self._address[1]
+
+    def start(self):
+        """Открывает порт и начинает раздачу (OSError - порт занят)."""
+        if self._server is not None:
+            return
+        server = ThreadingHTTPServer(self._address, _make_handler(self))
+        server.daemon_threads = True
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="CacheServer", daemon=True)
+        self._thread.start()
+        print(f"Раздача кэша: http://{self._address[0]}:{self.port}/ ({self.minecraft_directory})")
+
+    def stop(self):
+        if self._server is None:
+            return
+        server, self._server = self._server, None
+        server.shutdown()
+        server.server_close()
+        print("Раздача кэша остановлена.")
+
+    def serve_forever(self):
+        """Раздача в текущем потоке (режим --headless); прерывается Ctrl+C."""
+        self.start()
+        try:
+            while self._thread.is_alive():
+                self._thread.join(0.5)
+        finally:
+            self.stop()
+
+    # --- Файлы ---
+
+    def local_path(self, host: str, path: str) -> str | None:
+        """
+        Файл для /<host>/<path>: в папке данных (если раскладка совпадает) или в папке зеркала.
+        None - путь не из раскладки зеркала или ведет за пределы своей папки.
+        """
+        if host not in MIRROR_HOSTS or "\\" in path or ":" in path or "\0" in path:
+            return None # Разделители и диски Windows (C:\..., \\server\...) в адресах Mojang не встречаются
+        if ".." in path.split("/"):
+            return None
+        path = posixpath.normpath("/" + path.lstrip("/"))
+        if path == "/":
+            return None
+        segments = path.lstrip("/").split("/")
+        root = os.path.join(self.minecraft_directory, STORE_LAYOUT[host]) if host in STORE_LAYOUT \
+            else os.path.join(self.proxy_dir, host)
+        root = os.path.realpath(root)
+        local = os.path.join(root, *segments)
+        try:
+            if os.path.commonpath([root, os.path.realpath(local)]) != root:
+                return None # Ссылка или разбор пути вывели за пределы папки
+        except ValueError:
+            return None # Разные диски
+        return local
+
+    def ensure(self, host: str, path: str) -> str | None:
+        """
+        Возвращает путь к файлу, при необходимости докачивая его из источника.
+        None - файла нет и получить его не удалось.
+        """
+        local = self.local_path(host, path)
+        if local is None:
+            return None
+        mutable = path.startswith(MUTABLE_PATHS)
+        fresh = os.path.isfile(local) and (not mutable or time.time() - os.path.getmtime(local) < MUTABLE_TTL)
+        if fresh or not self.fetch_missing:
+            return local if os.path.isfile(local) else None
+
+        import requests
+        from core.http import get_client
+        sha1 = None
+        if host == "resources.download.minecraft.net":
+            sha1 = posixpath.basename(path)
+        else:
+            match = _SHA1_IN_PATH.search(path)
+            sha1 = match.group(1) if match else None
+        try:
+            # Напрямую из источника: зеркало, настроенное у этой машины, может указывать на нее же
+            get_client().download(f"{UPSTREAM_SCHEME}://{host}{path}", local, sha1=sha1, overwrite=mutable,
+                                  use_mirror=False)
+        except (requests.exceptions.RequestException, OSError) as e:
+            print(f"Раздача кэша: не удалось получить {host}{path}: {e}")
+        return local if os.path.isfile(local) else None
+
+
+def _make_handler(server: CacheServer):
+    class CacheRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # keep-alive: клиенты качают тысячи мелких файлов
+        server_version = "NovaLauncherCache"
+
+        def do_GET(self):
+            self._serve(send_body=True)
+
+        def do_HEAD(self):
+            self._serve(send_body=False)
+
+        def _serve(self, send_body: bool):
+            parts = urllib.parse.urlsplit(self.path)
+            host, _, path = urllib.parse.unquote(parts.path).lstrip("/").partition("/")
+            local = server.ensure(host.lower(), "/" + path)
+            if local is None:
+                # Промах - обычное дело (клиент возьмет файл из источника), send_error писал бы в лог
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            size = os.path.getsize(local)
+            start, end = 0, size - 1
+            status = 200
+            requested = self.headers.get("Range", "")
+            match = re.fullmatch(r"bytes=(\d+)-(\d*)", requested.strip())
+            if match:
+                start = int(match.group(1))
+                end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+                if start >= size or start > end:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 206
+            self.send_response(status)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+            if not send_body:
+                return
+            server.served += 1
+            with open(local, 'rb') as f:
+                f.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    block = f.read(min(SERVE_CHUNK_SIZE, remaining))
+                    if not block:
+                        break
+                    self.wfile.write(block)
+                    remaining -= len(block)
+
+        def log_message(self, format, *args):
+            pass # Тысячи запросов - в консоль пишем только ошибки
+
+        def log_error(self, format, *args):
+            print(f"Раздача кэша: {self.address_string()} - {format % args}")
+
+    return CacheRequestHandler
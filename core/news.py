@@ -0,0 +1,166 @@
+"""
+Лента новостей лаунчера.
+
+Лента - JSON со списком карточек (заголовок, описание, картинка, ссылка)
+по адресу http/https или в локальном файле. NewsFeed хранит последнюю
+полученную ленту на диске вместе с ETag/Last-Modified и сроком свежести:
+окно сразу рисует ее из кэша, а обновляет условным запросом, так что
+неизменившаяся лента не качается заново. Без сети остается сохраненная
+лента. Модуль не зависит от Qt: refresh() вызывается из фоновой задачи
+(core.jobs), картинки карточек загружает core.image_cache.
+"""
+import os
+import json
+import time
+import urllib.parse
+import urllib.request
+
+import requests
+
+from core.http import HttpClient, get_client, parse_freshness
+
+# --- Константы ленты новостей ---
+NEWS_CACHE_VERSION = 1
+
+
+def is_remote_url(source: str) -> bool:
+    return source.startswith(('http://', 'https://'))
+
+
+def normalize_items(data) -> list[dict]:
+    """
+    Приводит содержимое ленты к списку карточек {title, description, image, url}.
+    Лента - либо список карточек, либо объект с ключом "items".
+    """
+    raw_items = data.get("items", []) if isinstance(data, dict) else data
+    if not isinstance(raw_items, list):
+        return []
+    items = []
+    for raw in raw_items:
+        if not isinstance(raw, dict) or not raw.get("title"):
+            continue
+        items.append({
+            "title": str(raw.get("title", "")),
+            "description": str(raw.get("description", "")),
+            "image": str(raw.get("image") or raw.get("image_path") or ""),
+            "url": str(raw.get("url", "")),
+        })
+    return items
+
+
+class NewsFeed:
+    """
+    Лента новостей лаунчера: JSON по URL (http/https) или из локального файла.
+
+    Последняя полученная лента хранится на диске вместе с ETag/Last-Modified
+    и сроком свежести. load_cached() отдает ее без сети (для мгновенной
+    отрисовки), refresh() проверяет ленту условным запросом.
+    """
+
+    def __init__(self, source: str, cache_file: str, client: HttpClient | None = None):
+        self.source = source
+        self.cache_file = cache_file
+        self._client = client
+
+    @property
+    def client(self) -> HttpClient:
+        """HTTP-клиент: переданный явно или общий клиент лаунчера."""
+        return self._client or get_client()
+
+    # --- Кэш на диске ---
+
+    def _read_cache(self) -> dict | None:
+        if not os.path.exists(self.cache_file):
+            return None
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if isinstance(cache, dict) and cache.get("version") == NEWS_CACHE_VERSION and cache.get("source") == self.source:
+                return cache
+        except (json.JSONDecodeError, IOError, TypeError) as e:
+            print(f"Ошибка чтения кэша новостей '{self.cache_file}': {e}")
+        return None
+
+    def _write_cache(self, cache: dict):
+        cache["version"] = NEWS_CACHE_VERSION
+        cache["source"] = self.source
+        tmp_path = self.cache_file + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+        except (IOError, OSError) as e:
+            print(f"Ошибка сохранения кэша новостей '{self.cache_file}': {e}")
+
+    def load_cached(self) -> list[dict]:
+        """Возвращает последнюю сохраненную ленту (без обращения к сети)."""
+        cache = self._read_cache()
+        return cache.get("items", []) if cache else []
+
+    # --- Обновление ---
+
+    def refresh(self, force: bool = False) -> list[dict] | None:
+        """
+        Возвращает актуальную ленту. Свежий кэш отдается без запроса,
+        устаревший проверяется условным запросом. None - при ошибке и пустом кэше.
+        """
+        cache = self._read_cache() or {}
+        if not force and cache and time.time() < cache.get("validated_at", 0) + cache.get("max_age", 0):
+            return cache.get("items", [])
+        if is_remote_url(self.source) and self.client.is_offline(self.source):
+            return cache.get("items") if cache else None # Без сети - последняя сохраненная лента
+
+        try:
+            if is_remote_url(self.source):
+                return self._refresh_remote(cache)
+            return self._refresh_local(cache)
+        except requests.exceptions.RequestException as e:
+            print(f"Ошибка сети при загрузке ленты новостей {self.source}: {e}")
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Ошибка формата ленты новостей {self.source}: {e}")
+        except (IOError, OSError) as e:
+            print(f"Ошибка чтения ленты новостей {self.source}: {e}")
+        return cache.get("items") if cache else None
+
+    def _refresh_remote(self, cache: dict) -> list[dict]:
+        headers = {}
+        if cache.get("etag"): headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"): headers["If-Modified-Since"] = cache["last_modified"]
+
+        response = self.client.get(self.source, headers=headers)
+        if response.status_code == 304 and cache:
+            cache["validated_at"] = time.time()
+            cache["max_age"] = parse_freshness(response.headers)
+            self._write_cache(cache)
+            return cache.get("items", [])
+        response.raise_for_status()
+
+        # Относительные ссылки на картинки считаем относительно адреса ленты
+        items = normalize_items(response.json())
+        for item in items:
+            if item["image"] and not is_remote_url(item["image"]):
+                item["image"] = urllib.parse.urljoin(self.source, item["image"])
+
+        self._write_cache({
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "validated_at": time.time(),
+            "max_age": parse_freshness(response.headers),
+            "items": items,
+        })
+        return items
+
+    def _refresh_local(self, cache: dict) -> list[dict]:
+        path = self.source
+        if path.startswith("file:"):
+            path = urllib.request.url2pathname(urllib.parse.urlparse(path).path)
+        mtime = os.path.getmtime(path)
+        if cache and cache.get("mtime") == mtime:
+            return cache.get("items", [])
+
+        with open(path, 'r', encoding='utf-8') as f:
+            items = normalize_items(json.load(f))
+        # Локальные картинки указываются относительно рабочей папки лаунчера
+        self._write_cache({"mtime": mtime, "validated_at": time.time(), "max_age": 0, "items": items})
+        return items
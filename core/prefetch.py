@@ -0,0 +1,85 @@
+"""
+Предзагрузка версий в простое.
+
+Пока лаунчер ничего не устанавливает, он может заранее докачать то, что
+скорее всего запустят следующим: последний релиз и версии недавно
+использованных профилей. Все идет одной задачей планировщика с низким
+приоритетом, по одной версии. Установка или запуск, начатые пользователем,
+задачу отменяют - скачанное остается (.part) и докачивается позже.
+
+Решение, простаивает ли лаунчер и не лимитирована ли сеть, принимает окно
+(main.py); модуль от Qt не зависит.
+"""
+from core.jobs import get_scheduler, CancelToken, JobCancelled, PRIORITY_LOW
+
+PREFETCH_RECENT_PROFILES = 2 # Сколько последних профилей учитывать (кроме последнего релиза)
+PREFETCH_KEY = "prefetch"
+
+
+def prefetch_candidates(profiles: dict, latest_release: str | None,
+                        recent: int = PREFETCH_RECENT_PROFILES) -> list[str]:
+    """Версии для предзагрузки: последний релиз, затем версии профилей по last_used (новые первыми)."""
+    versions = [latest_release] if latest_release else []
+    by_last_used = sorted(profiles.values(), key=lambda profile: profile.get("last_used") or "", reverse=True)
+    for profile in by_last_used[:recent]:
+        version = profile.get("version")
+        if version and version not in versions:
+            versions.append(version)
+    return versions
+
+
+class Prefetcher:
+    """Фоновая докачка вероятных версий; уже проверенные в этом сеансе версии пропускаются."""
+
+    def __init__(self, minecraft_directory: str, java_path: str | None = None):
+        self.minecraft_directory = minecraft_directory
+        self.java_path = java_path
+        self._job = None
+        self._ready = set() # Версии, которые в этом сеансе уже полностью на диске
+
+    @property
+    def running(self) -> bool:
+        return self._job is not None and not self._job.done()
+
+    def start(self, profiles: dict):
+        """Ставит предзагрузку в планировщик (если она еще не идет). Возвращает задачу."""
+        if self.running:
+            return self._job
+        token = CancelToken()
+        self._job = get_scheduler().submit(self._run, dict(profiles), token,
+                                           priority=PRIORITY_LOW, key=PREFETCH_KEY, cancel_token=token)
+        return self._job
+
+    def cancel(self):
+        """Уступает сеть пользователю: загрузка останавливается, начатые файлы докачаются позже."""
+        if self.running:
+            print("Предзагрузка версий приостановлена.")
+            self._job.cancel()
+
+    def _run(self, profiles: dict, token: CancelToken) -> list[str]:
+        """Докачивает версии-кандидаты по очереди. Возвращает версии, которые были догружены сейчас."""
+        import requests
+        from core import installer
+        from core.versions import get_latest_versions
+        try:
+            latest_release = get_latest_versions().get("release")
+        except requests.exceptions.RequestException as e:
+            print(f"Предзагрузка: не удалось узнать последний релиз ({e})")
+            latest_release = None
+
+        prefetched = []
+        for version in prefetch_candidates(profiles, latest_release):
+            if version in self._ready:
+                continue
+            token.raise_if_cancelled()
+            print(f"Предзагрузка версии {version}...")
+            try:
+                installer.prepare_version(version, self.minecraft_directory, self.java_path, cancel_token=token)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                print(f"Предзагрузка версии {version} не удалась: {e}")
+                continue
+            self._ready.add(version)
+            prefetched.append(version)
+        return prefetched
@@ -0,0 +1,218 @@
+"""
+Настройки и профили лаунчера (JSON-файлы рядом с лаунчером).
+
+Используются и окном лаунчера, и режимом без интерфейса (core.cli),
+поэтому здесь нет зависимостей от Qt.
+"""
+import os
+import json
+import uuid
+from datetime import datetime
+
+SETTINGS_FILE = "settings.json"
+PROFILES_FILE = "profiles.json"
+MINECRAFT_VERSION = "1.21.4" # Версия по умолчанию для новых профилей
+PAGE_TRANSITION_MS = 300 # Длительность перехода между страницами по умолчанию
+
+
+class SettingsManager:
+    """
+    Управляет загрузкой, сохранением и доступом к настройкам лаунчера.
+    Настройки хранятся в JSON-файле.
+    """
+    DEFAULT_SETTINGS = {
+        "java_path": "",
+        "min_memory_mb": 2048,
+        "max_memory_mb": 4096,
+        "close_on_launch": False,
+        "selected_profile_uuid": None,
+        "is_premium": False,  # Флаг премиум-статуса
+        # Настройки фильтров версий
+        "show_releases": True,
+        "show_snapshots": True,
+        "show_betas": False,
+        "show_alphas": False,
+        # Лимит дискового кэша изображений (новости, иконки)
+        "image_cache_max_mb": 64,
+        # Источник ленты новостей: URL JSON-файла или путь к локальному файлу (пусто = встроенная лента)
+        "news_feed_url": "",
+        # Сеть: таймаут (сек), число повторов, соединений на хост, лимит скорости (КБ/с, 0 = без лимита)
+        "http_timeout_sec": 15,
+        "http_retries": 3,
+        "http_max_per_host": 8,
+        "download_limit_kbps": 0,
+        # Не обращаться к сети (версии и новости берутся из кэша)
+        "offline_mode": False,
+        # Достраивать страницы "Профили" и "Настройки" в фоне после показа окна
+        "prebuild_pages": True,
+        # Сторож зависаний интерфейса (также включается флагом --watchdog или NOVA_WATCHDOG=1)
+        "stall_watchdog": False,
+        # Переход между страницами: длительность (мс) и мгновенное переключение для слабых машин
+        "page_transition_ms": PAGE_TRANSITION_MS,
+        "instant_page_switch": False,
+        # Очередь установки: сколько версий ставится одновременно
+        "install_queue_parallel": 2,
+        # Докачивать в простое последний релиз и версии недавних профилей (только безлимитная сеть)
+        "idle_prefetch": False,
+        # Зеркало загрузок (база в раскладке core.mirror; пусто = напрямую с серверов Mojang)
+        "mirror_url": "",
+        # Раздавать свой кэш библиотек и ассетов другим лаунчерам в локальной сети
+        "serve_cache": False,
+        "serve_cache_port": 8770,
+        # Можно добавить и для модов, но пока не будем усложнять
+        # "show_fabric": True,
+        # "show_forge": True,
+    }
+
+    def __init__(self, filename=SETTINGS_FILE):
+        self.filename = filename
+        self.settings = self._load_settings()
+
+    def _load_settings(self):
+        """Загружает настройки из файла, дополняя отсутствующие значения дефолтными."""
+        if os.path.exists(self.filename):
+            try:
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                    # Гарантируем наличие всех ключей
+                    settings = self.DEFAULT_SETTINGS.copy()
+                    settings.update(loaded) # Загруженные значения переопределяют дефолтные
+                    return settings
+            except (json.JSONDecodeError, IOError, TypeError) as e:
+                print(f"Ошибка загрузки файла настроек '{self.filename}': {e}. Используются настройки по умолчанию.")
+        return self.DEFAULT_SETTINGS.copy()
+
+    def save_settings(self):
+        """Сохраняет текущие настройки в JSON-файл."""
+        try:
+            os.makedirs(os.path.dirname(self.filename) or '.', exist_ok=True) # Создаем папку, если нужно
+            with open(self.filename, 'w', encoding='utf-8') as f:
+                json.dump(self.settings, f, indent=4, ensure_ascii=False)
+        except IOError as e:
+            print(f"Ошибка сохранения файла настроек '{self.filename}': {e}.")
+
+    def get(self, key):
+        """Возвращает значение настройки по ключу."""
+        return self.settings.get(key, self.DEFAULT_SETTINGS.get(key))
+
+    def set(self, key, value):
+        """Устанавливает значение настройки и сохраняет файл."""
+        if key in self.DEFAULT_SETTINGS: # Сохраняем только известные ключи
+             self.settings[key] = value
+             self.save_settings()
+        else:
+             print(f"Предупреждение: Попытка установить неизвестный ключ настройки '{key}'.")
+
+    def memory_limits(self, profile: dict | None = None) -> tuple[int, int]:
+        """(мин., макс.) память в МБ для запуска: переопределения профиля или общие настройки."""
+        profile = profile or {}
+        min_mem = profile.get("min_memory_override") or self.get("min_memory_mb")
+        max_mem = profile.get("max_memory_override") or self.get("max_memory_mb")
+
+        # --- Валидация и установка значений памяти по умолчанию ---
+        if not isinstance(min_mem, int) or min_mem < 512:
+            print(f"Предупреждение: Некорректное значение min_mem ({min_mem}), используется значение по умолчанию.")
+            min_mem = self.DEFAULT_SETTINGS["min_memory_mb"]
+
+        if not isinstance(max_mem, int) or max_mem < min_mem:
+            print(f"Предупреждение: Некорректное значение max_mem ({max_mem}), используется значение по умолчанию или min_mem.")
+            default_max = self.DEFAULT_SETTINGS["max_memory_mb"]
+            max_mem = max(min_mem, default_max) # Гарантируем, что max_mem не меньше min_mem
+        return min_mem, max_mem
+
+
+class ProfileManager:
+    """
+    Управляет созданием, редактированием, удалением и хранением профилей пользователей.
+    Профили хранятся в JSON-файле.
+    """
+    def __init__(self, filename=PROFILES_FILE):
+        self.filename = filename
+        self.profiles = self._load_profiles()
+
+    def _load_profiles(self):
+        """Загружает профили из файла."""
+        if os.path.exists(self.filename):
+            try:
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    profiles = json.load(f)
+                    # Простая валидация - ожидаем словарь
+                    if isinstance(profiles, dict):
+                        return profiles
+                    else:
+                        print(f"Ошибка формата файла профилей '{self.filename}'. Ожидался словарь.")
+                        return {}
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Ошибка загрузки файла профилей '{self.filename}': {e}. Список профилей пуст.")
+        return {}
+
+    def save_profiles(self):
+        """Сохраняет текущий список профилей в JSON-файл."""
+        try:
+            os.makedirs(os.path.dirname(self.filename) or '.', exist_ok=True)
+            with open(self.filename, 'w', encoding='utf-8') as f:
+                json.dump(self.profiles, f, indent=4, ensure_ascii=False)
+        except IOError as e:
+            print(f"Ошибка сохранения файла профилей '{self.filename}': {e}.")
+
+    def add_profile(self, name, username, version=MINECRAFT_VERSION, min_memory=None, max_memory=None, icon_filename=None):
+        """Добавляет новый профиль и возвращает его UUID."""
+        if not name or not username:
+            print("Ошибка: Имя профиля и имя пользователя не могут быть пустыми.")
+            return None
+        profile_uuid = str(uuid.uuid4())
+        self.profiles[profile_uuid] = {
+            "name": name,
+            "username": username,
+            "version": version,
+            "min_memory_override": min_memory,
+            "max_memory_override": max_memory,
+            "icon_filename": icon_filename, # Сохраняем имя файла иконки
+            "last_used": datetime.now().isoformat()
+        }
+        self.save_profiles()
+        return profile_uuid
+
+    def update_profile(self, profile_uuid, name, username, min_memory=None, max_memory=None, icon_filename=None):
+        """Обновляет существующий профиль."""
+        if profile_uuid in self.profiles:
+            if not name or not username:
+                print("Ошибка: Имя профиля и имя пользователя не могут быть пустыми.")
+                return False
+            self.profiles[profile_uuid]["name"] = name
+            self.profiles[profile_uuid]["username"] = username
+            self.profiles[profile_uuid]["min_memory_override"] = min_memory
+            self.profiles[profile_uuid]["max_memory_override"] = max_memory
+            self.profiles[profile_uuid]["icon_filename"] = icon_filename # Обновляем имя файла иконки
+            self.profiles[profile_uuid]["last_used"] = datetime.now().isoformat()
+            self.save_profiles()
+            return True
+        return False
+
+    def mark_launched(self, profile_uuid, version):
+        """Запоминает версию, с которой запущен профиль, и время запуска."""
+        if profile_uuid in self.profiles:
+            self.profiles[profile_uuid]["version"] = version
+            self.profiles[profile_uuid]["last_used"] = datetime.now().isoformat()
+            self.save_profiles()
+
+    def delete_profile(self, profile_uuid):
+        """Удаляет профиль по UUID."""
+        if profile_uuid in self.profiles:
+            del self.profiles[profile_uuid]
+            self.save_profiles()
+            return True
+        return False
+
+    def get_profile(self, profile_uuid):
+        """Возвращает данные профиля по UUID."""
+        return self.profiles.get(profile_uuid)
+
+    def get_all_profiles(self):
+        """Возвращает словарь всех профилей, отсортированных по имени."""
+        try:
+            # Сортировка с обработкой возможного отсутствия ключа 'name'
+            return dict(sorted(self.profiles.items(), key=lambda item: item[1].get('name', '')))
+        except Exception as e:
+            print(f"Ошибка сортировки профилей: {e}")
+            return self.profiles # Возвращаем несортированный словарь в случае ошибки
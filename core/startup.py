@@ -0,0 +1,182 @@
+"""
+Этапы запуска лаунчера: прогресс для сплеша и история длительностей.
+
+Код запуска отмечает этапы (begin()/end() или with stage()), сплеш
+подписывается на изменения (add_listener) и показывает долю пройденного
+и текущий этап. Доля считается по весам этапов - медианам их длительности
+в прошлых запусках. После показа окна finish() дописывает длительности
+в файл истории и предупреждает об этапах, которые заметно медленнее
+обычного на этой машине.
+"""
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+
+# --- Параметры истории ---
+HISTORY_LIMIT = 50 # Сколько последних запусков хранить
+HISTORY_WINDOW = 10 # По скольким последним запускам считать медиану
+REGRESSION_FACTOR = 1.5 # Во сколько раз медленнее медианы - уже регрессия
+REGRESSION_MIN_MS = 50 # Меньшие отклонения не считаем (шум)
+
+_lock = threading.Lock()
+_stages = [] # [(ключ, подпись)] в порядке запуска
+_history_file = None
+_history = []
+_weights = {}
+_started = {} # ключ -> perf_counter начала
+_durations = {} # ключ -> мс
+_current = None # Ключ последнего начатого и еще не завершенного этапа
+_listeners = [] # callback(доля 0..1, подпись этапа)
+_finished = False
+_origin = time.perf_counter()
+
+
+def configure(stages, history_file: str | None = None):
+    """Объявляет этапы запуска и файл истории (веса этапов берутся из нее)."""
+    global _stages, _history_file, _history, _weights
+    _stages = list(stages)
+    _history_file = history_file
+    _history = _load_history(history_file) if history_file else []
+    medians = _medians(_history)
+    # Этапы без истории получают средний вес, чтобы прогресс не стоял на месте
+    default = sum(medians.values()) / len(medians) if medians else 1.0
+    _weights = {key: max(medians.get(key, default), 1.0) for key, _ in _stages}
+
+
+def add_listener(callback):
+    """Подписка на прогресс: callback(доля, подпись). Может вызываться из любого потока."""
+    _listeners.append(callback)
+
+
+# --- Отметки этапов ---
+
+def begin(key: str):
+    global _current
+    with _lock:
+        if _finished or key in _started or key in _durations:
+            return
+        _started[key] = time.perf_counter()
+        _current = key
+    _notify()
+
+
+def end(key: str):
+    """Завершает этап. Повторный вызов или этап, который не начинался, ничего не делают."""
+    global _current
+    with _lock:
+        started = _started.pop(key, None)
+        if started is None:
+            return
+        _durations[key] = (time.perf_counter() - started) * 1000
+        if _current == key:
+            _current = next(reversed(_started), None) # Возвращаемся к еще идущему этапу
+    _notify()
+
+
+@contextmanager
+def stage(key: str):
+    """Замеряет блок with как этап запуска."""
+    begin(key)
+    try:
+        yield
+    finally:
+        end(key)
+
+
+def progress() -> tuple[float, str]:
+    """(доля завершенных этапов по весу, подпись текущего этапа)."""
+    with _lock:
+        total = sum(_weights.values()) or 1.0
+        done = sum(_weights.get(key, 0.0) for key in _durations)
+        labels = dict(_stages)
+        label = labels.get(_current, _current or "") if _current else ("Готово" if _durations else "")
+    return min(1.0, done / total), label
+
+
+def _notify():
+    if _finished or not _listeners:
+        return
+    fraction, label = progress()
+    for callback in list(_listeners):
+        try:
+            callback(fraction, label)
+        except Exception as e:
+            print(f"Ошибка обработчика этапов запуска: {e}")
+
+
+# --- Итог и история ---
+
+def finish() -> dict:
+    """
+    Фиксирует запуск: отписывает слушателей, печатает этапы, сохраняет историю
+    и предупреждает о регрессиях. Незавершенные этапы в историю не попадают.
+    """
+    global _finished
+    with _lock:
+        if _finished:
+            return dict(_durations)
+        _finished = True
+        durations = {key: round(ms, 1) for key, ms in _durations.items()}
+        pending = list(_started)
+    _listeners.clear()
+
+    total_ms = (time.perf_counter() - _origin) * 1000
+    parts = ", ".join(f"{key} {ms:.0f} мс" for key, ms in durations.items())
+    print(f"Этапы запуска ({total_ms:.0f} мс с начала): {parts}" + (f"; не завершены: {', '.join(pending)}" if pending else ""))
+    _check_regressions(durations)
+    if _history_file:
+        _history.append({
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "total_ms": round(total_ms, 1),
+            "stages": durations,
+        })
+        _save_history(_history_file, _history[-HISTORY_LIMIT:])
+    return durations
+
+
+def _medians(history: list) -> dict:
+    values = {}
+    for run in history[-HISTORY_WINDOW:]:
+        for key, ms in run.get("stages", {}).items():
+            values.setdefault(key, []).append(ms)
+    medians = {}
+    for key, samples in values.items():
+        samples.sort()
+        middle = len(samples) // 2
+        medians[key] = samples[middle] if len(samples) % 2 else (samples[middle - 1] + samples[middle]) / 2
+    return medians
+
+
+def _check_regressions(durations: dict):
+    medians = _medians(_history)
+    labels = dict(_stages)
+    for key, ms in durations.items():
+        median = medians.get(key)
+        if median is not None and ms > median * REGRESSION_FACTOR and ms - median > REGRESSION_MIN_MS:
+            print(f"Предупреждение: этап запуска '{labels.get(key, key)}' занял {ms:.0f} мс (обычно {median:.0f} мс)")
+
+
+def _load_history(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else []
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Ошибка чтения истории запусков '{path}': {e}")
+        return []
+
+
+def _save_history(path: str, history: list):
+    tmp_path = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(history, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+    except (IOError, OSError) as e:
+        print(f"Ошибка сохранения истории запусков '{path}': {e}")
@@ -0,0 +1,518 @@
+"""
+Движок тем оформления.
+
+Тема - это палитра (имена цветов -> значения), набор QSS-шаблонов по
+областям (окно целиком и отдельные страницы) и пути к картинкам.
+Шаблоны используют подстановки вида ${primary}. Скомпилированные таблицы
+стилей кэшируются в памяти и на диске под хэшем темы, так что при
+повторном запуске QSS не генерируется заново, а при смене палитры
+пересобираются и переприменяются только изменившиеся области.
+"""
+import os
+import json
+import string
+import hashlib
+import threading
+
+# --- Параметры ---
+ENGINE_VERSION = 1 # Увеличить при изменении формата кэша
+MAX_CACHED_THEMES = 8 # Сколько скомпилированных тем держим на диске
+
+# --- Шаблоны темы по умолчанию ---
+# window - общие элементы (рамка, сайдбар, шапка, общие кнопки), применяется к главному окну;
+# play / profiles / settings / queue - применяются к соответствующим страницам.
+DEFAULT_TEMPLATES = {
+    "window": """
+/* --- Основное Окно --- */
+QMainWindow {
+    background-color: ${background_main};
+}
+QWidget#main_widget { /* Конкретно к главному виджету */
+    background-color: ${background_main};
+}
+
+/* --- Кастомная строка заголовка --- */
+CustomTitleBar#customTitleBar {
+    background-color: ${background_sidebar}; /* Темнее */
+    border-bottom: 1px solid ${border};
+}
+QLabel#titleBarLabel {
+    color: ${text};
+    font-size: 11pt;
+    padding-left: 5px;
+}
+/* Кнопки управления окном */
+QPushButton#_minimizeButton, QPushButton#_closeButton {
+    background-color: transparent;
+    border: none;
+    color: ${text_light}; /* Бледный текст */
+    font-family: "Marlett"; /* Шрифт для иконок */
+    font-size: 14pt;
+    padding: 0px 15px;
+    min-height: 30px; /* Убедимся, что высота достаточна */
+    max-width: 50px;
+}
+QPushButton#_minimizeButton {
+    border-radius: 0px;
+}
+QPushButton#_closeButton {
+    border-radius: 0px;
+}
+QPushButton#_minimizeButton:hover {
+    background-color: ${surface_light};
+    color: ${text};
+}
+QPushButton#_closeButton:hover {
+    background-color: ${red}; /* Красный фон при наведении */
+    color: white;
+}
+
+/* --- Сайдбар --- */
+QWidget#sidebar {
+    background-color: ${background_sidebar};
+    border-right: 1px solid ${border};
+}
+QPushButton[objectName^="_sidebar"] { /* Ко всем кнопкам сайдбара */
+    background-color: transparent;
+    border: none;
+    border-radius: 8px; /* Скругление */
+    padding: 5px;
+    margin: 0 5px; /* Небольшие отступы по бокам */
+    icon-size: 28px 28px; /* Явно задаем размер иконки */
+}
+QPushButton[objectName^="_sidebar"]:hover {
+    background-color: ${surface_light};
+}
+QPushButton[objectName^="_sidebar"]:checked {
+    background-color: ${primary}; /* Основной цвет для активной кнопки */
+}
+/* --- Верхняя панель --- */
+QWidget#topBar {
+    background-color: ${background_main};
+    border-bottom: 1px solid ${border};
+}
+/* Виджет профиля */
+QWidget#profileWidget {
+    background: transparent;
+}
+QLabel#profileTopIcon { /* Новое имя */
+    border-radius: 8px; /* Скругление для иконки */
+}
+QLabel#profileUsername {
+    color: ${text};
+    font-weight: bold;
+}
+QLabel#onlineLabel {
+    color: ${text_light};
+    font-size: 9pt;
+}
+
+/* --- Стек контента --- */
+QStackedWidget#contentStack {
+    background-color: transparent; /* Сам стек прозрачный */
+}
+
+QLabel#pageTitle { /* Общий стиль для заголовков страниц */
+    color: ${text};
+    padding-bottom: 10px; /* Отступ снизу */
+}
+
+/* --- Общие кнопки действий (Добавить, Редактировать, Обзор...) --- */
+QPushButton#actionButton {
+    background-color: ${primary};
+    color: white;
+    border: none;
+    padding: 10px 15px;
+    border-radius: 5px;
+    min-height: 30px;
+}
+QPushButton#actionButton:hover {
+    background-color: ${secondary};
+}
+QPushButton#actionButton:disabled {
+    background-color: ${surface_light};
+    color: ${text_light};
+}
+
+/* Кнопка Удалить */
+QPushButton#deleteButton {
+    background-color: ${red};
+    color: white;
+    border: none;
+    padding: 10px 15px;
+    border-radius: 5px;
+    min-height: 30px;
+}
+QPushButton#deleteButton:hover {
+    background-color: ${red_hover};
+}
+QPushButton#deleteButton:disabled {
+    background-color: ${surface_light};
+    color: ${text_light};
+}
+
+QToolTip {
+    background-color: ${surface_solid};
+    color: ${text};
+    border: 1px solid ${border};
+    padding: 5px;
+    border-radius: 3px;
+}
+""",
+    "play": """
+/* --- Страница Play --- */
+QWidget#playPage {
+    background-color: ${background_main};
+}
+
+QLabel#playPageTitle { color: ${text}; }
+QLabel#playPageDesc { color: ${text_light}; }
+QLabel#newsTitle { color: ${text}; margin-bottom: 5px; }
+QLabel#playButtonStatus { color: ${text_light}; font-size: 9pt; }
+
+/* Большая кнопка Играть */
+QPushButton#playButtonLarge {
+    background-color: ${accent_green};
+    color: white; /* Белый текст на зеленом */
+    border: none;
+    border-radius: 8px;
+    padding: 10px 20px;
+}
+QPushButton#playButtonLarge:hover {
+    background-color: ${accent_green_hover};
+}
+QPushButton#playButtonLarge:disabled {
+    background-color: ${surface_light};
+    color: ${text_light};
+}
+
+/* Комбобокс выбора версии */
+QComboBox#versionSelector {
+    background-color: ${surface_solid};
+    color: ${text};
+    border: 1px solid ${border};
+    border-radius: 5px;
+    padding: 8px 10px;
+    min-height: 30px; /* Минимальная высота */
+}
+QComboBox#versionSelector::drop-down {
+    border: none;
+    background: transparent;
+    width: 20px;
+    subcontrol-origin: padding;
+    subcontrol-position: top right;
+    padding-right: 5px;
+}
+QComboBox#versionSelector::down-arrow {
+    image: url(${icon_dropdown}); /* Путь к иконке */
+    width: 12px;
+    height: 12px;
+}
+QComboBox QAbstractItemView { /* Выпадающий список */
+    background-color: ${surface_solid};
+    border: 1px solid ${primary};
+    color: ${text};
+    selection-background-color: ${primary};
+    selection-color: white;
+    outline: 0px; /* Убираем рамку выделения */
+    padding: 5px;
+}
+
+/* Карточка новости */
+QWidget#newsCard {
+    background-color: ${surface_solid};
+    border-radius: 8px;
+    border: 1px solid ${border};
+    /* transition: background-color 0.2s ease; Плавность при наведении */
+}
+QWidget#newsCard:hover {
+    background-color: ${surface_light};
+    border: 1px solid ${secondary};
+}
+QLabel#newsCardImage {
+    border-top-left-radius: 8px;
+    border-top-right-radius: 8px;
+    background-color: ${background_main}; /* Фон под картинкой */
+}
+QScrollArea#newsScroll, QWidget#newsRow {
+    background: transparent;
+    border: none;
+}
+QLabel#newsCardTitle { color: ${text}; }
+QLabel#newsCardDesc { color: ${text_light}; }
+
+/* --- Прогресс-бар --- */
+CustomProgressBar {
+    background-color: ${surface_solid};
+    border: 1px solid ${border};
+    border-radius: 6px;
+    text-align: center;
+    color: ${text};
+    font-size: 8pt; /* Мельче шрифт */
+}
+CustomProgressBar::chunk {
+    background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 ${primary}, stop:1 ${secondary});
+    border-radius: 5px;
+    margin: 1px; /* Отступ для рамки */
+}
+""",
+    "profiles": """
+/* --- Страница Профили --- */
+QWidget#profilesPage {
+    background-color: ${background_main};
+}
+
+QListWidget#profilesList {
+    background-color: ${surface_solid};
+    border: 1px solid ${border};
+    border-radius: 5px;
+    color: ${text};
+    padding: 5px;
+    outline: 0px; /* Убираем рамку выделения */
+}
+QListWidget#profilesList::item {
+    padding: 8px 10px;
+    border-radius: 3px; /* Небольшое скругление элемента */
+}
+QListWidget#profilesList::item:selected {
+    background-color: ${primary};
+    color: white;
+}
+QListWidget#profilesList::item:hover {
+    background-color: ${surface_light};
+}
+""",
+    "settings": """
+/* --- Страница Настройки --- */
+QWidget#settingsPage {
+    background-color: ${background_main};
+}
+
+QLabel#settingsSectionTitle {
+    color: ${primary};
+    font-size: 14pt; /* Крупнее */
+    border-bottom: 1px solid ${border};
+    padding-bottom: 5px;
+    margin-bottom: 10px;
+}
+QTabWidget#settingsTabWidget::pane { /* Область вкладки */
+    border: 1px solid ${border};
+    border-top: none; /* Верхняя граница рисуется табами */
+    border-radius: 0 0 5px 5px;
+    background-color: ${surface_solid};
+    padding: 15px;
+}
+QTabBar::tab {
+    background: ${surface_light};
+    color: ${text_light};
+    border: 1px solid ${border};
+    border-bottom: none;
+    border-top-left-radius: 5px;
+    border-top-right-radius: 5px;
+    padding: 10px 20px;
+    margin-right: 2px;
+}
+QTabBar::tab:selected {
+    background: ${surface_solid}; /* Цвет фона вкладки */
+    color: ${text};
+    border: 1px solid ${border};
+    border-bottom: 1px solid ${surface_solid}; /* Соединяем с pane */
+}
+QTabBar::tab:hover {
+    background: ${surface}; /* Темнее при наведении */
+    color: ${text};
+}
+/* Поля ввода и чекбоксы на странице настроек */
+QWidget#settingsPage QLineEdit {
+    background: rgba(255, 255, 255, 0.05);
+    border: 1px solid rgba(255, 255, 255, 0.1);
+    border-radius: 5px;
+    padding: 8px 10px;
+    color: ${text};
+    selection-background-color: ${primary};
+}
+QWidget#settingsPage QLineEdit:focus {
+    border: 1px solid ${primary};
+    background: rgba(255, 255, 255, 0.08);
+}
+QWidget#settingsPage QLabel {
+    color: ${text_light}; /* Светло-серый для подписей */
+    background: transparent; /* Прозрачный фон */
+}
+QWidget#settingsPage QCheckBox#styledCheckbox {
+    color: ${text};
+    spacing: 8px; /* Отступ между галочкой и текстом */
+}
+QWidget#settingsPage QCheckBox#styledCheckbox::indicator {
+    width: 16px;
+    height: 16px;
+    border: 1px solid ${border};
+    border-radius: 3px;
+    background-color: rgba(255, 255, 255, 0.05);
+}
+QWidget#settingsPage QCheckBox#styledCheckbox::indicator:checked {
+    background-color: ${primary};
+    border: 1px solid ${primary};
+    image: url(${icon_checkmark});
+}
+QWidget#settingsPage QCheckBox#styledCheckbox::indicator:hover {
+    border: 1px solid ${secondary};
+}
+/* Кнопка Сохранить */
+QPushButton#saveButton {
+    background-color: ${accent_green};
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 12px 30px;
+}
+QPushButton#saveButton:hover {
+    background-color: ${accent_green_hover};
+}
+""",
+    "queue": """
+/* --- Страница Очередь установки --- */
+QWidget#queuePage {
+    background-color: ${background_main};
+}
+QLabel#queueSectionTitle {
+    color: ${primary};
+    border-bottom: 1px solid ${border};
+    padding-bottom: 5px;
+}
+QLabel#queueStatusLabel {
+    color: ${text_light};
+}
+QListWidget#queueVersionsList, QListWidget#queueList {
+    background-color: ${surface_solid};
+    border: 1px solid ${border};
+    border-radius: 5px;
+    color: ${text};
+    padding: 5px;
+    outline: 0px;
+}
+QListWidget#queueVersionsList::item, QListWidget#queueList::item {
+    padding: 6px 10px;
+    border-radius: 3px;
+}
+QListWidget#queueVersionsList::item:selected, QListWidget#queueList::item:selected {
+    background-color: ${primary};
+    color: white;
+}
+QListWidget#queueVersionsList::item:hover, QListWidget#queueList::item:hover {
+    background-color: ${surface_light};
+}
+""",
+}
+
+
+class Theme:
+    """Палитра + шаблоны + картинки. Ключ (key) однозначно определяет результат компиляции."""
+
+    def __init__(self, name: str, palette: dict, templates: dict | None = None, assets: dict | None = None):
+        self.name = name
+        self.palette = dict(palette)
+        self.templates = dict(templates if templates is not None else DEFAULT_TEMPLATES)
+        self.assets = dict(assets or {})
+        self._key = None
+
+    @property
+    def key(self) -> str:
+        if self._key is None:
+            data = json.dumps({
+                "engine": ENGINE_VERSION, "name": self.name, "palette": self.palette,
+                "templates": self.templates, "assets": self.assets,
+            }, sort_keys=True, ensure_ascii=False)
+            self._key = hashlib.sha256(data.encode("utf-8")).hexdigest()[:20]
+        return self._key
+
+    def with_palette(self, **changes) -> "Theme":
+        """Копия темы с измененными цветами."""
+        palette = dict(self.palette)
+        palette.update(changes)
+        return Theme(self.name, palette, self.templates, self.assets)
+
+
+class ThemeEngine:
+    """Компилирует темы в таблицы стилей по областям: {область: QSS}."""
+
+    def __init__(self, cache_dir: str | None = None):
+        self.cache_dir = cache_dir
+        self._compiled: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def compile(self, theme: Theme) -> dict[str, str]:
+        """Возвращает QSS по областям: из памяти, с диска или компилируя заново."""
+        key = theme.key
+        with self._lock:
+            sheets = self._compiled.get(key)
+        if sheets is None:
+            sheets = self._load(key)
+            if sheets is None or set(sheets) != set(theme.templates):
+                sheets = self._generate(theme)
+                self._save(key, sheets)
+            with self._lock:
+                self._compiled[key] = sheets
+        return sheets
+
+    @staticmethod
+    def changed_scopes(old: dict[str, str] | None, new: dict[str, str]) -> list[str]:
+        """Области, таблицы стилей которых отличаются."""
+        old = old or {}
+        return [scope for scope, qss in new.items() if old.get(scope) != qss]
+
+    def _generate(self, theme: Theme) -> dict[str, str]:
+        values = dict(theme.palette)
+        values.update(theme.assets)
+        sheets = {}
+        for scope, template in theme.templates.items():
+            try:
+                sheets[scope] = string.Template(template).substitute(values)
+            except (KeyError, ValueError) as e:
+                print(f"Ошибка в шаблоне темы '{theme.name}' ({scope}): {e}")
+                sheets[scope] = string.Template(template).safe_substitute(values)
+        return sheets
+
+    # --- Кэш на диске ---
+
+    def _cache_path(self, key: str) -> str | None:
+        return os.path.join(self.cache_dir, f"{key}.json") if self.cache_dir else None
+
+    def _load(self, key: str) -> dict | None:
+        path = self._cache_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                sheets = json.load(f)
+            return sheets if isinstance(sheets, dict) else None
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Ошибка чтения кэша темы '{path}': {e}")
+            return None
+
+    def _save(self, key: str, sheets: dict):
+        path = self._cache_path(key)
+        if not path:
+            return
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(sheets, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self._prune()
+        except (IOError, OSError) as e:
+            print(f"Ошибка сохранения кэша темы '{path}': {e}")
+
+    def _prune(self):
+        """Удаляет самые старые скомпилированные темы сверх MAX_CACHED_THEMES."""
+        try:
+            files = [e for e in os.scandir(self.cache_dir) if e.is_file() and e.name.endswith(".json")]
+        except OSError:
+            return
+        files.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for entry in files[MAX_CACHED_THEMES:]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
@@ -0,0 +1,188 @@
+"""
+Легкий трассировщик этапов запуска и работы интерфейса.
+
+Выключен по умолчанию: span()/traced() тогда почти ничего не стоят.
+Включается через enable() (в main.py - флагом --trace или переменной
+окружения NOVA_TRACE). Результат - JSON в формате Chrome Trace
+(открывается в chrome://tracing или https://ui.perfetto.dev) или
+сводная таблица в консоли.
+"""
+import os
+import json
+import time
+import atexit
+import functools
+import threading
+from contextlib import contextmanager
+
+# --- Параметры ---
+STARTUP_BUDGET_MS = 4500 # Бюджет от старта процесса до показа главного окна
+SUMMARY_LIMIT = 30 # Сколько строк печатать в сводке
+
+_enabled = False
+_output = None # Путь к JSON; None - печатать сводку
+_origin = time.perf_counter()
+_events = []
+_events_lock = threading.Lock()
+_dumped_count = 0
+
+
+class Span:
+    """Открытый интервал. Закрывается end() - можно из другого метода/колбэка."""
+    __slots__ = ("name", "category", "args", "started", "tid")
+
+    def __init__(self, name: str, category: str, args: dict):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.started = time.perf_counter()
+        self.tid = threading.get_ident()
+
+    def end(self, **args):
+        if self.started is None:
+            return # Уже закрыт
+        if args:
+            self.args.update(args)
+        _record({
+            "name": self.name, "cat": self.category, "ph": "X",
+            "ts": _us(self.started), "dur": _us(time.perf_counter()) - _us(self.started),
+            "pid": os.getpid(), "tid": self.tid, "args": self.args,
+        })
+        self.started = None
+
+
+class _NullSpan:
+    def end(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _us(moment: float) -> int:
+    return int((moment - _origin) * 1_000_000)
+
+
+def _record(event: dict):
+    with _events_lock:
+        _events.append(event)
+
+
+# --- Включение ---
+
+def enable(output: str | None = None):
+    """Включает трассировку. output - путь к Chrome Trace JSON (None - сводка в консоль)."""
+    global _enabled, _output
+    _enabled = True
+    _output = output
+    _record({"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "Nova Launcher"}})
+    atexit.register(dump)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+# --- Запись событий ---
+
+def start_span(name: str, category: str = "ui", **args):
+    """Открывает интервал, который закрывается явным вызовом end()."""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+
+@contextmanager
+def span(name: str, category: str = "ui", **args):
+    """Замеряет блок with."""
+    if not _enabled:
+        yield
+        return
+    current = Span(name, category, args)
+    try:
+        yield
+    finally:
+        current.end()
+
+
+def traced(name: str | None = None, category: str = "ui"):
+    """Декоратор: каждый вызов функции становится интервалом в трассе."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            current = Span(span_name, category, {})
+            try:
+                return func(*args, **kwargs)
+            finally:
+                current.end()
+        return wrapper
+    return decorator
+
+
+def instant(name: str, category: str = "milestone", **args):
+    """Мгновенное событие (веха)."""
+    if not _enabled:
+        return
+    _record({
+        "name": name, "cat": category, "ph": "i", "s": "p",
+        "ts": _us(time.perf_counter()), "pid": os.getpid(), "tid": threading.get_ident(), "args": args,
+    })
+
+
+# --- Вывод ---
+
+def dump():
+    """Записывает трассу (или печатает сводку). Повторный вызов без новых событий ничего не делает."""
+    global _dumped_count
+    if not _enabled:
+        return
+    with _events_lock:
+        if len(_events) == _dumped_count:
+            return
+        events = list(_events)
+        _dumped_count = len(events)
+
+    if _output:
+        tmp_path = _output + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(_output) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+            os.replace(tmp_path, _output)
+            print(f"[Trace] Трасса сохранена: {_output} ({len(events)} событий)")
+        except (IOError, OSError) as e:
+            print(f"[Trace] Ошибка сохранения трассы '{_output}': {e}")
+    else:
+        print_summary(events)
+    _check_budget(events)
+
+
+def print_summary(events: list[dict]):
+    """Сводка: сумма/число/максимум по каждому интервалу и список вех."""
+    totals = {}
+    for event in events:
+        if event.get("ph") != "X":
+            continue
+        total, count, longest = totals.get(event["name"], (0, 0, 0))
+        totals[event["name"]] = (total + event["dur"], count + 1, max(longest, event["dur"]))
+
+    print(f"--- Трасса: {len(totals)} этапов ---")
+    print(f"{'всего, мс':>10} | {'вызовов':>7} | {'макс, мс':>9} | этап")
+    for name, (total, count, longest) in sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:SUMMARY_LIMIT]:
+        print(f"{total / 1000:10.1f} | {count:7d} | {longest / 1000:9.1f} | {name}")
+    for event in events:
+        if event.get("ph") == "i":
+            print(f"{event['ts'] / 1000:10.1f} мс  * {event['name']}")
+
+
+def _check_budget(events: list[dict]):
+    for event in events:
+        if event.get("ph") == "i" and event["name"] == "main_window_shown":
+            shown_ms = event["ts"] / 1000
+            if shown_ms > STARTUP_BUDGET_MS:
+                print(f"[Trace] Предупреждение: окно показано через {shown_ms:.0f} мс (бюджет {STARTUP_BUDGET_MS} мс)")
+            return
@@ -0,0 +1,41 @@
+"""
+Снимок последнего показанного состояния интерфейса для "теплого" старта.
+
+При закрытии лаунчер сохраняет отфильтрованный список версий и выбранную
+версию. При следующем запуске список показывается сразу из снимка, а
+свежие данные (установленные версии и манифест) приходят из фонового
+потока и сверяются с показанными.
+"""
+import os
+import json
+from datetime import datetime
+
+SNAPSHOT_VERSION = 1 # Увеличить при изменении формата
+
+
+def load(path: str) -> dict | None:
+    """Читает снимок. None - снимка нет, он поврежден или старого формата."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Ошибка чтения снимка интерфейса '{path}': {e}")
+        return None
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return None
+    return data
+
+
+def save(path: str, state: dict):
+    """Атомарно сохраняет снимок (state дополняется версией формата и временем)."""
+    data = dict(state, version=SNAPSHOT_VERSION, saved=datetime.now().isoformat(timespec="seconds"))
+    tmp_path = path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except (IOError, OSError) as e:
+        print(f"Ошибка сохранения снимка интерфейса '{path}': {e}")
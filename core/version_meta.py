@@ -0,0 +1,151 @@
+"""
+Скомпилированные описания установленных версий.
+
+Установка, запуск и список версий читают versions/<id>/<id>.json (десятки
+КБ JSON), а у версий модлоадеров - еще и json родительской версии
+(inheritsFrom). Здесь готовое, уже объединенное с родителем описание
+сохраняется рядом в двоичном виде (marshal) - versions/<id>/<id>.meta -
+вместе с отметками исходных файлов (mtime и размер). Пока исходники не
+менялись, описание берется из .meta, а повторно в том же сеансе - из
+памяти (только stat исходников).
+
+Для списка установленных версий отдельно хранится сводка
+versions/installed.meta: папка -> (отметка json, id, тип), чтобы не
+разбирать json каждой версии при каждом обновлении списка.
+
+Описания общие для всех вызывающих - изменять их нельзя.
+"""
+import os
+import sys
+import json
+import marshal
+import threading
+
+from minecraft_launcher_lib.exceptions import VersionNotFound
+from minecraft_launcher_lib._helper import inherit_json
+
+META_SUFFIX = ".meta" # versions/<id>/<id>.meta
+SUMMARY_FILE = "installed.meta" # В папке versions
+VERSION_META_FORMAT = 1 # Увеличить при изменении формата файлов
+# Формат marshal может меняться между версиями Python - кэш другой версии не читается
+_HEADER = (VERSION_META_FORMAT, tuple(sys.version_info[:2]))
+
+_memory: dict[str, tuple] = {} # json-путь -> (отметки исходников, описание)
+_memory_lock = threading.Lock()
+
+
+def _json_path(minecraft_directory: str, version: str) -> str:
+    return os.path.join(minecraft_directory, "versions", version, f"{version}.json")
+
+
+def _stamp(minecraft_directory: str, paths: list[str]) -> tuple | None:
+    """Отметки файлов ((путь относительно папки данных, mtime_ns, размер), ...); None - файла нет."""
+    stamp = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stamp.append((os.path.relpath(path, minecraft_directory), st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+
+def _stamp_valid(minecraft_directory: str, stamp: tuple) -> bool:
+    return _stamp(minecraft_directory, [os.path.join(minecraft_directory, path) for path, _, _ in stamp]) == stamp
+
+
+def _read_compiled(path: str):
+    """Данные файла .meta или None (нет файла, поврежден, другой формат)."""
+    try:
+        with open(path, 'rb') as f:
+            header, payload = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return payload if header == _HEADER else None
+
+
+def _write_compiled(path: str, payload):
+    """Атомарная запись .meta (временный файл свой у каждого потока: версию могут собирать параллельно)."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            marshal.dump((_HEADER, payload), f)
+        os.replace(tmp_path, path)
+    except (IOError, OSError, ValueError) as e:
+        print(f"Ошибка сохранения кэша версии '{path}': {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_version_data(version: str, minecraft_directory: str) -> dict:
+    """
+    Описание установленной версии, объединенное с родительской (inheritsFrom).
+    VersionNotFound - json версии нет.
+    """
+    minecraft_directory = str(minecraft_directory)
+    json_path = _json_path(minecraft_directory, version)
+    key = os.path.normcase(os.path.abspath(json_path))
+    with _memory_lock:
+        cached = _memory.get(key)
+    if cached is not None and _stamp_valid(minecraft_directory, cached[0]):
+        return cached[1]
+
+    meta_path = json_path[:-len(".json")] + META_SUFFIX
+    compiled = _read_compiled(meta_path)
+    if compiled is not None and _stamp_valid(minecraft_directory, compiled[0]):
+        stamp, data = compiled
+    else:
+        stamp, data = _compile(version, minecraft_directory, json_path)
+        _write_compiled(meta_path, (stamp, data))
+    with _memory_lock:
+        _memory[key] = (stamp, data)
+    return data
+
+
+def _compile(version: str, minecraft_directory: str, json_path: str) -> tuple[tuple, dict]:
+    """Разбирает json версии (и родителя). Отметки снимаются до чтения: правка во время чтения даст новую сборку."""
+    stamp = _stamp(minecraft_directory, [json_path])
+    if stamp is None:
+        raise VersionNotFound(version)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if "inheritsFrom" in data:
+        parent = data["inheritsFrom"]
+        parent_stamp = _stamp(minecraft_directory, [_json_path(minecraft_directory, parent)])
+        data = inherit_json(data, minecraft_directory) # Без родителя - FileNotFoundError, как и раньше
+        stamp += parent_stamp or ()
+    return stamp, data
+
+
+def installed_versions(minecraft_directory: str) -> list[tuple[str, str]]:
+    """Установленные версии [(id, тип), ...] - json разбираются только новые и измененные."""
+    minecraft_directory = str(minecraft_directory)
+    versions_dir = os.path.join(minecraft_directory, "versions")
+    try:
+        names = os.listdir(versions_dir)
+    except FileNotFoundError:
+        return []
+    summary_path = os.path.join(versions_dir, SUMMARY_FILE)
+    summary = _read_compiled(summary_path) or {}
+    fresh = {}
+    for name in names:
+        json_path = os.path.join(versions_dir, name, f"{name}.json")
+        try:
+            st = os.stat(json_path)
+        except OSError:
+            continue
+        entry = summary.get(name)
+        if entry is None or entry[0] != (st.st_mtime_ns, st.st_size):
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                entry = ((st.st_mtime_ns, st.st_size), data["id"], data.get("type", "release"))
+            except (json.JSONDecodeError, IOError, KeyError, TypeError) as e:
+                print(f"Пропущена версия '{name}': не удалось прочитать {json_path} ({e})")
+                continue
+        fresh[name] = entry
+    if fresh != summary:
+        _write_compiled(summary_path, fresh)
+    return [(version_id, version_type) for _, version_id, version_type in fresh.values()]
@@ -0,0 +1,117 @@
+import os
+import json
+import time
+import threading
+
+import requests
+
+from core.http import HttpClient, get_client
+
+# --- Адреса Mojang ---
+VERSION_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+MANIFEST_MEMORY_TTL = 60 * 60 # Повторно запрашиваем манифест не чаще раза в час
+
+_manifest = None
+_manifest_time = 0.0
+_manifest_lock = threading.Lock()
+_manifest_cache_file = None # Копия манифеста на диске для работы без сети
+
+
+def set_manifest_cache_file(path: str | None):
+    """Задает файл, в котором хранится последний полученный манифест."""
+    global _manifest_cache_file
+    _manifest_cache_file = path
+
+
+def _load_cached_manifest() -> dict | None:
+    if not _manifest_cache_file or not os.path.exists(_manifest_cache_file):
+        return None
+    try:
+        with open(_manifest_cache_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else None
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Ошибка чтения кэша манифеста версий '{_manifest_cache_file}': {e}")
+        return None
+
+
+def _save_cached_manifest(manifest: dict):
+    if not _manifest_cache_file:
+        return
+    tmp_path = _manifest_cache_file + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(_manifest_cache_file) or '.', exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, _manifest_cache_file)
+    except (IOError, OSError) as e:
+        print(f"Ошибка сохранения кэша манифеста версий '{_manifest_cache_file}': {e}")
+
+
+def fetch_version_manifest(client: HttpClient | None = None, force: bool = False) -> dict:
+    """
+    Возвращает манифест версий Mojang (кэшируется в памяти на MANIFEST_MEMORY_TTL).
+    Без сети отдается последняя сохраненная копия; ошибка - только если ее нет.
+    """
+    global _manifest, _manifest_time
+    client = client or get_client()
+    with _manifest_lock:
+        if not force and _manifest is not None and time.monotonic() - _manifest_time < MANIFEST_MEMORY_TTL:
+            return _manifest
+        if _manifest is not None and client.is_offline(VERSION_MANIFEST_URL):
+            return _manifest
+    try:
+        manifest = client.get_json(VERSION_MANIFEST_URL)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        manifest = _manifest or _load_cached_manifest()
+        if manifest is None:
+            raise
+        print(f"Манифест версий недоступен ({e}), используется сохраненная копия.")
+        with _manifest_lock:
+            _manifest = manifest # Время не обновляем: при появлении сети запросим снова
+        return manifest
+    _save_cached_manifest(manifest)
+    with _manifest_lock:
+        _manifest, _manifest_time = manifest, time.monotonic()
+    return manifest
+
+
+def get_version_list(client: HttpClient | None = None) -> list[dict]:
+    """Список всех версий, доступных для загрузки: [{id, type, releaseTime, url, sha1}, ...]."""
+    manifest = fetch_version_manifest(client)
+    return [
+        {
+            "id": v["id"],
+            "type": v.get("type"),
+            "releaseTime": v.get("releaseTime"),
+            "url": v.get("url"),
+            "sha1": v.get("sha1"),
+        }
+        for v in manifest.get("versions", [])
+    ]
+
+
+def find_version(version_id: str, client: HttpClient | None = None) -> dict | None:
+    """Ищет версию в манифесте. None, если такой версии нет."""
+    for v in get_version_list(client):
+        if v["id"] == version_id:
+            return v
+    return None
+
+
+def get_latest_versions(client: HttpClient | None = None) -> dict:
+    """Последний релиз и снапшот: {"release": ..., "snapshot": ...}."""
+    return fetch_version_manifest(client).get("latest", {})
+
+
+def get_installed_versions(minecraft_directory: str) -> list[tuple[str, str]]:
+    """Установленные версии: [(id, тип), ...] (json разбираются только новые и измененные - core.version_meta)."""
+    from core.version_meta import installed_versions
+    return installed_versions(minecraft_directory)
+
+
+def load_version_sources(minecraft_directory: str, client: HttpClient | None = None) -> tuple[list, list]:
+    """([(id, тип)] установленных, [(id, тип)] доступных) - данные для списка версий. Может идти в сеть."""
+    installed = get_installed_versions(minecraft_directory)
+    available = [(v["id"], v.get("type")) for v in get_version_list(client)]
+    return installed, available
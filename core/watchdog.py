@@ -0,0 +1,131 @@
+"""
+Сторож зависаний цикла событий интерфейса.
+
+GUI-поток регулярно вызывает beat() (в main.py - по QTimer), а отдельный
+поток следит, чтобы пульс не пропадал. Если GUI-поток не отвечает дольше
+порога, снимается его Python-стек; когда он "отмерзает", зависание с
+длительностью и стеком пишется в журнал. Задержки всех пульсов копятся
+в гистограмме, которая печатается при выходе.
+"""
+import os
+import sys
+import time
+import atexit
+import threading
+import traceback
+from datetime import datetime
+
+# --- Параметры ---
+HEARTBEAT_INTERVAL_MS = 50
+STALL_THRESHOLD_MS = 250
+HISTOGRAM_BUCKETS_MS = (16, 33, 50, 100, 250, 500, 1000, 2000, 5000) # Верхние границы корзин
+MAX_LOGGED_STALLS = 50 # За один запуск, чтобы журнал не разрастался
+
+
+class StallWatchdog:
+    """
+    Измеряет задержку цикла событий: пульс должен приходить каждые
+    interval_ms, опоздание пульса - это время, которое цикл был занят.
+    """
+
+    def __init__(self, log_path: str | None = None, interval_ms: int = HEARTBEAT_INTERVAL_MS,
+                 threshold_ms: int = STALL_THRESHOLD_MS):
+        self.log_path = log_path
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.stalls = 0
+        self._main_thread_id = threading.main_thread().ident
+        self._last_beat = time.monotonic()
+        self._stall_stack = None # Стек, снятый во время текущего зависания
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Запускает поток-наблюдатель. beat() должен вызываться из GUI-потока."""
+        if self._thread is not None:
+            return
+        self._last_beat = time.monotonic()
+        self._thread = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread = None
+        print(self.summary())
+
+    # --- GUI-поток ---
+
+    def beat(self):
+        """Пульс из цикла событий. Опоздание относительно интервала попадает в гистограмму."""
+        now = time.monotonic()
+        with self._lock:
+            latency = max(0.0, now - self._last_beat - self.interval)
+            self._last_beat = now
+            stack, self._stall_stack = self._stall_stack, None
+        self._add_to_histogram(latency * 1000)
+        if latency >= self.threshold:
+            self._report_stall(latency, stack)
+
+    def _add_to_histogram(self, latency_ms: float):
+        for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.histogram[i] += 1
+                return
+        self.histogram[-1] += 1
+
+    # --- Поток-наблюдатель ---
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                stuck_for = time.monotonic() - self._last_beat - self.interval
+                need_stack = stuck_for >= self.threshold and self._stall_stack is None
+            if need_stack:
+                # Снимаем стек, пока GUI-поток еще висит: после разморозки он уже бесполезен
+                stack = self._capture_main_stack()
+                with self._lock:
+                    if self._stall_stack is None:
+                        self._stall_stack = stack
+
+    def _capture_main_stack(self) -> str:
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return "(стек главного потока недоступен)"
+        return "".join(traceback.format_stack(frame))
+
+    # --- Отчеты ---
+
+    def _report_stall(self, latency: float, stack: str | None):
+        self.stalls += 1
+        message = f"[Watchdog] Интерфейс не отвечал {latency * 1000:.0f} мс"
+        print(message)
+        if stack:
+            print(stack.rstrip())
+        if not self.log_path or self.stalls > MAX_LOGGED_STALLS:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(f"{datetime.now().isoformat(timespec='seconds')} {message}\n")
+                f.write(stack or "(стек не снят: поток-наблюдатель не успел)\n")
+                f.write("\n")
+        except (IOError, OSError) as e:
+            print(f"Ошибка записи журнала зависаний '{self.log_path}': {e}")
+
+    def summary(self) -> str:
+        """Гистограмма задержек цикла событий."""
+        total = sum(self.histogram) or 1
+        lines = [f"--- Задержки цикла событий: {sum(self.histogram)} пульсов, зависаний: {self.stalls} ---"]
+        lower = 0
+        for i, count in enumerate(self.histogram):
+            label = f"{lower}-{HISTOGRAM_BUCKETS_MS[i]} мс" if i < len(HISTOGRAM_BUCKETS_MS) else f">{lower} мс"
+            if count:
+                lines.append(f"{label:>14}: {count:6d} ({count * 100 / total:5.1f}%)")
+            if i < len(HISTOGRAM_BUCKETS_MS):
+                lower = HISTOGRAM_BUCKETS_MS[i]
+        return "\n".join(lines)
@@ -2,16 +2,35 @@
 
 import sys
 import os
-import minecraft_launcher_lib
+
+# Режим без интерфейса (python main.py --headless list-versions | install <v> | launch <профиль>): без PySide6
+if "--headless" in sys.argv:
+    from core import cli
+    sys.exit(cli.main(sys.argv[1:]))
+
+# Отчет о времени импорта (--import-report или NOVA_IMPORT_REPORT=1) включается раньше всех остальных импортов
+if "--import-report" in sys.argv or os.environ.get("NOVA_IMPORT_REPORT"):
+    from core import importtime
+    importtime.install()
+else:
+    importtime = None
+
+from core import tracing, startup
+
+# Трассировка этапов: --trace (сводка в консоль), --trace=файл.json или NOVA_TRACE=файл.json (Chrome Trace)
+_trace_arg = next((arg for arg in sys.argv if arg == "--trace" or arg.startswith("--trace=")), None)
+_trace_env = os.environ.get("NOVA_TRACE")
+if _trace_arg or _trace_env:
+    _trace_output = _trace_arg.partition("=")[2] if _trace_arg else _trace_env
+    tracing.enable(None if _trace_output in ("", "1", "summary") else _trace_output)
+_imports_span = tracing.start_span("imports", "startup")
+
 import subprocess
-import json
 import uuid
-import requests
-from datetime import datetime
 import threading
+import time
 import traceback
-import hashlib
-import urllib.parse
+import importlib
 import shutil
 import re
 
@@ -21,18 +40,18 @@ from PySide6.QtWidgets import (
                              QProgressBar, QMessageBox, QStackedWidget,
                              QListWidget, QCheckBox, QFileDialog, QDialog,
                              QDialogButtonBox, QListWidgetItem, QSizePolicy,
-                             QSpacerItem, QFrame, QGraphicsOpacityEffect, QComboBox,
-    QTabWidget, QSplashScreen, QGraphicsDropShadowEffect
+                             QSpacerItem, QFrame, QComboBox,
+    QTabWidget, QSplashScreen, QGraphicsDropShadowEffect, QScrollArea
 )
 from PySide6.QtGui import (
     QFont, QFontDatabase, QIcon, QPixmap, QPalette,
     QBrush, QColor, QLinearGradient, QPainter, QCursor,
-    QTransform
+    QTransform, QImage
 )
 from PySide6.QtCore import (
-    Qt, QThread, Signal, QTimer, QPropertyAnimation,
+    Qt, Signal, QTimer, QVariantAnimation,
                            QEasingCurve, QPoint, QParallelAnimationGroup, QRect, QSize, Slot, QObject,
-    Property, QSequentialAnimationGroup, QPointF
+    Property, QSequentialAnimationGroup, QPointF, QEvent
 )
 
 try:
@@ -46,20 +65,98 @@ except ImportError:
         def start_animation(self): pass
         def finish(self, window): window.show()
 
+# Сеть (requests/urllib3) и minecraft_launcher_lib импортируются лениво - внутри функций,
+# которым они нужны, а сразу после показа сплеша подгружаются в фоновом потоке (preload_modules_async)
+from core.connectivity import get_monitor, OFFLINE_TTL
+from core.jobs import get_scheduler, PRIORITY_HIGH, PRIORITY_LOW
+from core.install_queue import InstallQueue, STATUS_QUEUED, STATUS_INSTALLING, STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED
+from core.prefetch import Prefetcher
+from core.theme import Theme, ThemeEngine
+from core import ui_snapshot
+from core.settings import SettingsManager, ProfileManager, MINECRAFT_VERSION, PAGE_TRANSITION_MS
+from core.launch import LAUNCHER_VERSION
+_imports_span.end()
+
 # --- Константы ---
-LAUNCHER_VERSION = "2.0.0.1"
-SETTINGS_FILE = "settings.json"
-PROFILES_FILE = "profiles.json"
-MINECRAFT_VERSION = "1.21.4"
 RESOURCES_DIR = "Resources"
 LOGO_FILE = os.path.join(RESOURCES_DIR, "rounded_logo_nova.png")
 FONT_FILE = os.path.join(RESOURCES_DIR, "minecraft-ten-font-cyrillic.ttf")
-MINECRAFT_DATA_DIR_NAME = "NovaLauncherMC"
 CACHE_DIR = os.path.join(RESOURCES_DIR, "cache")
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "images") # Своя папка: кэш удаляет из нее файлы не из своего индекса
 PROFILE_ICONS_DIR = os.path.join(RESOURCES_DIR, "profile_icons")
 DEFAULT_PROFILE_ICON = os.path.join(RESOURCES_DIR, "icon_default.png")
+NEWS_FEED_FILE = os.path.join(RESOURCES_DIR, "news.json") # Лента по умолчанию
+NEWS_CACHE_FILE = os.path.join(CACHE_DIR, "news", "feed.json")
+NEWS_IMAGE_WIDTH, NEWS_IMAGE_HEIGHT = 220, 120
+IMPORT_REPORT_FILE = os.path.join(CACHE_DIR, "stats", "import_report.json")
+THEME_CACHE_DIR = os.path.join(CACHE_DIR, "themes") # Скомпилированные таблицы стилей
+STALL_LOG_FILE = os.path.join(RESOURCES_DIR, "logs", "stalls.log") # Журнал зависаний интерфейса (сторож)
+# Тяжелые модули, которые не должны импортироваться до показа сплеша
+DEFERRED_MODULES = (
+    "requests", "urllib3", "minecraft_launcher_lib",
+    "core.http", "core.image_cache", "core.news", "core.versions", "core.installer",
+)
+VERSION_MANIFEST_CACHE_FILE = os.path.join(CACHE_DIR, "versions", "version_manifest_v2.json")
+PAGE_PREBUILD_DELAY_MS = 1500 # Через сколько после показа окна достраивать скрытые страницы
+STARTUP_HISTORY_FILE = os.path.join(CACHE_DIR, "stats", "startup_history.json") # Длительности этапов прошлых запусков
+UI_SNAPSHOT_FILE = os.path.join(CACHE_DIR, "ui", "snapshot.json") # Состояние интерфейса для теплого старта
+INSTALL_QUEUE_FILE = "install_queue.json" # Очередь установки (рядом с settings.json, переживает перезапуск)
+INSTALL_QUEUE_RESUME_DELAY_MS = 3000 # Через сколько после запуска продолжать прерванные установки из очереди
+INSTALL_QUEUE_REFRESH_MS = 250 # Не чаще этого обновляем страницу очереди
+PREFETCH_IDLE_MS = 60 * 1000 # Как часто проверяем, можно ли докачивать версии в простое
+# Подписи статусов очереди установки
+QUEUE_STATUS_TEXT = {
+    STATUS_QUEUED: "В очереди",
+    STATUS_INSTALLING: "Установка",
+    STATUS_DONE: "Установлена",
+    STATUS_FAILED: "Ошибка",
+    STATUS_CANCELLED: "Отменена",
+}
+# Этапы запуска, которые показывает сплеш (ключ, подпись)
+STARTUP_STAGES = (
+    ("modules", "Загрузка модулей"),
+    ("network", "Проверка сети"),
+    ("profiles", "Профили и настройки"),
+    ("fonts", "Шрифты"),
+    ("interface", "Интерфейс"),
+    ("styles", "Стили"),
+    ("versions", "Кэш версий"),
+)
+
+# --- Отложенные импорты ---
+_preload_thread = None
+
+def preload_modules_async():
+    """Импортирует тяжелые модули в фоновом потоке, пока показывается сплеш."""
+    global _preload_thread
+    def preload():
+        for name in DEFERRED_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"Ошибка фонового импорта {name}: {e}")
+        startup.end("modules")
+    startup.begin("modules")
+    _preload_thread = threading.Thread(target=preload, name="ModulePreload", daemon=True)
+    _preload_thread.start()
+
+def wait_for_preload():
+    """Дожидается фоновых импортов (чтобы главный поток не импортировал те же модули параллельно)."""
+    if _preload_thread is not None:
+        _preload_thread.join()
 
 # --- Функция загрузки и кэширования изображений ---
+_image_cache = None
+
+def get_image_cache():
+    """Возвращает общий для лаунчера дисковый кэш изображений (создается при первом обращении)."""
+    global _image_cache
+    if _image_cache is None:
+        from core.image_cache import ImageCache, move_legacy_cache
+        move_legacy_cache(CACHE_DIR, IMAGE_CACHE_DIR) # Раньше картинки лежали прямо в Resources/cache
+        _image_cache = ImageCache(IMAGE_CACHE_DIR, max_bytes=SettingsManager.DEFAULT_SETTINGS["image_cache_max_mb"] * 1024 * 1024)
+    return _image_cache
+
 def get_cached_image_path(image_url: str) -> str | None:
     """
     Загружает изображение по URL, кэширует его локально и возвращает путь к файлу.
@@ -71,225 +168,106 @@ def get_cached_image_path(image_url: str) -> str | None:
         return None
 
     try:
-        # Создаем папку кэша, если ее нет
-        os.makedirs(CACHE_DIR, exist_ok=True)
-
-        # Создаем имя файла на основе хэша URL, сохраняя расширение
-        parsed_url = urllib.parse.urlparse(image_url)
-        _, ext = os.path.splitext(parsed_url.path)
-        if not ext: ext = ".png" # По умолчанию .png, если нет расширения
-        filename_hash = hashlib.sha256(image_url.encode()).hexdigest()
-        cached_file_path = os.path.join(CACHE_DIR, f"{filename_hash}{ext}")
-
-        # Проверяем наличие файла в кэше
-        if os.path.exists(cached_file_path):
-            # print(f"Изображение найдено в кэше: {cached_file_path}")
-            return cached_file_path
-
-        # Загружаем изображение
-        print(f"Загрузка изображения из {image_url}...")
-        response = requests.get(image_url, stream=True, timeout=10) # Таймаут 10 сек
-        response.raise_for_status() # Вызовет исключение для плохих ответов (4xx или 5xx)
-
-        # Сохраняем в файл
-        with open(cached_file_path, 'wb') as f:
-            for chunk in response.iter_content(1024):
-                f.write(chunk)
-        print(f"Изображение сохранено в кэш: {cached_file_path}")
-        return cached_file_path
-
-    except requests.exceptions.RequestException as e:
-        print(f"Ошибка сети при загрузке {image_url}: {e}")
-        return None
-    except IOError as e:
-        print(f"Ошибка ввода/вывода при сохранении кэша для {image_url}: {e}")
-        return None
+        return get_image_cache().get_path(image_url)
     except Exception as e:
         print(f"Неизвестная ошибка при обработке {image_url}: {e}")
         return None
 
 
-# --- Поток для загрузки иконок ---
-class IconLoaderThread(QThread):
-    """Асинхронно загружает иконки для виджетов."""
-    # Сигнал: виджет, путь к загруженной иконке (или None при ошибке)
-    icon_loaded = Signal(QObject, str) # Используем QObject для универсальности
-
-    def __init__(self, widgets_with_urls: list[QWidget], parent=None):
-        super().__init__(parent)
-        # [(widget, url), ...]
-        self.widgets_to_load = []
-        for widget in widgets_with_urls:
-            if hasattr(widget, 'icon_url') and getattr(widget, 'icon_url'):
-                 self.widgets_to_load.append((widget, getattr(widget, 'icon_url')))
-
-    def run(self):
-        print(f"IconLoaderThread: Загрузка {len(self.widgets_to_load)} иконок...")
-        for widget, url in self.widgets_to_load:
-            if not isinstance(widget, QObject): # Проверка
-                print(f"Предупреждение: Виджет для URL {url} не является QObject.")
-                continue
-
-            cached_path = get_cached_image_path(url)
-            # Отправляем сигнал даже с None, чтобы обработчик знал о завершении попытки
-            self.icon_loaded.emit(widget, cached_path)
-            # Небольшая пауза, чтобы не перегружать сеть/диск, если иконок много
-            self.msleep(50)
-        print("IconLoaderThread: Загрузка завершена.")
-
-
-# --- Менеджеры данных ---
-
-class SettingsManager:
+# --- Qt-адаптер планировщика задач ---
+class JobWatcher(QObject):
     """
-    Управляет загрузкой, сохранением и доступом к настройкам лаунчера.
-    Настройки хранятся в JSON-файле.
+    Пересылает итог задачи планировщика (core.jobs) в GUI-поток сигналами.
+    Сигналы подключаются до watch(); обработчики всегда вызываются в потоке
+    объекта, а после finished объект удаляется.
     """
-    DEFAULT_SETTINGS = {
-        "java_path": "",
-        "min_memory_mb": 2048,
-        "max_memory_mb": 4096,
-        "close_on_launch": False,
-        "selected_profile_uuid": None,
-        "is_premium": False,  # Флаг премиум-статуса
-        # Настройки фильтров версий
-        "show_releases": True,
-        "show_snapshots": True,
-        "show_betas": False,
-        "show_alphas": False,
-        # Можно добавить и для модов, но пока не будем усложнять
-        # "show_fabric": True,
-        # "show_forge": True,
-    }
+    succeeded = Signal(object) # Результат задачи
+    failed = Signal(object) # Исключение
+    cancelled = Signal()
+    finished = Signal() # После любого из трех сигналов выше
+    progress = Signal(int, str) # (значение 0-100 или -1, статус) - от report()
+    _done = Signal(object)
+    _progress = Signal(int, str)
 
-    def __init__(self, filename=SETTINGS_FILE):
-        self.filename = filename
-        self.settings = self._load_settings()
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.job = None
+        self._done.connect(self._deliver) # Из потока пула - через очередь событий
+        self._progress.connect(self.progress)
 
-    def _load_settings(self):
-        """Загружает настройки из файла, дополняя отсутствующие значения дефолтными."""
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r', encoding='utf-8') as f:
-                    loaded = json.load(f)
-                    # Гарантируем наличие всех ключей
-                    settings = self.DEFAULT_SETTINGS.copy()
-                    settings.update(loaded) # Загруженные значения переопределяют дефолтные
-                    return settings
-            except (json.JSONDecodeError, IOError, TypeError) as e:
-                print(f"Ошибка загрузки файла настроек '{self.filename}': {e}. Используются настройки по умолчанию.")
-        return self.DEFAULT_SETTINGS.copy()
-
-    def save_settings(self):
-        """Сохраняет текущие настройки в JSON-файл."""
+    def watch(self, job):
+        self.job = job
+        job.add_done_callback(self._on_job_done)
+        return job
+
+    def report(self, value: int, status: str = ""):
+        """Прогресс из задачи (можно вызывать из любого потока)."""
+        try:
+            self._progress.emit(value, status)
+        except RuntimeError:
+            pass # Наблюдатель уже удален
+
+    def _on_job_done(self, job):
         try:
-            os.makedirs(os.path.dirname(self.filename) or '.', exist_ok=True) # Создаем папку, если нужно
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4, ensure_ascii=False)
-        except IOError as e:
-            print(f"Ошибка сохранения файла настроек '{self.filename}': {e}.")
-
-    def get(self, key):
-        """Возвращает значение настройки по ключу."""
-        return self.settings.get(key, self.DEFAULT_SETTINGS.get(key))
-
-    def set(self, key, value):
-        """Устанавливает значение настройки и сохраняет файл."""
-        if key in self.DEFAULT_SETTINGS: # Сохраняем только известные ключи
-             self.settings[key] = value
-             self.save_settings()
+            self._done.emit(job)
+        except RuntimeError:
+            pass
+
+    @Slot(object)
+    def _deliver(self, job):
+        if job.cancelled:
+            self.cancelled.emit()
+        elif job.exception() is not None:
+            self.failed.emit(job.exception())
         else:
-             print(f"Предупреждение: Попытка установить неизвестный ключ настройки '{key}'.")
+            self.succeeded.emit(job.result())
+        self.finished.emit()
+        self.deleteLater()
 
 
-class ProfileManager:
+# --- Загрузка иконок ---
+ICON_LOADER_BURST = 6 # Сколько иконок можно запросить сразу, без ограничения частоты
+ICON_LOADER_RATE = 20.0 # Не более N новых запросов в секунду (после первых ICON_LOADER_BURST)
+_icon_rate_limiter = None
+
+def _load_icon(url):
+    global _icon_rate_limiter
+    if _icon_rate_limiter is None:
+        from core.http import RateLimiter
+        _icon_rate_limiter = RateLimiter(ICON_LOADER_RATE, burst=ICON_LOADER_BURST)
+    _icon_rate_limiter.acquire() # Ограничение частоты вместо фиксированной паузы после каждой иконки
+    return get_cached_image_path(url)
+
+def load_icons_async(widgets: list[QWidget], on_loaded, parent=None):
     """
-    Управляет созданием, редактированием, удалением и хранением профилей пользователей.
-    Профили хранятся в JSON-файле.
+    Загружает иконки виджетов (атрибут icon_url) через общий планировщик задач.
+    on_loaded(виджет, путь или None) вызывается в GUI-потоке по мере загрузки.
     """
-    def __init__(self, filename=PROFILES_FILE):
-        self.filename = filename
-        self.profiles = self._load_profiles()
+    for widget in widgets:
+        url = getattr(widget, 'icon_url', None)
+        if not url:
+            continue
+        watcher = JobWatcher(parent)
+        watcher.succeeded.connect(lambda path, widget=widget: on_loaded(widget, path))
+        watcher.failed.connect(lambda e, widget=widget: on_loaded(widget, None))
+        watcher.watch(get_scheduler().submit(_load_icon, url, key=("icon", url)))
+
+
+def load_news_image(source: str) -> QImage | None:
+    """
+    Получает картинку новости (через кэш, если это URL), декодирует и обрезает под карточку.
+    Выполняется в потоке планировщика: QImage можно создавать в любом потоке, в QPixmap он превращается уже в GUI-потоке.
+    """
+    from core.news import is_remote_url
+    path = get_cached_image_path(source) if is_remote_url(source) else source
+    if not path or not os.path.exists(path):
+        return None
+    image = QImage(path)
+    if image.isNull():
+        return None
+    image = image.scaled(NEWS_IMAGE_WIDTH, NEWS_IMAGE_HEIGHT, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    return image.copy(QRect(0, 0, NEWS_IMAGE_WIDTH, NEWS_IMAGE_HEIGHT))
 
-    def _load_profiles(self):
-        """Загружает профили из файла."""
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r', encoding='utf-8') as f:
-                    profiles = json.load(f)
-                    # Простая валидация - ожидаем словарь
-                    if isinstance(profiles, dict):
-                        return profiles
-                    else:
-                        print(f"Ошибка формата файла профилей '{self.filename}'. Ожидался словарь.")
-                        return {}
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Ошибка загрузки файла профилей '{self.filename}': {e}. Список профилей пуст.")
-        return {}
-
-    def save_profiles(self):
-        """Сохраняет текущий список профилей в JSON-файл."""
-        try:
-            os.makedirs(os.path.dirname(self.filename) or '.', exist_ok=True)
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump(self.profiles, f, indent=4, ensure_ascii=False)
-        except IOError as e:
-            print(f"Ошибка сохранения файла профилей '{self.filename}': {e}.")
-
-    def add_profile(self, name, username, version=MINECRAFT_VERSION, min_memory=None, max_memory=None, icon_filename=None):
-        """Добавляет новый профиль и возвращает его UUID."""
-        if not name or not username:
-            print("Ошибка: Имя профиля и имя пользователя не могут быть пустыми.")
-            return None
-        profile_uuid = str(uuid.uuid4())
-        self.profiles[profile_uuid] = {
-            "name": name,
-            "username": username,
-            "version": version,
-            "min_memory_override": min_memory,
-            "max_memory_override": max_memory,
-            "icon_filename": icon_filename, # Сохраняем имя файла иконки
-            "last_used": datetime.now().isoformat()
-        }
-        self.save_profiles()
-        return profile_uuid
-
-    def update_profile(self, profile_uuid, name, username, min_memory=None, max_memory=None, icon_filename=None):
-        """Обновляет существующий профиль."""
-        if profile_uuid in self.profiles:
-            if not name or not username:
-                print("Ошибка: Имя профиля и имя пользователя не могут быть пустыми.")
-                return False
-            self.profiles[profile_uuid]["name"] = name
-            self.profiles[profile_uuid]["username"] = username
-            self.profiles[profile_uuid]["min_memory_override"] = min_memory
-            self.profiles[profile_uuid]["max_memory_override"] = max_memory
-            self.profiles[profile_uuid]["icon_filename"] = icon_filename # Обновляем имя файла иконки
-            self.profiles[profile_uuid]["last_used"] = datetime.now().isoformat()
-            self.save_profiles()
-            return True
-        return False
-
-    def delete_profile(self, profile_uuid):
-        """Удаляет профиль по UUID."""
-        if profile_uuid in self.profiles:
-            del self.profiles[profile_uuid]
-            self.save_profiles()
-            return True
-        return False
-
-    def get_profile(self, profile_uuid):
-        """Возвращает данные профиля по UUID."""
-        return self.profiles.get(profile_uuid)
-
-    def get_all_profiles(self):
-        """Возвращает словарь всех профилей, отсортированных по имени."""
-        try:
-            # Сортировка с обработкой возможного отсутствия ключа 'name'
-            return dict(sorted(self.profiles.items(), key=lambda item: item[1].get('name', '')))
-        except Exception as e:
-            print(f"Ошибка сортировки профилей: {e}")
-            return self.profiles # Возвращаем несортированный словарь в случае ошибки
 
 # --- Диалог редактирования/создания профиля ---
 
@@ -536,6 +514,65 @@ class ProfileDialog(QDialog):
              }}
          """)
 
+# --- Переход между страницами ---
+
+class PageCrossfade(QWidget):
+    """
+    Перекрестное затухание между страницами стека.
+
+    Обе страницы снимаются в QPixmap один раз в начале перехода, а во время
+    анимации поверх стека рисуются только эти два снимка. Графических
+    эффектов на самих страницах нет, так что после перехода они рисуются
+    напрямую; по окончании оверлей скрывается и снимки освобождаются.
+    """
+    def __init__(self, stack: QStackedWidget):
+        super().__init__(stack)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents) # Клики идут на настоящую страницу
+        self.hide()
+        self._from = None
+        self._to = None
+        self._progress = 0.0
+        self._animation = QVariantAnimation(self)
+        self._animation.setStartValue(0.0)
+        self._animation.setEndValue(1.0)
+        self._animation.setEasingCurve(QEasingCurve.InOutQuad)
+        self._animation.valueChanged.connect(self._on_progress)
+        self._animation.finished.connect(self.finish)
+
+    def is_running(self) -> bool:
+        return self.isVisible()
+
+    def start(self, outgoing: QPixmap, incoming: QPixmap, duration_ms: int):
+        """Запускает переход от снимка outgoing к снимку incoming."""
+        self._animation.stop()
+        self._from, self._to = outgoing, incoming
+        self._progress = 0.0
+        self.setGeometry(self.parentWidget().rect())
+        self.raise_()
+        self.show()
+        self._animation.setDuration(max(1, duration_ms))
+        self._animation.start()
+
+    def finish(self):
+        """Обрывает (или завершает) переход: оверлей скрывается, снимки освобождаются."""
+        self._animation.stop()
+        self.hide()
+        self._from = self._to = None
+
+    def _on_progress(self, value):
+        self._progress = float(value)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self._from is not None:
+            painter.drawPixmap(0, 0, self._from)
+        if self._to is not None:
+            painter.setOpacity(self._progress)
+            painter.drawPixmap(0, 0, self._to)
+        painter.end()
+
+
 # --- Виджет кастомной строки заголовка ---
 
 class CustomTitleBar(QWidget):
@@ -697,7 +734,14 @@ class NovaLauncher(QMainWindow): # Переименован класс
 
     # Сигнал для обновления иконки из другого потока
     request_icon_update = Signal(QWidget, str)
-
+    # Картинка по URL обновилась в кэше (после фоновой проверки свежести)
+    news_image_updated = Signal(str)
+    # Изменилось состояние сети (True - в сети)
+    connectivity_changed = Signal(bool)
+    # Изменилась очередь установки (из потоков планировщика)
+    install_queue_changed = Signal()
+
+    @tracing.traced("NovaLauncher.__init__", "startup")
     def __init__(self):
         super().__init__()
         self.setWindowTitle(f"Nova Launcher v{LAUNCHER_VERSION}") # Обновлен заголовок
@@ -708,8 +752,18 @@ class NovaLauncher(QMainWindow): # Переименован класс
         # self.widgets_requiring_icons = []
 
         # Менеджеры данных
-        self.settings_manager = SettingsManager()
-        self.profile_manager = ProfileManager()
+        with startup.stage("profiles"):
+            self.settings_manager = SettingsManager()
+            self.profile_manager = ProfileManager()
+        self._configure_network()
+        get_image_cache().set_max_bytes(self.settings_manager.get("image_cache_max_mb") * 1024 * 1024)
+
+        # Лента новостей (карточки сначала строятся из кэша, затем обновляются в фоне)
+        from core.news import NewsFeed
+        self.news_feed = NewsFeed(self.settings_manager.get("news_feed_url") or NEWS_FEED_FILE, NEWS_CACHE_FILE)
+        self.news_cards = []
+        self.news_image_updated.connect(self.on_news_image_updated)
+        get_image_cache().add_listener(lambda url, path: self.news_image_updated.emit(url))
 
         # Новая цветовая палитра (Minecraft/Nova с вашим цветом)
         self.colors = {
@@ -731,8 +785,17 @@ class NovaLauncher(QMainWindow): # Переименован класс
             'yellow_hover': '#FFFF00',
         }
 
+        # Тема оформления: палитра выше + QSS-шаблоны по областям (core/theme.py)
+        self.theme_engine = ThemeEngine(THEME_CACHE_DIR)
+        self.theme = Theme("nova", self.colors, assets={
+            "icon_checkmark": os.path.join(str(RESOURCES_DIR), "icon_checkmark.png").replace("\\", "/"),
+            "icon_dropdown": os.path.join(str(RESOURCES_DIR), "icon_dropdown.png").replace("\\", "/"),
+        })
+        self._applied_sheets = {} # область -> примененный QSS
+
         # Загрузка ресурсов
-        self._load_font()
+        with startup.stage("fonts"):
+            self._load_font()
         self._check_resources()
 
         # Иконка окна (для панели задач)
@@ -742,6 +805,7 @@ class NovaLauncher(QMainWindow): # Переименован класс
         self._create_minecraft_directory()
 
         # --- Создание основного макета с кастомным заголовком ---
+        startup.begin("interface")
         self.main_widget = QWidget() # Основной виджет внутри окна
         self.main_layout = QVBoxLayout(self.main_widget)
         self.main_layout.setContentsMargins(0, 0, 0, 0)
@@ -777,32 +841,71 @@ class NovaLauncher(QMainWindow): # Переименован класс
         # Стек страниц
         self.content_stack = QStackedWidget()
         self.content_stack.setObjectName("contentStack")
-        # Добавляем страницы
+        # Добавляем страницы. Сразу строится только главная, остальные -
+        # при первом переходе на них (или в простое после показа окна)
         self.play_page = self._create_play_page() # Будет добавлено в следующей части
-        self.profiles_page = self._create_profiles_page() # Будет добавлено в следующей части
-        self.settings_page = self._create_settings_page() # Будет добавлено в следующей части
+        self.profiles_page = None
+        self.settings_page = None
+        self.queue_page = None
+        self._page_factories = {
+            1: (self._create_profiles_page, 'profiles_page', self._init_profiles_page),
+            2: (self._create_settings_page, 'settings_page', self.load_settings_to_ui),
+            3: (self._create_queue_page, 'queue_page', self._refresh_queue_page),
+        }
         self.content_stack.addWidget(self.play_page)
-        self.content_stack.addWidget(self.profiles_page)
-        self.content_stack.addWidget(self.settings_page)
+        for _ in self._page_factories:
+            self.content_stack.addWidget(QWidget()) # Заглушка до построения страницы
         self.content_layout.addWidget(self.content_stack)
+        self.page_crossfade = PageCrossfade(self.content_stack)
 
         # Добавляем контентную область в основной layout
         self.body_layout.addWidget(self.content_area)
         self.main_layout.addWidget(self.body_widget)
 
         # --- Потоки для установки ---
-        self.installer_thread = None # Поток для установки версии/Java
+        self.install_job = None # Задача установки версии/Java
         # self.mod_installer_thread = None # Удален, больше не нужен
 
         # --- Кэш установленных версий ---
         self.installed_version_ids = set() # Для быстрой проверки версий
+        self._version_entries = None # Показанный список [id, тип, установлена] (из снимка или свежий)
+        self._version_sources = None # Последние данные задачи: (установленные, доступные)
+        self._version_job = None
+        self._versions_reload_pending = False
+
+        # --- Очередь установки ---
+        # Прерванные в прошлый раз установки продолжаются чуть позже, когда окно уже показано
+        self.install_queue = InstallQueue(
+            self.minecraft_directory, INSTALL_QUEUE_FILE,
+            max_parallel=self.settings_manager.get("install_queue_parallel"),
+            java_path=self.settings_manager.get("java_path") or None,
+        )
+        self.install_queue.add_listener(lambda version: self.install_queue_changed.emit())
+        self.install_queue_changed.connect(self._on_install_queue_changed)
+        self._queue_refresh_timer = QTimer(self)
+        self._queue_refresh_timer.setSingleShot(True)
+        self._queue_refresh_timer.setInterval(INSTALL_QUEUE_REFRESH_MS)
+        self._queue_refresh_timer.timeout.connect(self._refresh_queue_page)
+        self._queue_speed_sample = None # (время, получено байт) для расчета скорости
+        self._queue_done_count = 0
+        if self.install_queue.has_active():
+            print(f"Очередь установки: {len(self.install_queue.entries())} версий из прошлого запуска")
+        QTimer.singleShot(INSTALL_QUEUE_RESUME_DELAY_MS, self.install_queue.start)
+
+        # --- Предзагрузка версий в простое (включается в настройках) ---
+        self.prefetcher = Prefetcher(self.minecraft_directory, self.settings_manager.get("java_path") or None)
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setInterval(PREFETCH_IDLE_MS)
+        self._prefetch_timer.timeout.connect(self._maybe_prefetch)
+        self._network_information = None # QNetworkInformation (лимитное подключение), загружается при первой проверке
+
+        # --- Раздача своего кэша в локальной сети (включается в настройках) ---
+        self.cache_server = None
+        self._update_cache_server()
 
         # Устанавливаем основной виджет для QMainWindow
         self.setCentralWidget(self.main_widget)
-
-        # --- Анимации для стека ---
-        self._active_opacity_effect = None # Храним активный эффект
-        self._active_fade_animation = None # Храним активную анимацию
+        startup.end("interface")
 
         # --- Инициализация UI --- (Оставшаяся часть будет в следующих блоках)
         # self.apply_styles()
@@ -822,15 +925,15 @@ class NovaLauncher(QMainWindow): # Переименован класс
 
         # # --- Запуск загрузки иконок ---
         # # if self.widgets_requiring_icons:
-        # #     self.icon_loader_thread = IconLoaderThread(self.widgets_requiring_icons)
-        # #     self.icon_loader_thread.icon_loaded.connect(self.on_icon_loaded)
-        # #     self.icon_loader_thread.start()
+        # #     load_icons_async(self.widgets_requiring_icons, self.on_icon_loaded, self)
 
         print("Лаунчер Nova инициализирован.") # Обновлено сообщение
         print(f"Папка данных Minecraft: {self.minecraft_directory}")
         self._check_internet()
+        QTimer.singleShot(0, self.refresh_news) # Лента обновляется уже после создания окна
 
 
+    @tracing.traced()
     def _load_font(self):
         """Загружает кастомный шрифт."""
         self.minecraft_font_base = QFont("Arial") # Запасной
@@ -848,7 +951,7 @@ class NovaLauncher(QMainWindow): # Переименован класс
 
     def _check_resources(self):
         """Проверяет наличие ключевых файлов иконок."""
-        icons = ["icon_home.png", "icon_profile.png", "icon_settings.png",
+        icons = ["icon_home.png", "icon_profile.png", "icon_settings.png", "icon_queue.png",
                  "icon_minimize.png", "icon_close.png"]
         missing = []
         for icon in icons:
@@ -861,19 +964,87 @@ class NovaLauncher(QMainWindow): # Переименован класс
 
     def _create_minecraft_directory(self):
         """Создает папку данных игры."""
+        from core.launch import get_minecraft_directory
+        self.minecraft_directory = get_minecraft_directory(create=False) # Путь нужен и для сообщения об ошибке
         try:
-            base_dir = os.path.dirname(minecraft_launcher_lib.utils.get_minecraft_directory())
-            self.minecraft_directory = os.path.join(base_dir, MINECRAFT_DATA_DIR_NAME)
             os.makedirs(self.minecraft_directory, exist_ok=True)
         except Exception as e:
             print(f"Критическая ошибка: Не удалось создать папку данных Minecraft '{self.minecraft_directory}': {e}")
             QMessageBox.critical(self, "Ошибка папки данных", f"Не удалось создать папку:\n{self.minecraft_directory}\nОшибка: {e}\nЛаунчер закроется.")
             sys.exit(1)
 
+    def _configure_network(self):
+        """Настраивает общий HTTP-клиент лаунчера по текущим настройкам и запускает проверку сети."""
+        from core.http import configure_client
+        from core.versions import set_manifest_cache_file
+        set_manifest_cache_file(VERSION_MANIFEST_CACHE_FILE)
+        get_monitor().set_forced_offline(self.settings_manager.get("offline_mode"))
+        get_monitor().check_async() # Проверка идет, пока строится интерфейс
+        configure_client(
+            timeout=self.settings_manager.get("http_timeout_sec"),
+            retries=self.settings_manager.get("http_retries"),
+            max_per_host=self.settings_manager.get("http_max_per_host"),
+            bandwidth_limit=self.settings_manager.get("download_limit_kbps") * 1024,
+            user_agent=f"NovaLauncher/{LAUNCHER_VERSION}",
+            mirror=self.settings_manager.get("mirror_url"),
+        )
+
+    def _update_cache_server(self):
+        """Запускает, перезапускает (смена порта) или останавливает раздачу кэша по настройкам."""
+        enabled = self.settings_manager.get("serve_cache")
+        port = self.settings_manager.get("serve_cache_port")
+        if self.cache_server is not None and (not enabled or self.cache_server.port != port):
+            self.cache_server.stop()
+            self.cache_server = None
+        if not enabled or self.cache_server is not None:
+            return
+        from core.mirror import CacheServer
+        server = CacheServer(self.minecraft_directory, port=port)
+        try:
+            server.start()
+        except OSError as e:
+            print(f"Не удалось запустить раздачу кэша на порту {port}: {e}")
+            if self.isVisible():
+                QMessageBox.warning(self, "Раздача кэша", f"Не удалось открыть порт {port}: {e}")
+            return
+        self.cache_server = server
+
     def _check_internet(self):
-         """Проверка интернет-соединения."""
-         # (остается без изменений)
-         pass # Убрал вывод в консоль и QMessageBox для чистоты
+        """Подписывается на монитор сети и показывает текущее состояние в верхней панели."""
+        monitor = get_monitor()
+        self.connectivity_changed.connect(self.on_connectivity_changed)
+        monitor.add_listener(self.connectivity_changed.emit)
+        # В офлайне периодически перепроверяем сеть (check_async ничего не делает, пока результат свежий)
+        self._connectivity_timer = QTimer(self)
+        self._connectivity_timer.setInterval(OFFLINE_TTL * 1000)
+        self._connectivity_timer.timeout.connect(lambda: monitor.check_async() if monitor.online is False else None)
+        self._connectivity_timer.start()
+        self._last_online = monitor.online
+        self._update_online_label(monitor.online)
+
+    def _update_online_label(self, online: bool | None):
+        if not hasattr(self, 'online_label'):
+            return
+        if get_monitor().forced_offline:
+            text, color = "Офлайн-режим", self.colors['text_light']
+        elif online is None:
+            text, color = "Проверка соединения...", self.colors['text_light']
+        elif online:
+            text, color = "Соединение активно", "#90EE90"
+        else:
+            text, color = "Нет соединения", self.colors['red']
+        self.online_label.setText(text)
+        self.online_icon.setStyleSheet(f"color: {color};")
+
+    @Slot(bool)
+    def on_connectivity_changed(self, online: bool):
+        """Сеть появилась или пропала."""
+        self._update_online_label(online)
+        was_offline, self._last_online = self._last_online is False, online
+        if online and was_offline:
+            # Обновляем то, что было загружено из кэша
+            self.load_minecraft_versions()
+            self.refresh_news()
 
 
     def get_font(self, size=10, weight=QFont.Normal, italic=False):
@@ -886,6 +1057,7 @@ class NovaLauncher(QMainWindow): # Переименован класс
 
     # --- Методы построения UI ---
 
+    @tracing.traced()
     def _create_sidebar(self):
         """Создает боковую панель с иконками."""
         sidebar = QWidget()
@@ -914,12 +1086,17 @@ class NovaLauncher(QMainWindow): # Переименован класс
             os.path.join(RESOURCES_DIR, "icon_profile.png"),
             "Профили", "_sidebarProfilesButton"
         )
+        self.queue_button = self._create_sidebar_button(
+            os.path.join(RESOURCES_DIR, "icon_queue.png"),
+            "Очередь установки", "_sidebarQueueButton"
+        )
         # Добавить другие кнопки по аналогии, если нужно
         # self.mods_button = self._create_sidebar_button("...", "Моды", "_sidebarModsButton")
 
         self.home_button.setChecked(True) # Первая кнопка (теперь это home) активна
         layout.addWidget(self.home_button)
         layout.addWidget(self.profiles_button)
+        layout.addWidget(self.queue_button)
         # layout.addWidget(self.mods_button)
 
         layout.addStretch() # Все кнопки вверх, настройки вниз
@@ -955,6 +1132,7 @@ class NovaLauncher(QMainWindow): # Переименован класс
         return button
 
 
+    @tracing.traced()
     def _create_top_bar(self):
         """Создает верхнюю панель над контентом."""
         top_bar = QWidget()
@@ -979,10 +1157,10 @@ class NovaLauncher(QMainWindow): # Переименован класс
         # Онлайн (плейсхолдер)
         online_layout = QHBoxLayout()
         online_layout.setSpacing(5)
-        online_icon = QLabel("\u25CF") # Кружок Unicode
-        online_icon.setStyleSheet("color: #90EE90;") # Зеленый
-        online_layout.addWidget(online_icon)
-        self.online_label = QLabel("Wi-Fi соединение активно") # Плейсхолдер
+        self.online_icon = QLabel("\u25CF") # Кружок Unicode
+        self.online_icon.setStyleSheet(f"color: {self.colors['text_light']};")
+        online_layout.addWidget(self.online_icon)
+        self.online_label = QLabel("Проверка соединения...") # Обновляется в _check_internet
         self.online_label.setObjectName("onlineLabel")
         online_layout.addWidget(self.online_label)
         layout.addLayout(online_layout)
@@ -996,6 +1174,48 @@ class NovaLauncher(QMainWindow): # Переименован класс
         return top_bar
 
 
+    # --- Ленивое построение страниц ---
+
+    @tracing.traced()
+    def _ensure_page(self, index: int) -> QWidget:
+        """Строит страницу при первом обращении и подменяет ею заглушку в стеке."""
+        factory = self._page_factories.pop(index, None)
+        if factory is None:
+            return self.content_stack.widget(index)
+        create, attr_name, initialize = factory
+        page = create()
+        setattr(self, attr_name, page)
+        self._apply_theme() # Стиль страницы ставится сразу при построении
+        placeholder = self.content_stack.widget(index)
+        self.content_stack.insertWidget(index, page)
+        self.content_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        initialize()
+        return page
+
+    def _init_profiles_page(self):
+        self.load_profiles_to_ui()
+        self.on_profile_selected()
+
+    def _prebuild_pages(self):
+        """Достраивает оставшиеся страницы по одной за итерацию цикла событий."""
+        if not self._page_factories:
+            return
+        self._ensure_page(min(self._page_factories))
+        if self._page_factories:
+            QTimer.singleShot(0, self._prebuild_pages)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not getattr(self, '_shown_once', False):
+            self._shown_once = True
+            tracing.instant("main_window_shown")
+            QTimer.singleShot(0, tracing.dump) # После первой отрисовки
+        if not getattr(self, '_pages_prebuild_scheduled', False) and self.settings_manager.get("prebuild_pages"):
+            self._pages_prebuild_scheduled = True
+            QTimer.singleShot(PAGE_PREBUILD_DELAY_MS, self._prebuild_pages)
+
+    @tracing.traced()
     def _create_play_page(self):
         """Создает главную страницу (Игра)."""
         page = QWidget()
@@ -1055,9 +1275,19 @@ class NovaLauncher(QMainWindow): # Переименован класс
         self.progress_bar.setVisible(False)
         self.progress_bar.setMaximumWidth(280) # Ограничим ширину
 
+        # Отмена установки (видна, пока идет установка)
+        self.cancel_install_button = QPushButton("Отменить")
+        self.cancel_install_button.setObjectName("deleteButton")
+        self.cancel_install_button.setFont(self.get_font(11))
+        self.cancel_install_button.setMaximumWidth(280)
+        self.cancel_install_button.setCursor(QCursor(Qt.PointingHandCursor))
+        self.cancel_install_button.setVisible(False)
+        self.cancel_install_button.clicked.connect(self.cancel_install)
+
         button_layout.addWidget(self.launch_button)
         button_layout.addWidget(status_label) # Добавили статус
         button_layout.addWidget(self.progress_bar)
+        button_layout.addWidget(self.cancel_install_button)
         top_layout.addLayout(button_layout, 1) # Кнопка занимает 1 часть
 
         layout.addWidget(top_section)
@@ -1076,40 +1306,56 @@ class NovaLauncher(QMainWindow): # Переименован класс
         return page
 
     def _create_news_section(self):
-         """Создает секцию с карточками новостей."""
+         """Создает секцию с карточками новостей (горизонтальная прокрутка, любое количество)."""
+         self.news_scroll = QScrollArea()
+         self.news_scroll.setObjectName("newsScroll")
+         self.news_scroll.setWidgetResizable(True)
+         self.news_scroll.setFrameShape(QFrame.NoFrame)
+         self.news_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+         self.news_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+         self.news_scroll.setFixedHeight(280 + 20 + 14) # Карточка + отступ + полоса прокрутки
+
          news_widget = QWidget()
-         layout = QHBoxLayout(news_widget)
-         layout.setContentsMargins(40, 0, 40, 20) # Отступы секции
-         layout.setSpacing(20)
-
-         # Данные для новостей (меняем местами)
-         news_data = [
-             {
-                 "title": "Spring Sale 2025",
-                 "description": "Spring is here which means it's also time for our Spring Sale... starting April 8.",
-                 "image_path": os.path.join(RESOURCES_DIR, "news2.png")
-             },
-             {
-                 "title": "The Craftmine Update",
-                 "description": "Time to finally go bigger and craft it all!",
-                 "image_path": os.path.join(RESOURCES_DIR, "news1.png")
-             }
-         ]
-
-         # Создаем две карточки
-         for data in news_data:
-              card = self._create_news_card(
-                   data["title"],
-                   data["description"],
-                   data["image_path"]
-              )
-              layout.addWidget(card)
-         layout.addStretch() # Если карточек меньше, они будут слева
-
-         return news_widget
-
-    def _create_news_card(self, title, description, image_path):
-         """Создает виджет-карточку новости."""
+         news_widget.setObjectName("newsRow")
+         self.news_layout = QHBoxLayout(news_widget)
+         self.news_layout.setContentsMargins(40, 0, 40, 20) # Отступы секции
+         self.news_layout.setSpacing(20)
+         self.news_scroll.setWidget(news_widget)
+
+         # Картинки грузим только для карточек, попавших в видимую область
+         self.news_scroll.horizontalScrollBar().valueChanged.connect(self._request_visible_news_images)
+         self.news_scroll.viewport().installEventFilter(self)
+
+         self._render_news(self.news_feed.load_cached())
+         return self.news_scroll
+
+    @tracing.traced()
+    def _render_news(self, items):
+         """Пересоздает карточки новостей. Картинки не декодируются здесь - только заглушки."""
+         if items == getattr(self, '_news_items', None):
+              return # Лента не изменилась (обычно refresh вернул тот же свежий кэш) - карточки и картинки уже есть
+         self._news_items = list(items)
+         while self.news_layout.count():
+              layout_item = self.news_layout.takeAt(0)
+              if layout_item.widget():
+                   layout_item.widget().deleteLater()
+         self.news_cards = []
+
+         if not items:
+              empty_label = QLabel("Новостей пока нет")
+              empty_label.setObjectName("newsCardDesc")
+              empty_label.setFont(self.get_font(11))
+              self.news_layout.addWidget(empty_label)
+
+         for data in items:
+              card = self._create_news_card(data["title"], data["description"], data.get("image", ""))
+              self.news_layout.addWidget(card)
+              self.news_cards.append(card)
+         self.news_layout.addStretch() # Если карточек меньше, они будут слева
+         QTimer.singleShot(0, self._request_visible_news_images)
+
+    def _create_news_card(self, title, description, image_source):
+         """Создает виджет-карточку новости с заглушкой вместо картинки."""
          card = QWidget()
          card.setObjectName("newsCard")
          card.setFixedSize(220, 280) # Увеличил высоту для описания
@@ -1119,18 +1365,17 @@ class NovaLauncher(QMainWindow): # Переименован класс
 
          image_label = QLabel()
          image_label.setObjectName("newsCardImage")
-         image_label.setFixedHeight(120)
-         if os.path.exists(image_path):
-              pix = QPixmap(image_path).scaled(220, 120, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-              rect = QRect(0, 0, 220, 120)
-              pix = pix.copy(rect)
-              image_label.setPixmap(pix)
-         else:
-             image_label.setText("[Изображение]")
-             image_label.setAlignment(Qt.AlignCenter)
-             image_label.setStyleSheet("background-color: #444;")
+         image_label.setFixedHeight(NEWS_IMAGE_HEIGHT)
+         image_label.setText("[Изображение]")
+         image_label.setAlignment(Qt.AlignCenter)
+         image_label.setStyleSheet("background-color: #444;")
          layout.addWidget(image_label)
 
+         # Данные для ленивой загрузки картинки (по аналогии с icon_url у иконок)
+         card.image_source = image_source
+         card.image_label = image_label
+         card.image_requested = False
+
          title_label = QLabel(title)
          title_label.setObjectName("newsCardTitle")
          title_label.setFont(self.get_font(12, QFont.Bold))
@@ -1146,11 +1391,65 @@ class NovaLauncher(QMainWindow): # Переименован класс
          description_label.setAlignment(Qt.AlignTop) # Выравниваем по верху
          layout.addWidget(description_label, 1) # Добавляем растяжение
 
-         # layout.addStretch() # Убираем лишнее растяжение
-
          return card
 
-
+    def refresh_news(self):
+         """Запускает фоновое обновление ленты новостей (чтобы не задерживать создание окна)."""
+         watcher = JobWatcher(self)
+         watcher.succeeded.connect(lambda items: self._render_news(items) if items is not None else None)
+         watcher.watch(get_scheduler().submit(self.news_feed.refresh, priority=PRIORITY_LOW, key="news-feed"))
+
+    def _request_visible_news_images(self):
+         """Запускает загрузку картинок для карточек в видимой области (плюс одна карточка вперед)."""
+         if not hasattr(self, 'news_scroll') or not self.news_cards:
+              return
+         viewport_width = self.news_scroll.viewport().width()
+         if viewport_width <= 0:
+              return # Еще не разложено - вызовемся снова по Resize
+         left = self.news_scroll.horizontalScrollBar().value()
+         right = left + viewport_width + 240 # Запас на одну карточку
+         pending = []
+         for card in self.news_cards:
+              if card.image_requested or not card.image_source:
+                   continue
+              geometry = card.geometry()
+              if geometry.right() >= left and geometry.left() <= right:
+                   card.image_requested = True
+                   pending.append(card)
+         for card in pending:
+              watcher = JobWatcher(self)
+              watcher.succeeded.connect(lambda image, card=card: self.on_news_image_loaded(card, image) if image is not None else None)
+              watcher.failed.connect(lambda e: print(f"Ошибка загрузки картинки новости: {e}"))
+              watcher.watch(get_scheduler().submit(load_news_image, card.image_source, priority=PRIORITY_HIGH,
+                                                   key=("news-image", card.image_source)))
+
+    @Slot(QObject, QImage)
+    def on_news_image_loaded(self, card: QObject, image: QImage):
+         """Слот для установки декодированной картинки в карточку."""
+         try:
+              label = card.image_label
+              label.setText("")
+              label.setStyleSheet("")
+              label.setPixmap(QPixmap.fromImage(image))
+         except (RuntimeError, AttributeError):
+              pass # Карточка уже удалена (лента обновилась)
+
+    @Slot(str)
+    def on_news_image_updated(self, url: str):
+         """Картинка обновилась в кэше - перечитываем ее для видимых карточек."""
+         for card in self.news_cards:
+              if card.image_source == url:
+                   card.image_requested = False
+         self._request_visible_news_images()
+
+    def eventFilter(self, obj, event):
+         """Догружает картинки новостей при изменении размера области прокрутки."""
+         if hasattr(self, 'news_scroll') and obj is self.news_scroll.viewport() and event.type() == QEvent.Resize:
+              QTimer.singleShot(0, self._request_visible_news_images)
+         return super().eventFilter(obj, event)
+
+
+    @tracing.traced()
     def _create_profiles_page(self):
         """Создает страницу 'Профили' (обновленный дизайн)."""
         page_wrapper = QWidget()
@@ -1207,6 +1506,7 @@ class NovaLauncher(QMainWindow): # Переименован класс
 
         return page_wrapper
 
+    @tracing.traced()
     def _create_settings_page(self):
         """Создает страницу 'Настройки' с вкладками."""
         page_wrapper = QWidget()
@@ -1284,10 +1584,65 @@ class NovaLauncher(QMainWindow): # Переименован класс
         self.close_on_launch_checkbox.setFont(self.get_font(12))
         self.close_on_launch_checkbox.setObjectName("styledCheckbox")
         launch_settings_layout.addWidget(self.close_on_launch_checkbox)
+        self.offline_mode_checkbox = QCheckBox("Офлайн-режим (не обращаться к сети)")
+        self.offline_mode_checkbox.setFont(self.get_font(12))
+        self.offline_mode_checkbox.setObjectName("styledCheckbox")
+        launch_settings_layout.addWidget(self.offline_mode_checkbox)
+        self.instant_page_switch_checkbox = QCheckBox("Переключать страницы без анимации")
+        self.instant_page_switch_checkbox.setFont(self.get_font(12))
+        self.instant_page_switch_checkbox.setObjectName("styledCheckbox")
+        launch_settings_layout.addWidget(self.instant_page_switch_checkbox)
+        self.idle_prefetch_checkbox = QCheckBox("Заранее скачивать новый релиз и недавние версии (в простое, не в лимитной сети)")
+        self.idle_prefetch_checkbox.setFont(self.get_font(12))
+        self.idle_prefetch_checkbox.setObjectName("styledCheckbox")
+        launch_settings_layout.addWidget(self.idle_prefetch_checkbox)
 
         launch_settings_layout.addStretch(1) # Растягиваем вверх
         tab_widget.addTab(launch_settings_widget, "Настройки Запуска")
 
+        # --- Вкладка: Загрузки (зеркало и раздача кэша) ---
+        downloads_widget = QWidget()
+        downloads_layout = QVBoxLayout(downloads_widget)
+        downloads_layout.setContentsMargins(20, 20, 20, 20)
+        downloads_layout.setSpacing(20)
+
+        mirror_title = QLabel("Зеркало")
+        mirror_title.setObjectName("settingsSectionTitle")
+        mirror_title.setFont(self.get_font(16, QFont.Bold))
+        downloads_layout.addWidget(mirror_title)
+        mirror_layout = QHBoxLayout()
+        mirror_label = QLabel("Адрес зеркала:")
+        mirror_label.setFont(self.get_font(12))
+        self.mirror_url_input = QLineEdit()
+        self.mirror_url_input.setFont(self.get_font(11))
+        self.mirror_url_input.setPlaceholderText("Напрямую с серверов Mojang (например, http://192.168.1.10:8770)")
+        mirror_layout.addWidget(mirror_label)
+        mirror_layout.addWidget(self.mirror_url_input, 1)
+        downloads_layout.addLayout(mirror_layout)
+
+        serve_title = QLabel("Раздача кэша")
+        serve_title.setObjectName("settingsSectionTitle")
+        serve_title.setFont(self.get_font(16, QFont.Bold))
+        downloads_layout.addWidget(serve_title)
+        self.serve_cache_checkbox = QCheckBox("Раздавать мой кэш другим лаунчерам в локальной сети")
+        self.serve_cache_checkbox.setFont(self.get_font(12))
+        self.serve_cache_checkbox.setObjectName("styledCheckbox")
+        downloads_layout.addWidget(self.serve_cache_checkbox)
+        serve_port_layout = QHBoxLayout()
+        serve_port_label = QLabel("Порт:")
+        serve_port_label.setFont(self.get_font(12))
+        self.serve_cache_port_input = QLineEdit()
+        self.serve_cache_port_input.setFont(self.get_font(11))
+        self.serve_cache_port_input.setFixedWidth(110)
+        self.serve_cache_port_input.setAlignment(Qt.AlignCenter)
+        serve_port_layout.addWidget(serve_port_label)
+        serve_port_layout.addWidget(self.serve_cache_port_input)
+        serve_port_layout.addStretch()
+        downloads_layout.addLayout(serve_port_layout)
+
+        downloads_layout.addStretch(1)
+        tab_widget.addTab(downloads_widget, "Загрузки")
+
         # --- Вкладка 2: Фильтры Версий ---
         version_filters_widget = QWidget()
         version_filters_layout = QVBoxLayout(version_filters_widget)
@@ -1330,6 +1685,84 @@ class NovaLauncher(QMainWindow): # Переименован класс
 
         return page_wrapper
 
+    @tracing.traced()
+    def _create_queue_page(self):
+        """Создает страницу 'Очередь установки'."""
+        page_wrapper = QWidget()
+        page_wrapper.setObjectName("queuePage")
+        inner_layout = QVBoxLayout(page_wrapper)
+        inner_layout.setContentsMargins(40, 40, 40, 40)
+        inner_layout.setSpacing(20)
+
+        title = QLabel("Очередь установки")
+        title.setObjectName("pageTitle")
+        title.setFont(self.get_font(24, QFont.Bold))
+        inner_layout.addWidget(title)
+
+        container_layout = QHBoxLayout()
+        container_layout.setSpacing(25)
+
+        def create_section_title(text):
+            label = QLabel(text)
+            label.setObjectName("queueSectionTitle")
+            label.setFont(self.get_font(14, QFont.Bold))
+            return label
+
+        def create_action_button(text, object_name, slot):
+            btn = QPushButton(text)
+            btn.setFont(self.get_font(11, QFont.Medium))
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.setObjectName(object_name)
+            btn.clicked.connect(slot)
+            return btn
+
+        # Левая часть: версии, которые можно поставить в очередь (несколько сразу)
+        versions_area = QVBoxLayout()
+        versions_area.setSpacing(10)
+        versions_area.addWidget(create_section_title("Версии"))
+        self.queue_versions_list = QListWidget()
+        self.queue_versions_list.setObjectName("queueVersionsList")
+        self.queue_versions_list.setFont(self.get_font(11))
+        self.queue_versions_list.setSelectionMode(QListWidget.ExtendedSelection)
+        self.queue_versions_list.itemDoubleClicked.connect(lambda item: self.add_versions_to_queue())
+        versions_area.addWidget(self.queue_versions_list)
+        versions_area.addWidget(create_action_button("Добавить в очередь", "actionButton", self.add_versions_to_queue))
+
+        # Правая часть: очередь, общий прогресс и управление
+        queue_area = QVBoxLayout()
+        queue_area.setSpacing(10)
+        queue_area.addWidget(create_section_title("Очередь"))
+        self.queue_list = QListWidget()
+        self.queue_list.setObjectName("queueList")
+        self.queue_list.setFont(self.get_font(11))
+        self.queue_list.setSelectionMode(QListWidget.ExtendedSelection)
+        queue_area.addWidget(self.queue_list)
+
+        self.queue_progress_bar = CustomProgressBar()
+        self.queue_progress_bar.setRange(0, 100)
+        self.queue_progress_bar.setAlignment(Qt.AlignCenter)
+        self.queue_progress_bar.setFixedHeight(24) # Выше, чем на главной: внутри подпись с общим прогрессом
+        queue_area.addWidget(self.queue_progress_bar)
+        self.queue_status_label = QLabel("")
+        self.queue_status_label.setObjectName("queueStatusLabel")
+        self.queue_status_label.setFont(self.get_font(10))
+        queue_area.addWidget(self.queue_status_label)
+
+        queue_buttons = QHBoxLayout()
+        queue_buttons.setSpacing(10)
+        queue_buttons.addWidget(create_action_button("Повторить неудачные", "actionButton", self.install_queue.retry_failed))
+        queue_buttons.addWidget(create_action_button("Очистить завершенные", "actionButton", self.install_queue.clear_finished))
+        queue_buttons.addWidget(create_action_button("Убрать", "deleteButton", self.remove_selected_from_queue))
+        queue_buttons.addWidget(create_action_button("Отменить все", "deleteButton", self.install_queue.cancel_all))
+        queue_area.addLayout(queue_buttons)
+
+        container_layout.addLayout(versions_area, 2)
+        container_layout.addLayout(queue_area, 3)
+        inner_layout.addLayout(container_layout)
+
+        self._fill_queue_versions()
+        return page_wrapper
+
     # --- Логика UI ---
 
     @Slot(QObject, str) # Принимаем QObject и путь (или None)
@@ -1354,76 +1787,47 @@ class NovaLauncher(QMainWindow): # Переименован класс
             # Оставляем текст-заглушку или можно установить иконку ошибки
             # widget.setIcon(QIcon(os.path.join(RESOURCES_DIR, "icon_error.png"))) # Пример
 
+    @tracing.traced()
     def change_page(self, index):
-        """Переключает страницы с анимацией плавного появления/исчезновения."""
+        """Переключает страницы с перекрестным затуханием (или мгновенно, если так настроено)."""
         current_index = self.content_stack.currentIndex()
         if index == current_index or not (0 <= index < self.content_stack.count()):
             return
 
-        # --- Очистка предыдущей анимации/эффекта --- 
-        active_anim = getattr(self, '_active_fade_animation', None)
-        if active_anim:
-            try:
-                if active_anim.state() == QPropertyAnimation.Running:
-                    active_anim.stop()
-            except RuntimeError:
-                pass # Объект уже мог быть удален
-            self._active_fade_animation = None # Всегда сбрасываем ссылку
-
-        active_effect = getattr(self, '_active_opacity_effect', None)
-        if active_effect:
-             try:
-                 # Находим виджет, к которому был применен эффект
-                 # parent() может быть None, если эффект не прикреплен
-                 widget_with_effect = active_effect.parent()
-                 if widget_with_effect and isinstance(widget_with_effect, QWidget):
-                      # Проверяем, что эффект на виджете все еще тот самый
-                      if widget_with_effect.graphicsEffect() == active_effect:
-                          widget_with_effect.setGraphicsEffect(None)
-             except RuntimeError:
-                 pass # Объект эффекта уже удален
-             # Не вызываем deleteLater() явно
-             self._active_opacity_effect = None # Всегда сбрасываем ссылку
-
-        # --- Настройка новой страницы --- 
-        next_widget = self.content_stack.widget(index)
-        next_widget.show()
-
-        next_opacity_effect = QGraphicsOpacityEffect(next_widget)
-        # Установка родителя для эффекта не обязательна, он привязывается к виджету
-        next_widget.setGraphicsEffect(next_opacity_effect)
-        next_opacity_effect.setOpacity(0.0)
-
-        # Указываем self как родителя, чтобы Qt мог управлять памятью
-        fade_in = QPropertyAnimation(next_opacity_effect, b"opacity", self)
-        fade_in.setDuration(300)
-        fade_in.setStartValue(0.0)
-        fade_in.setEndValue(1.0)
-        fade_in.setEasingCurve(QEasingCurve.InOutQuad)
-
-        # Сохраняем ссылки
-        self._active_opacity_effect = next_opacity_effect
-        self._active_fade_animation = fade_in
-
-        # Устанавливаем текущий индекс стека
-        self.content_stack.setCurrentIndex(index)
+        duration = self._page_transition_duration()
+        outgoing = None
+        if duration > 0 and self.content_stack.isVisible():
+            # Если предыдущий переход еще идет, уходим от текущего кадра оверлея
+            source = self.page_crossfade if self.page_crossfade.is_running() else self.content_stack.currentWidget()
+            outgoing = source.grab()
+        self.page_crossfade.finish()
+
+        next_widget = self._ensure_page(index)
+        if outgoing is not None:
+            # Новая страница еще скрыта: даем ей размер стека и снимаем один раз
+            next_widget.setGeometry(self.content_stack.rect())
+            if next_widget.layout():
+                next_widget.layout().activate()
+            self.page_crossfade.start(outgoing, next_widget.grab(), duration)
 
-        fade_in.finished.connect(self._on_fade_in_finished)
-        fade_in.start()
+        self.content_stack.setCurrentIndex(index)
+        if outgoing is not None:
+            self.page_crossfade.raise_()
 
         # Обновляем состояние кнопок сайдбара
-        buttons = [self.home_button, self.profiles_button, self.settings_button]
+        buttons = [self.home_button, self.profiles_button, self.settings_button, self.queue_button]
         for i, btn in enumerate(buttons):
             if hasattr(btn, 'setChecked'):
                 btn.setChecked(i == index)
 
-    def _on_fade_in_finished(self):
-        """Слот, вызываемый по завершении анимации проявления."""
-        # Просто сбрасываем ссылку на завершенную анимацию.
-        # Очистка эффекта произойдет при следующем вызове change_page.
-        # Проверяем, что атрибут существует перед присвоением None
-        if hasattr(self, '_active_fade_animation'):
-            self._active_fade_animation = None
+    def _page_transition_duration(self) -> int:
+        """Длительность перехода в мс; 0 - переключать мгновенно."""
+        if self.settings_manager.get("instant_page_switch"):
+            return 0
+        try:
+            return max(0, int(self.settings_manager.get("page_transition_ms")))
+        except (TypeError, ValueError):
+            return PAGE_TRANSITION_MS
 
     def add_profile(self):
         """Обрабатывает добавление нового профиля."""
@@ -1504,6 +1908,8 @@ class NovaLauncher(QMainWindow): # Переименован класс
 
     def on_profile_selected(self):
         """Обновляет UI при выборе профиля в списке."""
+        if not hasattr(self, 'profiles_list'):
+            return # Страница профилей еще не построена
         selected_items = self.profiles_list.selectedItems()
         is_selected = bool(selected_items)
         self.edit_profile_btn.setEnabled(is_selected)
@@ -1532,360 +1938,40 @@ class NovaLauncher(QMainWindow): # Переименован класс
         else:
              self.profile_widget.update_profile("Профиль не выбран", None)
 
+    @tracing.traced()
     def apply_styles(self):
-        """Применяет QSS стили к главному окну."""
-        primary = self.colors['primary']
-        secondary = self.colors['secondary']
-        accent_green = self.colors['accent_green']
-        accent_green_hover = self.colors['accent_green_hover']
-        bg_main = self.colors['background_main']
-        bg_sidebar = self.colors['background_sidebar']
-        surface = self.colors['surface']
-        surface_solid = self.colors['surface_solid']
-        surface_light = self.colors['surface_light']
-        text_color = self.colors['text']
-        text_light = self.colors['text_light']
-        border_color = self.colors['border']
-        red_color = self.colors['red']
-        red_hover = self.colors['red_hover']
-
-        # Convert potential pathlib paths to strings for os.path.join
-        checkmark_path = os.path.join(str(RESOURCES_DIR), "icon_checkmark.png").replace("\\", "/")
-        dropdown_path = os.path.join(str(RESOURCES_DIR), "icon_dropdown.png").replace("\\", "/")
-
-        self.setStyleSheet(f"""
-            /* --- Основное Окно --- */
-            QMainWindow {{
-                background-color: {bg_main};
-            }}
-            QWidget#main_widget {{ /* Конкретно к главному виджету */
-                background-color: {bg_main};
-            }}
-
-            /* --- Кастомная строка заголовка --- */
-            CustomTitleBar#customTitleBar {{
-                background-color: {bg_sidebar}; /* Темнее */
-                border-bottom: 1px solid {border_color};
-            }}
-            QLabel#titleBarLabel {{
-                color: {text_color};
-                font-size: 11pt;
-                padding-left: 5px;
-            }}
-            /* Кнопки управления окном */
-            QPushButton#_minimizeButton, QPushButton#_closeButton {{
-                background-color: transparent;
-                border: none;
-                color: {text_light}; /* Бледный текст */
-                font-family: "Marlett"; /* Шрифт для иконок */
-                font-size: 14pt;
-                padding: 0px 15px;
-                min-height: 30px; /* Убедимся, что высота достаточна */
-                max-width: 50px;
-            }}
-            QPushButton#_minimizeButton {{
-                 border-radius: 0px;
-            }}
-            QPushButton#_closeButton {{
-                 border-radius: 0px;
-            }}
-            QPushButton#_minimizeButton:hover {{
-                background-color: {surface_light};
-                color: {text_color};
-            }}
-            QPushButton#_closeButton:hover {{
-                background-color: {red_color}; /* Красный фон при наведении */
-                color: white;
-            }}
-
-             /* --- Сайдбар --- */
-            QWidget#sidebar {{
-                background-color: {bg_sidebar};
-                border-right: 1px solid {border_color};
-            }}
-            QPushButton[objectName^="_sidebar"] {{ /* Ко всем кнопкам сайдбара */
-                background-color: transparent;
-                border: none;
-                border-radius: 8px; /* Скругление */
-                padding: 5px;
-                margin: 0 5px; /* Небольшие отступы по бокам */
-                icon-size: 28px 28px; /* Явно задаем размер иконки */
-            }}
-            QPushButton[objectName^="_sidebar"]:hover {{
-                background-color: {surface_light};
-            }}
-            QPushButton[objectName^="_sidebar"]:checked {{
-                background-color: {primary}; /* Основной цвет для активной кнопки */
-            }}
-             /* --- Верхняя панель --- */
-            QWidget#topBar {{
-                 background-color: {bg_main};
-                 border-bottom: 1px solid {border_color};
-            }}
-            /* Виджет профиля */
-            QWidget#profileWidget {{
-                background: transparent;
-            }}
-            QLabel#profileTopIcon {{ /* Новое имя */
-                border-radius: 8px; /* Скругление для иконки */
-            }}
-            QLabel#profileUsername {{
-                color: {text_color};
-                font-weight: bold;
-            }}
-             QLabel#onlineLabel {{
-                  color: {text_light};
-                  font-size: 9pt;
-             }}
-
-            /* --- Стек контента --- */
-            QStackedWidget#contentStack {{
-                 background-color: transparent; /* Сам стек прозрачный */
-            }}
-
-             /* --- Страницы контента (Общий фон/стиль) --- */
-            QWidget#playPage, QWidget#profilesPage, QWidget#settingsPage {{
-                 background-color: {bg_main}; /* Фон для всех страниц */
-            }}
-
-            /* --- Элементы на странице Play --- */
-            QLabel#playPageTitle {{ color: {text_color}; }}
-            QLabel#playPageDesc {{ color: {text_light}; }}
-            QLabel#newsTitle {{ color: {text_color}; margin-bottom: 5px; }}
-            QLabel#playButtonStatus {{ color: {text_light}; font-size: 9pt; }}
-
-            /* Большая кнопка Играть */
-            QPushButton#playButtonLarge {{
-                 background-color: {accent_green};
-                 color: white; /* Белый текст на зеленом */
-                 border: none;
-                 border-radius: 8px;
-                 padding: 10px 20px;
-            }}
-            QPushButton#playButtonLarge:hover {{
-                 background-color: {accent_green_hover};
-            }}
-            QPushButton#playButtonLarge:disabled {{
-                 background-color: {surface_light};
-                 color: {text_light};
-            }}
-
-             /* Комбобокс выбора версии */
-            QComboBox#versionSelector {{
-                background-color: {surface_solid};
-                color: {text_color};
-                border: 1px solid {border_color};
-                border-radius: 5px;
-                padding: 8px 10px;
-                min-height: 30px; /* Минимальная высота */
-            }}
-            QComboBox#versionSelector::drop-down {{
-                 border: none;
-                 background: transparent;
-                 width: 20px;
-                 subcontrol-origin: padding;
-                 subcontrol-position: top right;
-                 padding-right: 5px;
-            }}
-            QComboBox#versionSelector::down-arrow {{
-                image: url({dropdown_path}); /* Путь к иконке */
-                width: 12px;
-                height: 12px;
-            }}
-            QComboBox QAbstractItemView {{ /* Выпадающий список */
-                 background-color: {surface_solid};
-                 border: 1px solid {primary};
-                 color: {text_color};
-                 selection-background-color: {primary};
-                 selection-color: white;
-                 outline: 0px; /* Убираем рамку выделения */
-                 padding: 5px;
-            }}
-
-             /* Карточка новости */
-            QWidget#newsCard {{
-                 background-color: {surface_solid};
-                 border-radius: 8px;
-                 border: 1px solid {border_color};
-                 /* transition: background-color 0.2s ease; Плавность при наведении */
-            }}
-            QWidget#newsCard:hover {{
-                 background-color: {surface_light};
-                 border: 1px solid {secondary};
-            }}
-            QLabel#newsCardImage {{
-                 border-top-left-radius: 8px;
-                 border-top-right-radius: 8px;
-                 background-color: {bg_main}; /* Фон под картинкой */
-            }}
-            QLabel#newsCardTitle {{ color: {text_color}; }}
-            QLabel#newsCardDesc {{ color: {text_light}; }}
-
-            /* --- Элементы на странице Профили --- */
-             QLabel#pageTitle {{ /* Общий стиль для заголовков страниц */
-                 color: {text_color};
-                 padding-bottom: 10px; /* Отступ снизу */
-            }}
-             QListWidget#profilesList {{
-                 background-color: {surface_solid};
-                 border: 1px solid {border_color};
-                 border-radius: 5px;
-                 color: {text_color};
-                 padding: 5px;
-                 outline: 0px; /* Убираем рамку выделения */
-             }}
-             QListWidget#profilesList::item {{
-                 padding: 8px 10px;
-                 border-radius: 3px; /* Небольшое скругление элемента */
-             }}
-             QListWidget#profilesList::item:selected {{
-                 background-color: {primary};
-                 color: white;
-             }}
-             QListWidget#profilesList::item:hover {{
-                 background-color: {surface_light};
-             }}
-
-            /* --- Общие кнопки действий (Добавить, Редактировать, Обзор...) --- */
-            QPushButton#actionButton {{
-                background-color: {primary};
-                color: white;
-                border: none;
-                padding: 10px 15px;
-                border-radius: 5px;
-                min-height: 30px;
-            }}
-            QPushButton#actionButton:hover {{
-                background-color: {secondary};
-            }}
-             QPushButton#actionButton:disabled {{
-                 background-color: {surface_light};
-                 color: {text_light};
-             }}
-
-            /* Кнопка Удалить */
-            QPushButton#deleteButton {{
-                 background-color: {red_color};
-                 color: white;
-                 border: none;
-                 padding: 10px 15px;
-                 border-radius: 5px;
-                 min-height: 30px;
-            }}
-            QPushButton#deleteButton:hover {{
-                 background-color: {red_hover};
-            }}
-            QPushButton#deleteButton:disabled {{
-                 background-color: {surface_light};
-                 color: {text_light};
-             }}
+        """Применяет тему: QSS компилируется один раз (или берется из кэша) и ставится по областям."""
+        self._apply_theme()
+        print("Стили интерфейса применены.")
 
-            /* --- Элементы на странице Настройки --- */
-             QLabel#settingsSectionTitle {{
-                  color: {primary};
-                  font-size: 14pt; /* Крупнее */
-                  border-bottom: 1px solid {border_color};
-                  padding-bottom: 5px;
-                  margin-bottom: 10px;
-             }}
-             QTabWidget#settingsTabWidget::pane {{ /* Область вкладки */
-                 border: 1px solid {border_color};
-                 border-top: none; /* Верхняя граница рисуется табами */
-                 border-radius: 0 0 5px 5px;
-                 background-color: {surface_solid};
-                 padding: 15px;
-             }}
-             QTabBar::tab {{
-                 background: {surface_light};
-                 color: {text_light};
-                 border: 1px solid {border_color};
-                 border-bottom: none;
-                 border-top-left-radius: 5px;
-                 border-top-right-radius: 5px;
-                 padding: 10px 20px;
-                 margin-right: 2px;
-             }}
-             QTabBar::tab:selected {{
-                 background: {surface_solid}; /* Цвет фона вкладки */
-                 color: {text_color};
-                 border: 1px solid {border_color};
-                 border-bottom: 1px solid {surface_solid}; /* Соединяем с pane */
-             }}
-             QTabBar::tab:hover {{
-                 background: {surface}; /* Темнее при наведении */
-                 color: {text_color};
-             }}
-             /* Поля ввода и чекбоксы на странице настроек */
-             QWidget#settingsPage QLineEdit {{
-                 background: rgba(255, 255, 255, 0.05);
-                 border: 1px solid rgba(255, 255, 255, 0.1);
-                 border-radius: 5px;
-                 padding: 8px 10px;
-                 color: {text_color};
-                 selection-background-color: {primary};
-             }}
-             QWidget#settingsPage QLineEdit:focus {{
-                 border: 1px solid {primary};
-                 background: rgba(255, 255, 255, 0.08);
-             }}
-             QWidget#settingsPage QLabel {{
-                 color: {text_light}; /* Светло-серый для подписей */
-                 background: transparent; /* Прозрачный фон */
-             }}
-             QWidget#settingsPage QCheckBox#styledCheckbox {{
-                 color: {text_color};
-                 spacing: 8px; /* Отступ между галочкой и текстом */
-             }}
-             QWidget#settingsPage QCheckBox#styledCheckbox::indicator {{
-                 width: 16px;
-                 height: 16px;
-                 border: 1px solid {border_color};
-                 border-radius: 3px;
-                 background-color: rgba(255, 255, 255, 0.05);
-             }}
-             QWidget#settingsPage QCheckBox#styledCheckbox::indicator:checked {{
-                 background-color: {primary};
-                 border: 1px solid {primary};
-                 image: url({checkmark_path});
-             }}
-             QWidget#settingsPage QCheckBox#styledCheckbox::indicator:hover {{
-                 border: 1px solid {secondary};
-             }}
-              /* Кнопка Сохранить */
-             QPushButton#saveButton {{
-                  background-color: {accent_green};
-                  color: white;
-                  border: none;
-                  border-radius: 5px;
-                  padding: 12px 30px;
-             }}
-             QPushButton#saveButton:hover {{
-                  background-color: {accent_green_hover};
-             }}
+    def _theme_targets(self) -> dict:
+        """Область темы -> виджет, которому ставится ее таблица стилей (None - еще не построен)."""
+        return {
+            "window": self,
+            # Play строится вместе с окном; отдельная таблица на странице меняет
+            # наследование шрифтов у подписей, поэтому ее правила живут в таблице окна
+            "play": self,
+            "profiles": self.profiles_page,
+            "settings": self.settings_page,
+            "queue": self.queue_page,
+        }
 
-             /* --- Прогресс-бар --- */
-             CustomProgressBar {{
-                 background-color: {surface_solid};
-                 border: 1px solid {border_color};
-                 border-radius: 6px;
-                 text-align: center;
-                 color: {text_color};
-                 font-size: 8pt; /* Мельче шрифт */
-             }}
-             CustomProgressBar::chunk {{
-                 background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {primary}, stop:1 {secondary});
-                 border-radius: 5px;
-                 margin: 1px; /* Отступ для рамки */
-             }}
-             QToolTip {{
-                 background-color: {surface_solid};
-                 color: {text_color};
-                 border: 1px solid {border_color};
-                 padding: 5px;
-                 border-radius: 3px;
-             }}
-        """)
-        print("Стили интерфейса применены.")
+    def _apply_theme(self):
+        """Ставит таблицы стилей только тем виджетам, у чьих областей они изменились."""
+        sheets = self.theme_engine.compile(self.theme)
+        targets = self._theme_targets()
+        changed = ThemeEngine.changed_scopes(self._applied_sheets, sheets)
+        for widget in {id(targets[scope]): targets[scope] for scope in changed if targets.get(scope) is not None}.values():
+            scopes = [scope for scope in sheets if targets.get(scope) is widget]
+            widget.setStyleSheet("\n".join(sheets[scope] for scope in scopes))
+            for scope in scopes:
+                self._applied_sheets[scope] = sheets[scope]
+
+    def set_theme_colors(self, **changes):
+        """Меняет цвета темы на лету: перестилизуются только затронутые области."""
+        self.colors.update(changes)
+        self.theme = self.theme.with_palette(**changes)
+        self._apply_theme()
 
     # --- Управление настройками (Восстановленные методы) ---
 
@@ -1899,6 +1985,7 @@ class NovaLauncher(QMainWindow): # Переименован класс
         if filepath:
             self.java_path_input.setText(filepath)
 
+    @tracing.traced()
     def load_settings_to_ui(self):
         """Загружает сохраненные настройки в элементы UI на странице настроек."""
         try:
@@ -1911,6 +1998,18 @@ class NovaLauncher(QMainWindow): # Переименован класс
                 self.max_memory_input.setText(str(self.settings_manager.get("max_memory_mb")))
             if hasattr(self, 'close_on_launch_checkbox'):
                 self.close_on_launch_checkbox.setChecked(self.settings_manager.get("close_on_launch"))
+            if hasattr(self, 'offline_mode_checkbox'):
+                self.offline_mode_checkbox.setChecked(self.settings_manager.get("offline_mode"))
+            if hasattr(self, 'instant_page_switch_checkbox'):
+                self.instant_page_switch_checkbox.setChecked(self.settings_manager.get("instant_page_switch"))
+            if hasattr(self, 'idle_prefetch_checkbox'):
+                self.idle_prefetch_checkbox.setChecked(self.settings_manager.get("idle_prefetch"))
+            if hasattr(self, 'mirror_url_input'):
+                self.mirror_url_input.setText(self.settings_manager.get("mirror_url"))
+            if hasattr(self, 'serve_cache_checkbox'):
+                self.serve_cache_checkbox.setChecked(self.settings_manager.get("serve_cache"))
+            if hasattr(self, 'serve_cache_port_input'):
+                self.serve_cache_port_input.setText(str(self.settings_manager.get("serve_cache_port")))
 
             # Загрузка настроек фильтров версий
             if hasattr(self, 'show_releases_checkbox'):
@@ -1947,12 +2046,36 @@ class NovaLauncher(QMainWindow): # Переименован класс
         except ValueError:
             QMessageBox.warning(self, "Ошибка ввода", "Неверный формат памяти. Пожалуйста, введите целые числа.")
             return
+        port_str = self.serve_cache_port_input.text().strip()
+        try:
+            serve_port = int(port_str) if port_str else SettingsManager.DEFAULT_SETTINGS["serve_cache_port"]
+            if not 1 <= serve_port <= 65535:
+                raise ValueError(port_str)
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка ввода", "Неверный порт раздачи кэша. Введите число от 1 до 65535.")
+            return
 
         # Сохраняем основные настройки
         self.settings_manager.set("java_path", self.java_path_input.text().strip())
+        self.install_queue.java_path = self.prefetcher.java_path = self.settings_manager.get("java_path") or None
         self.settings_manager.set("min_memory_mb", min_mem)
         self.settings_manager.set("max_memory_mb", max_mem)
         self.settings_manager.set("close_on_launch", self.close_on_launch_checkbox.isChecked())
+        self.settings_manager.set("offline_mode", self.offline_mode_checkbox.isChecked())
+        get_monitor().set_forced_offline(self.offline_mode_checkbox.isChecked())
+        self.settings_manager.set("instant_page_switch", self.instant_page_switch_checkbox.isChecked())
+        self.settings_manager.set("idle_prefetch", self.idle_prefetch_checkbox.isChecked())
+        if not self.settings_manager.get("idle_prefetch"):
+            self.prefetcher.cancel()
+        mirror = self.mirror_url_input.text().strip()
+        if mirror != self.settings_manager.get("mirror_url"):
+            self.settings_manager.set("mirror_url", mirror)
+            self._configure_network()
+        self.settings_manager.set("serve_cache", self.serve_cache_checkbox.isChecked())
+        self.settings_manager.set("serve_cache_port", serve_port)
+        self.serve_cache_port_input.setText(str(serve_port))
+        self._update_cache_server()
+        self._update_online_label(get_monitor().online)
 
         # Сохраняем настройки фильтров версий
         self.settings_manager.set("show_releases", self.show_releases_checkbox.isChecked())
@@ -1993,18 +2116,7 @@ class NovaLauncher(QMainWindow): # Переименован класс
              QMessageBox.warning(self, "Ошибка", "Пожалуйста, выберите версию Minecraft.")
              return
 
-        min_mem = profile.get("min_memory_override", self.settings_manager.get("min_memory_mb"))
-        max_mem = profile.get("max_memory_override", self.settings_manager.get("max_memory_mb"))
-
-        # --- Валидация и установка значений памяти по умолчанию --- 
-        if not isinstance(min_mem, int) or min_mem < 512:
-            print(f"Предупреждение: Некорректное значение min_mem ({min_mem}), используется значение по умолчанию.")
-            min_mem = SettingsManager.DEFAULT_SETTINGS["min_memory_mb"]
-        
-        if not isinstance(max_mem, int) or max_mem < min_mem:
-            print(f"Предупреждение: Некорректное значение max_mem ({max_mem}), используется значение по умолчанию или min_mem.")
-            default_max = SettingsManager.DEFAULT_SETTINGS["max_memory_mb"]
-            max_mem = max(min_mem, default_max) # Гарантируем, что max_mem не меньше min_mem
+        min_mem, max_mem = self.settings_manager.memory_limits(profile)
 
         java_path = self.settings_manager.get("java_path") or None
 
@@ -2018,17 +2130,46 @@ class NovaLauncher(QMainWindow): # Переименован класс
         self.launch_options = {
             "username": profile["username"], "version": version,
             "min_memory": min_mem, "max_memory": max_mem
-            # Убираем java_path отсюда, он будет определен в потоке
+            # Убираем java_path отсюда, он будет определен в задаче установки
         }
 
-        # Запускаем поток (передаем пользовательский путь, если он есть)
+        self.profile_manager.mark_launched(selected_uuid, version) # Недавние версии - кандидаты на предзагрузку
+        self.prefetcher.cancel() # Сеть - установке, которую ждет пользователь
+
+        # Ставим установку в планировщик (передаем пользовательский путь, если он есть)
+        from core import installer
         user_java_path = self.settings_manager.get("java_path") or None
-        self.installer_thread = MinecraftVersionInstaller(version, self.minecraft_directory, user_java_path) # Будет добавлено позже
-        self.installer_thread.progress.connect(self.update_progress)
-        # Передаем определенный Java путь в start_game_process при завершении
-        self.installer_thread.finished.connect(lambda: self.start_game_process(self.installer_thread.final_java_path))
-        self.installer_thread.error.connect(self.show_launch_error)
-        self.installer_thread.start()
+        print(f"Установка: Version={version}, Dir={self.minecraft_directory}, Java={user_java_path}")
+        watcher = JobWatcher(self)
+        watcher.progress.connect(self.update_progress)
+        # Определенный путь к Java передается в start_game_process при завершении
+        watcher.succeeded.connect(self.start_game_process)
+        watcher.failed.connect(self._on_install_failed)
+        watcher.cancelled.connect(self._on_install_cancelled)
+        # Если версия уже ставится из очереди, присоединяемся к той установке (со своим прогрессом и отменой)
+        self.install_job = watcher.watch(installer.submit_install(
+            version, self.minecraft_directory, user_java_path, installer_callback(watcher), PRIORITY_HIGH
+        ))
+        self.cancel_install_button.setEnabled(True)
+        self.cancel_install_button.setText("Отменить")
+        self.cancel_install_button.setVisible(True)
+
+    def cancel_install(self):
+        """Останавливает установку: уже скачанное сохраняется и докачивается при следующем запуске."""
+        if self.install_job is None or self.install_job.done():
+            return
+        self.cancel_install_button.setEnabled(False)
+        self.cancel_install_button.setText("Отмена...")
+        self.install_job.cancel()
+
+    def _on_install_failed(self, error: Exception):
+        print("Ошибка установки:")
+        traceback.print_exception(error)
+        self.show_launch_error(f"{error}")
+
+    def _on_install_cancelled(self):
+        print("Установка отменена пользователем.")
+        self._reset_launch_ui()
 
     def update_progress(self, value: int, status: str):
         """Обновляет прогресс-бар."""
@@ -2051,6 +2192,7 @@ class NovaLauncher(QMainWindow): # Переименован класс
         self._game_process_started = True
         # --- Конец блока предотвращения --- 
 
+        self.cancel_install_button.setVisible(False) # Установка уже закончилась
         self.progress_bar.setRange(0, 0)
         self.progress_bar.setFormat("Запуск Minecraft...")
         QApplication.processEvents()
@@ -2064,22 +2206,33 @@ class NovaLauncher(QMainWindow): # Переименован класс
         print(f"Ошибка запуска: {error_message}")
         QMessageBox.critical(self, "Ошибка запуска", f"Не удалось запустить Minecraft:\n\n{error_message}")
 
+        self._reset_launch_ui()
+
+    def _reset_launch_ui(self):
+        """Возвращает кнопку запуска и прогресс-бар в исходное состояние."""
         # Сбрасываем флаг, чтобы можно было попробовать запустить снова
         self._game_process_started = False
 
         # Восстанавливаем состояние кнопки и прогресс-бара
+        if hasattr(self, 'cancel_install_button'):
+            self.cancel_install_button.setVisible(False)
         if hasattr(self, 'launch_button'):
-        self.launch_button.setEnabled(True)
+            self.launch_button.setEnabled(True)
             self.launch_button.setText("ЗАПУСТИТЬ") # Возвращаем исходный текст
         if hasattr(self, 'progress_bar'):
-        self.progress_bar.setVisible(False)
+            self.progress_bar.setVisible(False)
             self.progress_bar.setFormat("") # Сбрасываем текст
         QApplication.processEvents()
 
+    @tracing.traced()
     def load_profiles_to_ui(self):
         """Загружает профили в список на странице профилей."""
         if not hasattr(self, 'profiles_list'):
-            print("Ошибка: profiles_list не инициализирован")
+            # Страница профилей еще не построена - только выбираем профиль по умолчанию
+            profiles = self.profile_manager.get_all_profiles()
+            if not self.settings_manager.get("selected_profile_uuid") and profiles:
+                self.settings_manager.set("selected_profile_uuid", next(iter(profiles)))
+                self.update_profile_widget()
             return
 
         self.profiles_list.clear()
@@ -2169,127 +2322,284 @@ class NovaLauncher(QMainWindow): # Переименован класс
         
         return (type_priority, version_numbers)
 
+    @tracing.traced()
     def load_minecraft_versions(self):
-        """Загружает версии Minecraft в QComboBox с учетом фильтров и сортировкой."""
+        """
+        Обновляет список версий в QComboBox. Установленные версии и манифест
+        читаются в фоновом потоке; уже полученные данные сразу перефильтровываются
+        (например, после смены фильтров), а показанный список остается на месте до сверки.
+        """
         if not hasattr(self, 'version_selector'):
             return
+        if self._version_sources is not None:
+            self._on_versions_loaded(*self._version_sources) # Фильтры могли измениться - применяем сразу
+        elif self._version_entries is None:
+            self.version_selector.clear()
+            self.version_selector.addItem("Загрузка версий...")
+            self.version_selector.setEnabled(False)
+            self.launch_button.setEnabled(False)
 
-        current_selected_data = self.version_selector.currentData()
-        self.version_selector.clear()
-        self.version_selector.setEnabled(True)
-        self.launch_button.setEnabled(True)
+        if self._version_job is not None:
+            self._versions_reload_pending = True # Перечитаем, когда текущая задача закончит
+            return
+        from core.versions import load_version_sources
+        watcher = JobWatcher(self)
+        watcher.succeeded.connect(lambda sources: self._on_versions_loaded(*sources))
+        watcher.failed.connect(self._on_versions_failed)
+        watcher.finished.connect(self._on_version_job_finished)
+        self._version_job = watcher.watch(get_scheduler().submit(load_version_sources, self.minecraft_directory, key="version-list"))
+
+    def _on_version_job_finished(self):
+        self._version_job = None
+        if self._versions_reload_pending:
+            self._versions_reload_pending = False
+            self.load_minecraft_versions()
+
+    def _version_filters(self) -> dict:
+        return {key: bool(self.settings_manager.get(key)) for key in ("show_releases", "show_snapshots", "show_betas", "show_alphas")}
+
+    @Slot(list, list)
+    def _on_versions_loaded(self, installed_versions: list, available_versions: list):
+        """Фильтрует и сортирует свежий список версий и сверяет его с показанным."""
+        self._version_sources = (installed_versions, available_versions)
+        if self.settings_manager.get("idle_prefetch") and not self._prefetch_timer.isActive():
+            self._prefetch_timer.start() # Последний релиз известен - можно ждать простоя
 
         # --- Загрузка настроек фильтров ---
-        show_releases = self.settings_manager.get("show_releases")
-        show_snapshots = self.settings_manager.get("show_snapshots")
-        show_betas = self.settings_manager.get("show_betas")
-        show_alphas = self.settings_manager.get("show_alphas")
-
-        all_versions_data_dict = {} # Словарь для хранения всех версий {id: {name, type}}
-        self.installed_version_ids = set()
+        filters = self._version_filters()
+        shown_types = {
+            "release": filters["show_releases"],
+            "snapshot": filters["show_snapshots"],
+            "old_beta": filters["show_betas"],
+            "old_alpha": filters["show_alphas"],
+        }
 
-        try:
-            # 1. Получаем установленные версии
-            installed_versions_info = minecraft_launcher_lib.utils.get_installed_versions(self.minecraft_directory)
-            for v_info in installed_versions_info:
-                version_id = v_info['id']
-                version_type = v_info.get('type', 'release')
-                self.installed_version_ids.add(version_id)
-                if version_id not in all_versions_data_dict:
-                    formatted_name = self._format_version_name(version_id, version_type, True)
-                    all_versions_data_dict[version_id] = {
-                        "name": formatted_name,
-                        "type": version_type,
-                        "installed": True # Добавляем флаг, что версия установлена
-                    }
-
-            # 2. Получаем список всех доступных версий
-            all_versions_list = minecraft_launcher_lib.utils.get_version_list()
-            for v_info in all_versions_list:
-                     version_id = v_info["id"]
-                version_type = v_info.get("type") # Может быть None
-                # Добавляем, только если еще не добавили из установленных
-                if version_id not in all_versions_data_dict:
-                    is_installed = version_id in self.installed_version_ids # Это будет False здесь
-                    formatted_name = self._format_version_name(version_id, version_type, is_installed)
-                    all_versions_data_dict[version_id] = {
-                        "name": formatted_name,
-                        "type": version_type,
-                        "installed": is_installed
-                    }
-
-            # --- 3. Фильтруем версии ---
-            filtered_versions = {}
-            for version_id, data in all_versions_data_dict.items():
-                v_type = data.get("type")
-                should_show = False
-                if v_type == "release" and show_releases:
-                    should_show = True
-                elif v_type == "snapshot" and show_snapshots:
-                    should_show = True
-                elif v_type == "old_beta" and show_betas:
-                    should_show = True
-                elif v_type == "old_alpha" and show_alphas:
-                    should_show = True
-                # Всегда показывать установленные версии, если они не подпадают под активные фильтры?
-                # Решение: Если версия установлена, но ее тип отключен, все равно показываем,
-                # но можно добавить пометку или изменить стиль. Пока просто показываем.
-                # if data.get("installed"): # Раскомментируйте, если хотите всегда показывать установленные
-                #     should_show = True
-
-                if should_show:
-                    filtered_versions[version_id] = data
-
-            # --- 4. Сортируем отфильтрованные версии (от новых к старым) ---
-            # Теперь сортируем filtered_versions
-            sorted_versions = sorted(
-                filtered_versions.items(),
-                key=lambda item: self._version_sort_key(item[0], item[1].get("type", "unknown")),
-                reverse=True  # От новых к старым
-            )
+        all_versions_data_dict = {} # Словарь для хранения всех версий {id: {type, installed}}
+        # 1. Установленные версии
+        self.installed_version_ids = {version_id for version_id, _ in installed_versions}
+        for version_id, version_type in installed_versions:
+            all_versions_data_dict.setdefault(version_id, {"type": version_type, "installed": True})
+        # 2. Все доступные версии (добавляем, только если еще не добавили из установленных)
+        for version_id, version_type in available_versions:
+            all_versions_data_dict.setdefault(version_id, {"type": version_type, "installed": version_id in self.installed_version_ids})
+
+        # --- 3. Фильтруем версии ---
+        # Установленные версии отключенного типа не показываем (как и раньше)
+        filtered_versions = {version_id: data for version_id, data in all_versions_data_dict.items()
+                             if shown_types.get(data.get("type"), False)}
+
+        # --- 4. Сортируем отфильтрованные версии (от новых к старым) ---
+        sorted_versions = sorted(
+            filtered_versions.items(),
+            key=lambda item: self._version_sort_key(item[0], item[1].get("type", "unknown")),
+            reverse=True  # От новых к старым
+        )
+        entries = [[version_id, data["type"], data["installed"]] for version_id, data in sorted_versions]
 
-            # --- 5. Добавляем отсортированные и отфильтрованные версии в комбобокс ---
-            for version_id, version_data in sorted_versions:
-                # Переформатируем имя на случай, если показ установленных версий как-то изменился
-                display_name = self._format_version_name(version_id, version_data["type"], version_data["installed"])
-                self.version_selector.addItem(display_name, userData=version_id)
+        if entries == self._version_entries:
+            return # Показанный список (например, из снимка) уже актуален
+        self._show_versions(entries, self.version_selector.currentData() if self._version_entries else None)
 
-            # --- 6. Выбираем версию ---
-            if self.version_selector.count() > 0:
-                initial_index = -1
+    def _show_versions(self, entries: list, preferred_version: str | None):
+        """Заполняет QComboBox списком [id, тип, установлена] и выбирает версию."""
+        self.version_selector.clear()
+        self._version_entries = entries
+        self._fill_queue_versions()
+        if not entries:
+            self.version_selector.addItem("Нет версий (проверьте фильтры)")
+            self.version_selector.setEnabled(False)
+            self.launch_button.setEnabled(False)
+            return
+        self.version_selector.setEnabled(True)
+        self.launch_button.setEnabled(True)
 
-                # Пробуем восстановить предыдущий выбор
-                if current_selected_data:
-                     initial_index = self.version_selector.findData(current_selected_data)
+        # --- 5. Добавляем отсортированные и отфильтрованные версии в комбобокс ---
+        for version_id, version_type, installed in entries:
+            display_name = self._format_version_name(version_id, version_type, installed)
+            self.version_selector.addItem(display_name, userData=version_id)
+
+        # --- 6. Выбираем версию ---
+        # Предыдущий выбор -> версия по умолчанию -> первая (самая новая)
+        initial_index = self.version_selector.findData(preferred_version) if preferred_version else -1
+        if initial_index == -1:
+            initial_index = self.version_selector.findData(MINECRAFT_VERSION)
+        if initial_index == -1:
+            initial_index = 0
+        self.version_selector.setCurrentIndex(initial_index)
+
+    @Slot(object)
+    def _on_versions_failed(self, error: Exception):
+        import requests
+        message = str(error)
+        network_error = isinstance(error, requests.exceptions.RequestException)
+        if not network_error:
+            traceback.print_exception(error)
+        if self._version_entries is not None:
+            print(f"Список версий не обновлен ({message}), оставлен показанный.")
+            return
+        print(f"{'Сетевая ошибка' if network_error else 'Ошибка'} при получении списка версий: {message}")
+        self.version_selector.clear()
+        self.version_selector.addItem("Ошибка сети (версии)" if network_error else "Ошибка загрузки версий")
+        self.version_selector.setEnabled(False)
+        self.launch_button.setEnabled(False)
 
-                # Если не удалось, пробуем найти версию по умолчанию
-                if initial_index == -1:
-                   initial_index = self.version_selector.findData(MINECRAFT_VERSION)
+    # --- Очередь установки ---
 
-                # Если и это не удалось, берем первую версию (самую новую из отфильтрованного списка)
-                if initial_index == -1:
-                   initial_index = 0
+    def _fill_queue_versions(self):
+        """Список версий на странице очереди - те же версии, что и в выборе на главной."""
+        if not hasattr(self, 'queue_versions_list'):
+            return
+        selected = {item.data(Qt.UserRole) for item in self.queue_versions_list.selectedItems()}
+        self.queue_versions_list.clear()
+        for version_id, version_type, installed in self._version_entries or []:
+            text = f"{version_id}  (установлена)" if installed else version_id
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, version_id)
+            self.queue_versions_list.addItem(item)
+            item.setSelected(version_id in selected)
+
+    def add_versions_to_queue(self):
+        """Ставит выбранные версии в очередь установки одним действием."""
+        versions = [self.queue_versions_list.item(i).data(Qt.UserRole) for i in range(self.queue_versions_list.count())
+                    if self.queue_versions_list.item(i).isSelected()] # В порядке списка, а не выделения
+        if not versions:
+            QMessageBox.information(self, "Очередь установки", "Выберите одну или несколько версий.")
+            return
+        self.prefetcher.cancel()
+        added = self.install_queue.add(versions)
+        print(f"Очередь установки: добавлено {len(added)} из {len(versions)} версий")
+        self.install_queue.start()
+        self.queue_versions_list.clearSelection()
+
+    def remove_selected_from_queue(self):
+        for item in self.queue_list.selectedItems():
+            self.install_queue.remove(item.data(Qt.UserRole))
+
+    @Slot()
+    def _on_install_queue_changed(self):
+        """Изменения очереди приходят часто - перерисовываем страницу не чаще INSTALL_QUEUE_REFRESH_MS."""
+        if not self._queue_refresh_timer.isActive():
+            self._queue_refresh_timer.start()
+
+    def _refresh_queue_page(self):
+        """Обновляет строки очереди, общий прогресс и скорость загрузки."""
+        entries = self.install_queue.entries()
+        done_count = sum(1 for entry in entries if entry.status == STATUS_DONE)
+        if done_count > self._queue_done_count:
+            self.load_minecraft_versions() # Появились установленные версии
+        self._queue_done_count = done_count
+        active = self.install_queue.has_active()
+        if active:
+            self._queue_refresh_timer.start() # Пока идет установка, скорость обновляется и без событий
+        if not hasattr(self, 'queue_list'):
+            return
 
-                     self.version_selector.setCurrentIndex(initial_index)
+        # Строки переиспользуем, чтобы не сбрасывать выделение и прокрутку
+        if [self.queue_list.item(i).data(Qt.UserRole) for i in range(self.queue_list.count())] != [e.version for e in entries]:
+            self.queue_list.clear()
+            for entry in entries:
+                item = QListWidgetItem()
+                item.setData(Qt.UserRole, entry.version)
+                self.queue_list.addItem(item)
+        for i, entry in enumerate(entries):
+            text = f"{entry.version} - {QUEUE_STATUS_TEXT.get(entry.status, entry.status)}"
+            if entry.status == STATUS_INSTALLING:
+                text += f": {entry.stage} ({entry.percent}%)" if entry.stage else f" ({entry.percent}%)"
+            elif entry.status == STATUS_FAILED and entry.error:
+                text += f": {entry.error}"
+            item = self.queue_list.item(i)
+            item.setText(text)
+            item.setToolTip(entry.error or "")
+
+        percent, done, total = self.install_queue.overall_progress()
+        self.queue_progress_bar.setValue(percent)
+        self.queue_progress_bar.setFormat(f"Установлено {done} из {total} ({percent}%)" if total else "Очередь пуста")
+
+        # Скорость - по всем загрузкам лаунчера (общие файлы версий качаются один раз)
+        from core.http import get_client
+        now, received = time.monotonic(), get_client().received_bytes()
+        status = ""
+        if active and self._queue_speed_sample is not None and now > self._queue_speed_sample[0]:
+            speed = (received - self._queue_speed_sample[1]) / (now - self._queue_speed_sample[0])
+            status = f"Скорость загрузки: {speed / (1024 * 1024):.1f} МБ/с"
+        self._queue_speed_sample = (now, received) if active else None
+        self.queue_status_label.setText(status)
+
+    # --- Предзагрузка в простое ---
+
+    def _launcher_busy(self) -> bool:
+        """Идет установка, запуск игры или очередь установки - предзагрузка не нужна."""
+        return (self.install_job is not None and not self.install_job.done()) \
+            or getattr(self, '_game_process_started', False) or self.install_queue.has_active()
+
+    def _is_metered_connection(self) -> bool:
+        """Лимитное подключение (мобильный интернет, точка доступа) по данным ОС; если ОС не сообщает - False."""
+        if self._network_information is None:
+            from PySide6.QtNetwork import QNetworkInformation
+            if not QNetworkInformation.loadDefaultBackend() or QNetworkInformation.instance() is None:
+                self._network_information = False
             else:
-                self.version_selector.addItem("Нет версий (проверьте фильтры)")
-                 self.version_selector.setEnabled(False)
-                 self.launch_button.setEnabled(False)
-
-        except requests.exceptions.RequestException as e:
-            print(f"Сетевая ошибка при получении списка версий: {e}")
-             self.version_selector.addItem("Ошибка сети (версии)")
-             self.version_selector.setEnabled(False)
-             self.launch_button.setEnabled(False)
-        except Exception as e:
-            print(f"Ошибка при получении списка версий: {e}")
-            traceback.print_exc()
-            self.version_selector.addItem("Ошибка загрузки версий")
-            self.version_selector.setEnabled(False)
-            self.launch_button.setEnabled(False)
+                information = QNetworkInformation.instance()
+                supported = information.supports(QNetworkInformation.Feature.Metered)
+                self._network_information = information if supported else False
+                print(f"Сеть: {information.backendName()}, признак лимитного подключения {'есть' if supported else 'недоступен'}")
+        return bool(self._network_information) and self._network_information.isMetered()
+
+    def _maybe_prefetch(self):
+        """По таймеру: если лаунчер простаивает и сеть безлимитная, докачиваем вероятные версии."""
+        if not self.settings_manager.get("idle_prefetch"):
+            self._prefetch_timer.stop()
+            return
+        if self.prefetcher.running or self._launcher_busy() or get_monitor().online is not True:
+            return
+        if self._is_metered_connection():
+            return
+        watcher = JobWatcher(self)
+        watcher.succeeded.connect(self._on_prefetch_finished)
+        watcher.watch(self.prefetcher.start(self.profile_manager.get_all_profiles()))
+
+    def _on_prefetch_finished(self, versions: list):
+        if versions:
+            print(f"Предзагрузка завершена: {', '.join(versions)}")
+            self.load_minecraft_versions() # Докачанные версии теперь установлены
+
+    # --- Снимок интерфейса (теплый старт) ---
+
+    def restore_ui_snapshot(self) -> bool:
+        """Сразу показывает список версий из снимка прошлого запуска (если фильтры не менялись)."""
+        snapshot = ui_snapshot.load(UI_SNAPSHOT_FILE)
+        if not snapshot or snapshot.get("filters") != self._version_filters() or not hasattr(self, 'version_selector'):
+            return False
+        entries = snapshot.get("versions")
+        if not isinstance(entries, list) or not entries:
+            return False
+        # Снимок - всего лишь кэш: запись не того вида означает "снимка нет", а не ошибку запуска
+        for entry in entries:
+            if not (isinstance(entry, list) and len(entry) == 3 and isinstance(entry[0], str)
+                    and isinstance(entry[1], str) and isinstance(entry[2], bool)):
+                print(f"Снимок интерфейса '{UI_SNAPSHOT_FILE}' поврежден, список версий загружается заново.")
+                return False
+        selected = snapshot.get("selected_version")
+        self._show_versions([list(entry) for entry in entries], selected if isinstance(selected, str) else None)
+        print(f"Теплый старт: {len(entries)} версий из снимка от {snapshot.get('saved')}")
+        return True
 
-        # Обновляем состояние кнопок установки модов после загрузки версий
-        # self._update_mod_install_buttons_state() # Убрано, т.к. установка модов временно отключена
+    def save_ui_snapshot(self):
+        if self._version_entries is None:
+            return
+        ui_snapshot.save(UI_SNAPSHOT_FILE, {
+            "filters": self._version_filters(),
+            "versions": self._version_entries,
+            "selected_version": self.version_selector.currentData(),
+        })
+
+    def closeEvent(self, event):
+        self.save_ui_snapshot()
+        self.install_queue.close() # Прерванные установки продолжатся при следующем запуске
+        if self.cache_server is not None:
+            self.cache_server.stop()
+        get_scheduler().shutdown() # Ожидающие задачи снимаются, выполняющиеся получают отмену
+        super().closeEvent(event)
 
     # --- Установка Модов (временно отключено) ---
     # def _update_mod_install_buttons_state(self):
@@ -2309,105 +2619,22 @@ class NovaLauncher(QMainWindow): # Переименован класс
 
 
 # --- Вспомогательные классы ---
-# (MinecraftVersionInstaller, SidebarButton, CustomProgressBar остаются без изменений)
-class MinecraftVersionInstaller(QThread):
-    """Поток для установки/проверки версии Minecraft и Java Runtime."""
-    progress = Signal(int, str) # (value: 0-100 or -1, status: str)
-    finished = Signal(str) # Возвращаем путь к Java
-    error = Signal(str)
-
-    def __init__(self, version, minecraft_directory, java_path=None):
-        super().__init__()
-        self.version = version
-        self.minecraft_directory = minecraft_directory
-        self.user_java_path = java_path if java_path else None
-        self.final_java_path = None # Инициализируем здесь
-        print(f"Installer Thread: Version={self.version}, Dir={self.minecraft_directory}, Java={self.user_java_path}")
-
-    def run(self):
-        callback = {
-            "setStatus": lambda status: self.progress.emit(-1, status),
-            "setProgress": lambda value: self.progress.emit(value, ""),
-            "setMax": lambda value: None
-        }
-        # Определяем целевую версию JVM (можно сделать настраиваемой позже)
-        target_jvm_version = "jre-legacy"
+# (SidebarButton, CustomProgressBar остаются без изменений)
+def installer_callback(watcher: JobWatcher) -> dict:
+    """Callback-словарь для core.installer: прогресс в процентах уходит в JobWatcher.report()."""
+    state = {"max": 0}
 
-        try:
-            effective_java_path = self.user_java_path
-            self.final_java_path = None # Сбрасываем перед попыткой
-
-            # 1. Определяем путь к Java
-            if not effective_java_path:
-                print(f"Явный путь к Java не указан, ищем существующую ({target_jvm_version})...")
-                try:
-                    # Ищем конкретную версию JVM
-                    effective_java_path = minecraft_launcher_lib.runtime.get_executable_path(
-                        jvm_version=target_jvm_version, # Указываем версию
-                        minecraft_directory=self.minecraft_directory
-                    )
-                    if effective_java_path:
-                        print(f"Найдена управляемая Java ({target_jvm_version}): {effective_java_path}")
-                    else:
-                        print(f"Управляемая Java ({target_jvm_version}) не найдена.")
-                except Exception as e:
-                    print(f"Ошибка при поиске Java ({target_jvm_version}): {e}")
-                    effective_java_path = None
-
-            # 2. Если Java не найдена или указана пользователем, но не существует,
-            #    пытаемся установить целевую версию JVM
-            if not effective_java_path or (self.user_java_path and not os.path.exists(self.user_java_path)):
-                # Если пользователь указал путь, но он не валиден, игнорируем его
-                if self.user_java_path and not os.path.exists(self.user_java_path):
-                     print(f"Предупреждение: Указанный пользователем путь Java не найден: {self.user_java_path}. Попытка установки {target_jvm_version}.")
-                     effective_java_path = None # Сбрасываем, чтобы точно установить
-
-                print(f"Пытаемся установить Java Runtime ({target_jvm_version})...")
-                callback["setStatus"](f"Установка среды Java ({target_jvm_version})...")
-                try:
-                    # Устанавливаем конкретную версию JVM
-                    minecraft_launcher_lib.runtime.install_jvm_runtime(
-                        jvm_version=target_jvm_version, # Указываем версию
-                        minecraft_directory=self.minecraft_directory,
-                        callback=callback
-                    )
-                    # После установки снова пытаемся получить путь
-                    effective_java_path = minecraft_launcher_lib.runtime.get_executable_path(
-                        jvm_version=target_jvm_version,
-                        minecraft_directory=self.minecraft_directory
-                    )
-                    if not effective_java_path:
-                        raise RuntimeError(f"Не удалось найти {target_jvm_version} даже после попытки установки.")
-                    print(f"Java Runtime ({target_jvm_version}) успешно установлен: {effective_java_path}")
-                except Exception as java_e:
-                    self.error.emit(f"Критическая ошибка: Не удалось установить Java Runtime ({target_jvm_version}): {java_e}")
-                    return # Прерываем выполнение потока
-
-            # На этом этапе у нас должен быть рабочий путь к Java в effective_java_path
-            if not effective_java_path or not os.path.exists(effective_java_path):
-                 self.error.emit(f"Критическая ошибка: Не удалось определить действительный путь к Java.")
-                 return
-
-            # Сохраняем действительный путь к Java
-            self.final_java_path = effective_java_path
-            print(f"Используемый Java: {self.final_java_path}")
-
-            # 3. Установка/Проверка версии Minecraft
-            callback["setStatus"](f"Проверка Minecraft {self.version}...")
-            minecraft_launcher_lib.install.install_minecraft_version(
-                self.version,
-                self.minecraft_directory,
-                callback=callback
-            )
+    def set_max(value):
+        state["max"] = value + 1 # Установщик передает число элементов - 1 (как minecraft_launcher_lib)
 
-            print(f"Установка Minecraft {self.version} завершена.")
-            callback["setStatus"]("Готово к запуску!")
-            self.finished.emit(self.final_java_path) # Сигнал об успешном завершении c путем к Java
+    def set_progress(value):
+        watcher.report(min(100, value * 100 // state["max"]) if state["max"] > 0 else -1, "")
 
-        except Exception as e:
-            print("Ошибка в потоке установщика:")
-            traceback.print_exc()
-            self.error.emit(f"{e}")
+    return {
+        "setStatus": lambda status: watcher.report(-1, status),
+        "setProgress": set_progress,
+        "setMax": set_max,
+    }
 
 class CustomProgressBar(QProgressBar):
     """Прогресс-бар с кастомным стилем."""
@@ -2431,7 +2658,18 @@ if __name__ == "__main__":
     if hasattr(Qt, 'AA_EnableHighDpiScaling'): QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     if hasattr(Qt, 'AA_UseHighDpiPixmaps'): QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
 
-    app = QApplication(sys.argv)
+    with tracing.span("QApplication", "startup"):
+        app = QApplication(sys.argv)
+
+    # Сторож зависаний: пульс по таймеру в GUI-потоке, наблюдатель - в отдельном потоке
+    if "--watchdog" in sys.argv or os.environ.get("NOVA_WATCHDOG") or SettingsManager().get("stall_watchdog"):
+        from core.watchdog import StallWatchdog, HEARTBEAT_INTERVAL_MS
+        stall_watchdog = StallWatchdog(STALL_LOG_FILE)
+        heartbeat_timer = QTimer(app)
+        heartbeat_timer.setInterval(HEARTBEAT_INTERVAL_MS)
+        heartbeat_timer.timeout.connect(stall_watchdog.beat)
+        heartbeat_timer.start()
+        stall_watchdog.start()
 
     # Загрузка шрифта
     main_font = QFont("Arial", 10) # Запасной
@@ -2446,8 +2684,19 @@ if __name__ == "__main__":
     splash = AnimatedSplashScreen()
     splash_font = QFont(main_font); splash_font.setPointSize(36); splash_font.setWeight(QFont.Bold)
     # splash.setFont(splash_font) # Убираем установку шрифта, так как текст убран
-    splash.show()
+    tracing.instant("splash_show")
+    with tracing.span("splash.show", "splash"):
+        splash.show()
     splash.start_animation()
+    if importtime: importtime.mark("splash")
+    startup.configure(STARTUP_STAGES, STARTUP_HISTORY_FILE)
+    startup.add_listener(splash.progress_changed.emit)
+    # Проверка сети стартует сразу и идет, пока показывается сплеш
+    startup.begin("network")
+    get_monitor().add_listener(lambda online: startup.end("network"))
+    get_monitor().set_forced_offline(SettingsManager().get("offline_mode"))
+    get_monitor().check_async()
+    preload_modules_async() # Сеть и minecraft_launcher_lib грузятся, пока крутится сплеш
 
     # Отложенное создание главного окна
     main_window = None
@@ -2456,10 +2705,15 @@ if __name__ == "__main__":
         if main_window is None: # Создаем только один раз
              try: # <<< Добавляем обработку ошибок
                  print("[Launcher] Создание NovaLauncher...") # <<< Лог
-             main_window = NovaLauncher()
+                 with tracing.span("wait_for_preload", "startup"):
+                     wait_for_preload()
+                 main_window = NovaLauncher()
                  # --- Добавляем сюда инициализацию UI после создания окна ---
-                 main_window.apply_styles()
-                 main_window.load_minecraft_versions() # Загружаем версии в комбобокс
+                 with startup.stage("styles"):
+                     main_window.apply_styles()
+                 with startup.stage("versions"):
+                     main_window.restore_ui_snapshot() # Список из прошлого запуска - сразу
+                     main_window.load_minecraft_versions() # Свежий список - в фоне, затем сверка
                  main_window.load_profiles_to_ui()
                  main_window.load_settings_to_ui()
                  main_window.update_profile_widget() # Обновляем виджет профиля
@@ -2469,11 +2723,16 @@ if __name__ == "__main__":
                  main_window.home_button.clicked.connect(lambda: main_window.change_page(0))
                  main_window.profiles_button.clicked.connect(lambda: main_window.change_page(1))
                  main_window.settings_button.clicked.connect(lambda: main_window.change_page(2))
+                 main_window.queue_button.clicked.connect(lambda: main_window.change_page(3))
                  # -----------------------------------------------------------
 
                  print("[Launcher] NovaLauncher создан. Вызов splash.finish()...") # <<< Лог
-             splash.finish(main_window) # Запускаем исчезновение и показ главного окна
+                 splash.finish(main_window) # Запускаем исчезновение и показ главного окна
                  print("[Launcher] splash.finish() вызван.") # <<< Лог
+                 startup.finish() # Длительности этапов - в историю запусков
+                 if importtime:
+                     importtime.mark("window")
+                     importtime.report(IMPORT_REPORT_FILE, watch=DEFERRED_MODULES)
              except Exception as e:
                  print(f"[Launcher] КРИТИЧЕСКАЯ ОШИБКА при создании NovaLauncher: {e}")
                  import traceback
@@ -1,65 +1,166 @@
 import sys
 import os
+import math
+import time
 from PySide6.QtWidgets import (
-    QSplashScreen, QLabel, QWidget, QApplication,
-    QGraphicsDropShadowEffect, QVBoxLayout
+    QSplashScreen, QLabel, QWidget, QApplication, QVBoxLayout
 )
 from PySide6.QtCore import (
-    Qt, QTimer, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup,
-    QPointF, Property, QRect, QObject, Signal, Slot
+    Qt, QTimer, QEasingCurve, QRect, QRectF, QThread, Signal, Slot
 )
 from PySide6.QtGui import (
-    QPixmap, QPainter, QColor, QFont, QFontDatabase, QTransform
+    QPixmap, QImage, QPainter, QColor, QFont, QTransform
 )
 
-# --- Виджет логотипа ---
-class RotatingLogo(QLabel):
-    """Виджет QLabel с вращением и тенью (для эффекта прозрачности)."""
-    def __init__(self, pixmap, parent=None):
-        super().__init__(parent)
-        self.base_pixmap = pixmap
-        self._rotation_angle = 0.0
-        self.setPixmap(self.base_pixmap)
-        self.setAlignment(Qt.AlignCenter)
-
-        self._shadow_effect = QGraphicsDropShadowEffect(self)
-        self._shadow_effect.setBlurRadius(20)
-        self._shadow_effect.setColor(QColor(0, 0, 0, 0)) # Начинаем прозрачной
-        self._shadow_effect.setOffset(5, 5)
-        self.setGraphicsEffect(self._shadow_effect)
-
-    @Property(float)
-    def rotationAngle(self): return self._rotation_angle
-    @rotationAngle.setter
-    def rotationAngle(self, angle): self._rotation_angle = angle % 360; self.update()
-
-    @Property(QColor)
-    def shadowColor(self): return self._shadow_effect.color() if self._shadow_effect else QColor(0,0,0,0)
-    @shadowColor.setter
-    def shadowColor(self, color):
-        if self._shadow_effect: self._shadow_effect.setColor(color)
-
-    @Property(float)
-    def shadowBlurRadius(self): return self._shadow_effect.blurRadius() if self._shadow_effect else 0.0
-    @shadowBlurRadius.setter
-    def shadowBlurRadius(self, radius):
-        if self._shadow_effect: self._shadow_effect.setBlurRadius(max(0, radius))
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
+from core import tracing
+
+# --- Параметры атласа кадров ---
+ATLAS_FPS = 30
+FRAME_BUDGET_MS = 50 # Кадр дольше этого считается медленным
+SLOW_FRAMES_LIMIT = 5 # Столько медленных кадров подряд - переходим на статичную картинку
+
+_atlas_threads = set() # Держим ссылки, пока поток атласа не завершится (сплеш может закрыться раньше)
+
+
+# --- Атлас кадров анимации ---
+class SplashFrameAtlas:
+    """
+    Заранее отрисованные кадры анимации появления/исчезновения логотипа.
+
+    Масштаб, поворот и тень (размытая один раз) запекаются в QImage, так что
+    проигрывание кадра - это один drawImage. Кадры обрезаются по своему
+    содержимому и хранятся вместе со смещением. Атлас живет только в памяти:
+    отрисовать его заново быстрее, чем распаковать сохраненные PNG.
+
+    Кадры добавляются в списки по мере готовности, поэтому сплеш может
+    проигрывать атлас, пока он еще строится в фоновом потоке.
+    """
+
+    def __init__(self, logo: QImage, params: dict):
+        self.logo = logo.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        self.params = params
+        self.appear = [] # [(x, y, QImage)]
+        self.disappear = []
+        self.appear_count = self._frame_count(params["appear_ms"])
+        self.disappear_count = self._frame_count(params["disappear_ms"])
+
+    @staticmethod
+    def _frame_count(duration_ms: float) -> int:
+        return int(math.ceil(duration_ms * ATLAS_FPS / 1000)) + 1
+
+    def is_complete(self) -> bool:
+        return len(self.appear) == self.appear_count and len(self.disappear) == self.disappear_count
+
+    # --- Построение ---
+
+    def build(self):
+        """Отрисовывает все кадры. Можно вызывать из фонового потока."""
+        started = time.perf_counter()
+        shadow, pad = self._make_shadow()
+        for phase, count, frames in (("appear", self.appear_count, self.appear),
+                                     ("disappear", self.disappear_count, self.disappear)):
+            for i in range(count):
+                frames.append(self._render_frame(*self._frame_state(phase, i * 1000 / ATLAS_FPS), shadow, pad))
+        print(f"[Splash] Атлас кадров отрисован за {(time.perf_counter() - started) * 1000:.0f} мс")
+
+    def _frame_state(self, phase: str, t: float):
+        """(масштаб, угол, непрозрачность тени 0..1) в момент t мс от начала фазы."""
+        p = self.params
+        def progress(duration, curve):
+            return curve.valueForProgress(min(1.0, t / duration)) if duration > 0 else 1.0
+        if phase == "appear":
+            back = QEasingCurve(QEasingCurve.OutBack); back.setOvershoot(p["overshoot"])
+            out_cubic = QEasingCurve(QEasingCurve.OutCubic)
+            scale = progress(p["scale_appear_ms"], back)
+            angle = p["rotation_start"] * (1.0 - progress(p["rotation_appear_ms"], out_cubic))
+            shadow = progress(p["shadow_appear_ms"], out_cubic)
+        else:
+            in_out = QEasingCurve(QEasingCurve.InOutQuad)
+            scale = 1.0 - progress(p["disappear_ms"], in_out)
+            angle = p["rotation_offset"] * progress(p["disappear_ms"], in_out)
+            shadow = 1.0 - progress(p["shadow_disappear_ms"], in_out)
+        return scale, angle, shadow
+
+    def _make_shadow(self):
+        """Силуэт логотипа цвета тени, размытый один раз (уменьшение + сглаженное увеличение)."""
+        p = self.params
+        pad = int(p["shadow_blur"])
+        canvas = QImage(self.logo.width() + 2 * pad, self.logo.height() + 2 * pad, QImage.Format_ARGB32_Premultiplied)
+        canvas.fill(Qt.transparent)
+        painter = QPainter(canvas)
+        painter.drawImage(pad, pad, self.logo)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+        painter.fillRect(canvas.rect(), QColor(*p["shadow_color"][:3]))
+        painter.end()
+        step = max(1, pad // 3)
+        small = canvas.scaled(max(1, canvas.width() // step), max(1, canvas.height() // step),
+                              Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        return small.scaled(canvas.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation), pad
+
+    def _render_frame(self, scale, angle, shadow_opacity, shadow, pad):
+        p = self.params
+        size = p["logo_size"] * scale
+        if size < 1:
+            return (0, 0, QImage())
+        window = p["window_size"]
+        ratio = size / self.logo.width()
+        transform = QTransform()
+        transform.translate(window / 2, window / 2); transform.rotate(angle)
+        transform.scale(ratio, ratio); transform.translate(-self.logo.width() / 2, -self.logo.height() / 2)
+
+        offset = p["shadow_offset"]
+        shadow_rect = QRectF(-pad, -pad, shadow.width(), shadow.height())
+        bounds = transform.mapRect(shadow_rect).translated(offset, offset) | transform.mapRect(QRectF(self.logo.rect()))
+        bounds = bounds.toAlignedRect() & QRect(0, 0, window, window)
+        if bounds.isEmpty():
+            return (0, 0, QImage())
+
+        frame = QImage(bounds.size(), QImage.Format_ARGB32_Premultiplied)
+        frame.fill(Qt.transparent)
+        painter = QPainter(frame)
         painter.setRenderHint(QPainter.Antialiasing); painter.setRenderHint(QPainter.SmoothPixmapTransform)
-        cx = self.width() / 2; cy = self.height() / 2
-        painter.translate(cx, cy); painter.rotate(self._rotation_angle); painter.translate(-cx, -cy)
-        pix = self.pixmap()
-        if pix and not pix.isNull():
-            margin = 2 # Небольшой отступ
-            target_rect = self.rect().adjusted(margin, margin, -margin, -margin)
-            painter.drawPixmap(target_rect, pix)
+        painter.translate(-bounds.x(), -bounds.y())
+        if shadow_opacity > 0:
+            painter.save()
+            painter.translate(offset, offset)
+            painter.setTransform(transform, True)
+            painter.setOpacity(shadow_opacity * p["shadow_color"][3] / 255)
+            painter.drawImage(-pad, -pad, shadow)
+            painter.restore()
+        painter.setTransform(transform, True)
+        painter.drawImage(0, 0, self.logo)
+        painter.end()
+        return (bounds.x(), bounds.y(), frame)
+
+
+class FrameAtlasThread(QThread):
+    """Строит атлас кадров вне GUI-потока."""
+    def __init__(self, atlas: SplashFrameAtlas):
+        super().__init__()
+        self.atlas = atlas
+
+    def run(self):
+        try:
+            self.atlas.build()
+        except Exception as e:
+            print(f"[Splash] Ошибка построения атласа кадров: {e}")
 
 
 # --- Красивый и Простой Сплеш-скрин ---
 class AnimatedSplashScreen(QSplashScreen):
-    """Простой сплеш-скрин с красивыми и плавными анимациями."""
+    """
+    Простой сплеш-скрин с красивыми и плавными анимациями.
+
+    Анимация проигрывается из SplashFrameAtlas: на каждом тике таймера
+    выбирается кадр по прошедшему времени и рисуется одним drawImage.
+    Если кадры подряд идут дольше бюджета (GUI-поток занят), сплеш
+    переходит на статичную картинку.
+
+    Под логотипом - полоса прогресса и текущий этап запуска (progress_changed,
+    можно испускать из любого потока).
+    """
+
+    progress_changed = Signal(float, str) # доля 0..1, подпись этапа
 
     # --- Константы Анимации ---
     WINDOW_SIZE = 600
@@ -70,7 +171,13 @@ class AnimatedSplashScreen(QSplashScreen):
     ROTATION_DISAPPEAR_OFFSET = 90.0
     SHADOW_BASE_COLOR = QColor(15, 15, 25, 110) # Темно-синяя, полупрозрачная
     SHADOW_BASE_BLUR = 25.0
+    SHADOW_OFFSET = 5
     SCALE_APPEAR_OVERSHOOT = 1.1 # Насколько масштаб "выпрыгивает" (для OutBack)
+    PROGRESS_WIDTH = 240
+    PROGRESS_TOP = 490 # Ниже логотипа даже с учетом отскока
+    PROGRESS_COLOR = QColor(197, 184, 179) # Основной цвет лаунчера
+    PROGRESS_TRACK_COLOR = QColor(255, 255, 255, 40)
+    STAGE_TEXT_COLOR = QColor(229, 229, 229)
 
     def __init__(self):
         print("[Splash] Init Start (Simple & Beautiful)")
@@ -79,18 +186,37 @@ class AnimatedSplashScreen(QSplashScreen):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.SplashScreen)
         self.setAttribute(Qt.WA_TranslucentBackground); self.setAttribute(Qt.WA_DeleteOnClose)
         self._main_window = None
-        self._current_logo_scale = 0.0
+        self._init_span = tracing.start_span("splash.init", "splash")
+        self._anim_span = tracing.start_span("", "splash") # Заменяется при старте анимаций
 
         logo_path = os.path.join("Resources", "rounded_logo_nova.png")
         self.logo_pixmap = QPixmap(logo_path).scaled(self.LOGO_BASE_SIZE, self.LOGO_BASE_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation) \
                            if os.path.exists(logo_path) else self._create_placeholder_logo(self.LOGO_BASE_SIZE)
 
-        self.logo_label = RotatingLogo(self.logo_pixmap, self)
-        self.logo_label.setGeometry(self._calculate_logo_rect(0))
+        self.atlas = SplashFrameAtlas(self.logo_pixmap.toImage(), self._animation_params())
+        self._atlas_thread = FrameAtlasThread(self.atlas)
+        _atlas_threads.add(self._atlas_thread)
+        self._atlas_thread.finished.connect(lambda thread=self._atlas_thread: _atlas_threads.discard(thread))
+        self._atlas_thread.start()
+
+        self._phase = None # "appear" / "disappear" / None
+        self._phase_started = 0.0
+        self._last_tick = None
+        self._slow_frames = 0
+        self._static = False
+        self._current = None # (x, y, QImage) - кадр на экране
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(1000 // ATLAS_FPS)
+        self._timer.timeout.connect(self._on_tick)
+
+        self._progress = 0.0
+        self._stage_label = ""
+        self._progress_visible = True
+        self.progress_changed.connect(self._on_progress)
 
-        self._appear_group = self._create_appear_animation()
-        self._disappear_group = self._create_disappear_animation()
         self.center_window()
+        self._init_span.end()
         print("[Splash] Init Complete (Simple & Beautiful)")
 
     # --- Вспомогательные методы ---
@@ -99,126 +225,153 @@ class AnimatedSplashScreen(QSplashScreen):
         p = QPainter(pix); p.setPen(QColor(200, 200, 220)); p.setFont(QFont("Arial", size // 4, QFont.Bold))
         p.drawText(pix.rect(), Qt.AlignCenter, "N"); p.end(); return pix
 
-    def _calculate_logo_rect(self, current_visual_size):
-        size = max(0, int(current_visual_size)); x = (self.WINDOW_SIZE - size) // 2; y = (self.WINDOW_SIZE - size) // 2
-         return QRect(x, y, size, size)
-
-    # --- Свойство Масштаба ---
-    @Property(float)
-    def logoScale(self): return self._current_logo_scale
-    @logoScale.setter
-    def logoScale(self, scale):
-        self._current_logo_scale = max(0.0, scale)
-        if hasattr(self, 'logo_label') and self.logo_label:
-            vs = self.LOGO_BASE_SIZE * self._current_logo_scale; self.logo_label.setGeometry(self._calculate_logo_rect(vs))
-            if self.logo_pixmap and not self.logo_pixmap.isNull(): self.logo_label.setPixmap(self.logo_pixmap.scaled(int(vs), int(vs), Qt.KeepAspectRatio, Qt.SmoothTransformation) if vs > 1 else QPixmap())
-
-    # --- Создание Анимаций ---
-    def _create_appear_animation(self):
-        print("[Splash] Creating Appear Animation (Simple & Beautiful)")
-        group = QParallelAnimationGroup(self)
-
-        # Масштаб (с легким отскоком)
-        scale = QPropertyAnimation(self, b"logoScale", group)
-        scale.setDuration(self.APPEAR_DURATION); scale.setStartValue(0.0); scale.setEndValue(1.0)
-        curve_scale = QEasingCurve(QEasingCurve.OutBack) # Красивый отскок
-        curve_scale.setOvershoot(self.SCALE_APPEAR_OVERSHOOT)
-        scale.setEasingCurve(curve_scale); group.addAnimation(scale)
-
-        # Вращение (плавное)
-        rotate = QPropertyAnimation(self.logo_label, b"rotationAngle", group)
-        rotate.setDuration(int(self.APPEAR_DURATION * 1.1)); # Чуть дольше масштаба
-        rotate.setStartValue(self.ROTATION_APPEAR_START); rotate.setEndValue(0.0)
-        rotate.setEasingCurve(QEasingCurve.OutCubic); group.addAnimation(rotate) # Плавный выход
-
-        # Цвет/Прозрачность Тени
-        shadow_c = QPropertyAnimation(self.logo_label, b"shadowColor", group)
-        shadow_c.setDuration(int(self.APPEAR_DURATION * 0.8)) # Появляется быстрее
-        shadow_c.setStartValue(QColor(0,0,0,0)); shadow_c.setEndValue(self.SHADOW_BASE_COLOR)
-        shadow_c.setEasingCurve(QEasingCurve.OutCubic); group.addAnimation(shadow_c)
-
-        # Размытие Тени
-        shadow_b = QPropertyAnimation(self.logo_label, b"shadowBlurRadius", group)
-        shadow_b.setDuration(int(self.APPEAR_DURATION * 0.8))
-        shadow_b.setStartValue(self.SHADOW_BASE_BLUR - 15); shadow_b.setEndValue(self.SHADOW_BASE_BLUR)
-        shadow_b.setEasingCurve(QEasingCurve.OutCubic); group.addAnimation(shadow_b)
-
-        return group
-
-    def _create_disappear_animation(self):
-        print("[Splash] Creating Disappear Animation (Simple & Beautiful)")
-        group = QParallelAnimationGroup(self)
-        curve = QEasingCurve.InOutQuad # Плавное замедление
-
-        # Масштаб
-        scale = QPropertyAnimation(self, b"logoScale", group)
-        scale.setDuration(self.DISAPPEAR_DURATION); scale.setStartValue(1.0); scale.setEndValue(0.0)
-        scale.setEasingCurve(curve); group.addAnimation(scale)
-
-        # Вращение
-        rotate = QPropertyAnimation(self.logo_label, b"rotationAngle", group)
-        rotate.setDuration(self.DISAPPEAR_DURATION); rotate.setEasingCurve(curve)
-        group.addAnimation(rotate) # Start/End в finish
-
-        # Цвет/Прозрачность Тени
-        shadow_c = QPropertyAnimation(self.logo_label, b"shadowColor", group)
-        shadow_c.setDuration(int(self.DISAPPEAR_DURATION * 0.9)) # Исчезает чуть быстрее
-        shadow_c.setStartValue(self.SHADOW_BASE_COLOR); shadow_c.setEndValue(QColor(0,0,0,0))
-        shadow_c.setEasingCurve(curve); group.addAnimation(shadow_c)
-
-        # Размытие Тени
-        shadow_b = QPropertyAnimation(self.logo_label, b"shadowBlurRadius", group)
-        shadow_b.setDuration(int(self.DISAPPEAR_DURATION * 0.9))
-        shadow_b.setStartValue(self.SHADOW_BASE_BLUR); shadow_b.setEndValue(self.SHADOW_BASE_BLUR - 10)
-        shadow_b.setEasingCurve(curve); group.addAnimation(shadow_b)
-
-        group.finished.connect(self._on_disappear_finished)
-        return group
+    def _animation_params(self) -> dict:
+        """Параметры анимации, по которым отрисовываются кадры атласа."""
+        return {
+            "window_size": self.WINDOW_SIZE,
+            "logo_size": self.LOGO_BASE_SIZE,
+            "appear_ms": int(self.APPEAR_DURATION * 1.1), # Вращение чуть дольше масштаба
+            "scale_appear_ms": self.APPEAR_DURATION,
+            "rotation_appear_ms": int(self.APPEAR_DURATION * 1.1),
+            "shadow_appear_ms": int(self.APPEAR_DURATION * 0.8), # Тень появляется быстрее
+            "disappear_ms": self.DISAPPEAR_DURATION,
+            "shadow_disappear_ms": int(self.DISAPPEAR_DURATION * 0.9),
+            "rotation_start": self.ROTATION_APPEAR_START,
+            "rotation_offset": self.ROTATION_DISAPPEAR_OFFSET,
+            "overshoot": self.SCALE_APPEAR_OVERSHOOT,
+            "shadow_color": list(self.SHADOW_BASE_COLOR.getRgb()),
+            "shadow_blur": self.SHADOW_BASE_BLUR,
+            "shadow_offset": self.SHADOW_OFFSET,
+        }
+
+    def _static_frame(self):
+        """Статичная картинка: последний кадр появления или просто логотип без тени."""
+        if len(self.atlas.appear) == self.atlas.appear_count:
+            return self.atlas.appear[-1]
+        image = self.logo_pixmap.toImage()
+        return ((self.WINDOW_SIZE - image.width()) // 2, (self.WINDOW_SIZE - image.height()) // 2, image)
+
+    def _set_frame(self, frame):
+        if frame is self._current:
+            return
+        dirty = QRect()
+        for shown in (self._current, frame):
+            if shown is not None and not shown[2].isNull():
+                dirty |= QRect(shown[0], shown[1], shown[2].width(), shown[2].height())
+        self._current = frame
+        if not dirty.isEmpty():
+            self.update(dirty)
+
+    # --- Прогресс запуска ---
+    def _progress_rect(self) -> QRect:
+        """Область полосы прогресса и подписи этапа."""
+        return QRect((self.WINDOW_SIZE - self.PROGRESS_WIDTH) // 2 - 40, self.PROGRESS_TOP,
+                     self.PROGRESS_WIDTH + 80, 40)
+
+    @Slot(float, str)
+    def _on_progress(self, fraction: float, label: str):
+        self._progress = max(0.0, min(1.0, fraction))
+        self._stage_label = label
+        if self.isVisible() and self._progress_visible:
+            # repaint, а не update: во время тяжелых этапов GUI-поток занят и до цикла событий дело не дойдет
+            self.repaint(self._progress_rect())
+
+    def _paint_progress(self, painter: QPainter):
+        area = self._progress_rect()
+        track = QRectF((self.WINDOW_SIZE - self.PROGRESS_WIDTH) / 2, area.top(), self.PROGRESS_WIDTH, 4)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.PROGRESS_TRACK_COLOR)
+        painter.drawRoundedRect(track, 2, 2)
+        if self._progress > 0:
+            painter.setBrush(self.PROGRESS_COLOR)
+            painter.drawRoundedRect(QRectF(track.left(), track.top(), track.width() * self._progress, track.height()), 2, 2)
+        if self._stage_label:
+            font = QFont(self.font()); font.setPointSize(11); painter.setFont(font)
+            text_rect = QRect(area.left(), area.top() + 10, area.width(), area.height() - 10)
+            painter.setPen(QColor(0, 0, 0, 140)) # Тень для читаемости на любом фоне
+            painter.drawText(text_rect.translated(1, 1), Qt.AlignHCenter | Qt.AlignTop, self._stage_label)
+            painter.setPen(self.STAGE_TEXT_COLOR)
+            painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop, self._stage_label)
+
+    # --- Проигрывание ---
+    def _start_phase(self, phase: str):
+        self._phase = phase
+        self._phase_started = time.perf_counter()
+        self._last_tick = None
+        self._slow_frames = 0
+        self._on_tick()
+        self._timer.start()
+
+    @Slot()
+    def _on_tick(self):
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            frame_ms = (now - self._last_tick) * 1000
+            self._slow_frames = self._slow_frames + 1 if frame_ms > FRAME_BUDGET_MS else 0
+            if self._slow_frames >= SLOW_FRAMES_LIMIT:
+                self._switch_to_static(frame_ms)
+                return
+        self._last_tick = now
+
+        frames, count = (self.atlas.appear, self.atlas.appear_count) if self._phase == "appear" \
+                        else (self.atlas.disappear, self.atlas.disappear_count)
+        index = min(count - 1, int((now - self._phase_started) * ATLAS_FPS))
+        if frames:
+            self._set_frame(frames[min(index, len(frames) - 1)]) # Атлас еще строится - держим последний готовый
+        if index == count - 1 and len(frames) == count:
+            self._timer.stop()
+            if self._phase == "appear":
+                self._on_appear_finished()
+            else:
+                self._on_disappear_finished()
+
+    def _switch_to_static(self, frame_ms: float):
+        print(f"[Splash] Кадры слишком медленные ({frame_ms:.0f} мс), показываем статичную картинку")
+        tracing.instant("splash_static_fallback", frame_ms=round(frame_ms, 1))
+        self._timer.stop()
+        self._static = True
+        self._set_frame(self._static_frame())
+        if self._phase == "appear":
+            self._anim_span.end(static=True)
+        elif self._phase == "disappear":
+            self._on_disappear_finished()
 
     # --- Управление анимацией ---
     def start_animation(self):
         print("[Splash] Start Appear (Simple & Beautiful)")
-        self.logoScale = 0.0
-        self.logo_label.rotationAngle = self.ROTATION_APPEAR_START
-        self.logo_label.shadowColor = QColor(0,0,0,0)
-        self.logo_label.shadowBlurRadius = self.SHADOW_BASE_BLUR - 15
-        self.show(); self._appear_group.start()
+        self._anim_span = tracing.start_span("splash.appear", "splash")
+        self.show()
+        self._start_phase("appear")
         print("[Splash] Appear Started (Simple & Beautiful)")
-    
+
+    @Slot()
+    def _on_appear_finished(self):
+        self._anim_span.end()
+        tracing.instant("splash_appear_finished")
+
     def finish(self, window):
         print("[Splash] Start Disappear (Simple & Beautiful)")
-        if self._appear_group and self._appear_group.state() == QPropertyAnimation.Running:
-            print("[Splash] Stopping Appear Anim (Simple & Beautiful)")
-            self._appear_group.stop()
         self._main_window = window
-
-        current_scale = self.logoScale
-        current_angle = self.logo_label.rotationAngle
-        current_shadow_color = self.logo_label.shadowColor
-        current_shadow_blur = self.logo_label.shadowBlurRadius
-
-        try:
-            scale_anim = self._disappear_group.animationAt(0)
-            rotate_anim = self._disappear_group.animationAt(1)
-            color_anim = self._disappear_group.animationAt(2)
-            blur_anim = self._disappear_group.animationAt(3)
-
-            if isinstance(scale_anim, QPropertyAnimation): scale_anim.setStartValue(current_scale)
-            if isinstance(rotate_anim, QPropertyAnimation):
-                rotate_anim.setStartValue(current_angle)
-                rotate_anim.setEndValue(current_angle + self.ROTATION_DISAPPEAR_OFFSET)
-            if isinstance(color_anim, QPropertyAnimation): color_anim.setStartValue(current_shadow_color)
-            if isinstance(blur_anim, QPropertyAnimation): blur_anim.setStartValue(current_shadow_blur)
-
-        except IndexError as ie: print(f"[Splash] IndexError setting disappear start values: {ie}")
-        except Exception as e: print(f"[Splash] Error setting disappear start values: {e}")
-        finally:
-             self._disappear_group.start()
-             print("[Splash] Disappear Started (Simple & Beautiful)")
+        if self._phase == "appear" and self._timer.isActive():
+            print("[Splash] Stopping Appear Anim (Simple & Beautiful)")
+            self._timer.stop()
+            self._anim_span.end(interrupted=True)
+        self._anim_span = tracing.start_span("splash.disappear", "splash")
+        self._progress_visible = False
+        self.update(self._progress_rect())
+        if self._static or not self.atlas.disappear:
+            # Без анимации: статичная картинка или кадры исчезновения еще не готовы
+            self._phase = "disappear"
+            self._on_disappear_finished()
+            return
+        self._start_phase("disappear")
+        print("[Splash] Disappear Started (Simple & Beautiful)")
 
     @Slot()
     def _on_disappear_finished(self):
         print("[Splash] Disappear Finished (Simple & Beautiful)")
+        self._anim_span.end()
         self._show_main_window()
 
     def _show_main_window(self):
@@ -238,7 +391,15 @@ class AnimatedSplashScreen(QSplashScreen):
         try: screen = QApplication.primaryScreen().geometry(); self.move(screen.center().x()-self.width()//2, screen.center().y()-self.height()//2)
         except Exception as e: print(f"[Splash] Error Centering Splash: {e}")
 
-    def paintEvent(self, event): super().paintEvent(event)
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        painter = QPainter(self)
+        if self._current is not None and not self._current[2].isNull():
+            x, y, image = self._current
+            painter.drawImage(x, y, image)
+        if self._progress_visible:
+            self._paint_progress(painter)
+        painter.end()
 
 # --- Тестовый запуск ---
 if __name__ == '__main__':
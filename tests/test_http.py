@@ -0,0 +1,102 @@
+"""
+Загрузка файлов общим HTTP-клиентом (core.http): проверка и докачка .part.
+Источник в тестах - CacheServer с заранее сложенным файлом.
+"""
+import os
+import sys
+import shutil
+import hashlib
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.http import HttpClient, ChecksumError, PART_SUFFIX
+from core.mirror import CacheServer
+from core.file_index import VerifiedFileIndex
+
+FILE_PATH = "/org/example/demo/1.0/demo-1.0.jar"
+FILE_DATA = bytes(range(256)) * 64 # 16 КБ
+FILE_SHA1 = hashlib.sha1(FILE_DATA).hexdigest()
+
+
+class DownloadTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        data_dir = os.path.join(self.root, "data")
+        source = os.path.join(data_dir, "libraries", *FILE_PATH.strip("/").split("/"))
+        os.makedirs(os.path.dirname(source))
+        with open(source, 'wb') as f:
+            f.write(FILE_DATA)
+        self.server = CacheServer(data_dir, host="127.0.0.1", port=0, fetch_missing=False)
+        self.server.start()
+        self.url = f"http://127.0.0.1:{self.server.port}/libraries.minecraft.net{FILE_PATH}"
+        self.target = os.path.join(self.root, "client", "demo-1.0.jar")
+        self.client = HttpClient(retries=0)
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write_part(self, data: bytes):
+        os.makedirs(os.path.dirname(self.target), exist_ok=True)
+        with open(self.target + PART_SUFFIX, 'wb') as f:
+            f.write(data)
+
+    def _assert_downloaded(self):
+        with open(self.target, 'rb') as f:
+            self.assertEqual(f.read(), FILE_DATA)
+        self.assertFalse(os.path.exists(self.target + PART_SUFFIX))
+
+    def test_resume_valid_part(self):
+        self._write_part(FILE_DATA[:1000])
+        self.assertTrue(self.client.download(self.url, self.target, sha1=FILE_SHA1, size=len(FILE_DATA)))
+        self._assert_downloaded()
+        self.assertEqual(self.client.received_bytes(), len(FILE_DATA) - 1000)
+
+    def test_garbage_part_is_downloaded_again(self):
+        self._write_part(b"\xff" * 1000)
+        self.assertTrue(self.client.download(self.url, self.target, sha1=FILE_SHA1, size=len(FILE_DATA)))
+        self._assert_downloaded()
+
+    def test_garbage_part_without_size(self):
+        self._write_part(b"\xff" * 1000)
+        self.assertTrue(self.client.download(self.url, self.target, sha1=FILE_SHA1))
+        self._assert_downloaded()
+
+    def test_full_size_garbage_part(self):
+        self._write_part(b"\xff" * len(FILE_DATA)) # Докачивать нечего - без перезагрузки не обойтись
+        self.assertTrue(self.client.download(self.url, self.target, sha1=FILE_SHA1, size=len(FILE_DATA)))
+        self._assert_downloaded()
+
+    def test_wrong_source_still_fails(self):
+        self._write_part(b"\xff" * 1000)
+        with self.assertRaises(ChecksumError):
+            self.client.download(self.url, self.target, sha1="0" * 40)
+        self.assertFalse(os.path.exists(self.target))
+        self.assertFalse(os.path.exists(self.target + PART_SUFFIX))
+
+    def test_verified_file_is_not_hashed_again(self):
+        index = VerifiedFileIndex(self.root)
+        self.assertTrue(self.client.download(self.url, self.target, sha1=FILE_SHA1, size=len(FILE_DATA), verified=index))
+        index.save()
+        stat = os.stat(self.target)
+        with open(self.target, 'r+b') as f:
+            f.write(b"\xff") # Подмена того же размера с прежним mtime - индекс ей верит
+        os.utime(self.target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        index = VerifiedFileIndex(self.root) # Индекс читается из файла
+        self.assertFalse(self.client.download(self.url, self.target, sha1=FILE_SHA1, size=len(FILE_DATA), verified=index))
+
+    def test_changed_file_is_checked_again(self):
+        index = VerifiedFileIndex(self.root)
+        self.client.download(self.url, self.target, sha1=FILE_SHA1, size=len(FILE_DATA), verified=index)
+        stat = os.stat(self.target)
+        with open(self.target, 'r+b') as f:
+            f.write(b"\xff")
+        os.utime(self.target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertTrue(self.client.download(self.url, self.target, sha1=FILE_SHA1, size=len(FILE_DATA), verified=index))
+        self._assert_downloaded()
+
+
+if __name__ == "__main__":
+    unittest.main()
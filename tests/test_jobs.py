@@ -0,0 +1,89 @@
+"""
+Общий планировщик (core.jobs): слияние задач с одним ключом и отмена
+присоединившихся к ним вызывающих.
+"""
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.jobs import JobScheduler, CancelToken
+
+
+class SharedJobTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = JobScheduler(max_workers=2)
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.runs = 0
+
+    def tearDown(self):
+        self.release.set()
+        self.scheduler.shutdown(wait=True)
+
+    def _submit(self, key="install"):
+        token = CancelToken()
+
+        def work():
+            self.runs += 1
+            self.started.set()
+            while not self.release.wait(0.01):
+                token.raise_if_cancelled()
+            return "done"
+        return self.scheduler.submit(work, key=key, cancel_token=token, shared={"owner": token})
+
+    def test_joined_job_runs_once(self):
+        first, second = self._submit(), self._submit()
+        self.assertIsNot(first, second)
+        self.assertIs(first.shared, second.shared)
+        self.release.set()
+        self.assertEqual((first.result(5), second.result(5)), ("done", "done"))
+        self.assertEqual(self.runs, 1)
+
+    def test_cancel_one_subscriber_keeps_work(self):
+        first = self._submit()
+        self.assertTrue(self.started.wait(5))
+        second = self._submit()
+        first.cancel()
+        self.assertTrue(first.cancelled)
+        self.assertFalse(first.token.cancelled)
+        self.release.set()
+        self.assertEqual(second.result(5), "done")
+
+    def test_cancel_all_subscribers_stops_work(self):
+        first = self._submit()
+        self.assertTrue(self.started.wait(5))
+        second = self._submit()
+        second.cancel()
+        first.cancel()
+        first.exception(5)
+        second.exception(5)
+        self.assertTrue(first.cancelled and second.cancelled)
+        self.assertTrue(first.token.cancelled)
+
+    def test_pending_work_cancelled_by_everyone_never_runs(self):
+        blockers = [self._submit(key=f"busy-{i}") for i in range(2)] # Заняты все потоки
+        first, second = self._submit(), self._submit()
+        first.cancel()
+        second.cancel()
+        self.assertTrue(first.cancelled and second.cancelled)
+        self.release.set()
+        for blocker in blockers:
+            blocker.result(5)
+        self.assertEqual(self.runs, 2)
+
+    def test_cancelled_work_is_not_joined(self):
+        first = self._submit()
+        self.assertTrue(self.started.wait(5))
+        first.cancel()
+        second = self._submit()
+        self.assertIsNot(second.token, first.token)
+        first.exception(5)
+        self.release.set()
+        self.assertEqual(second.result(5), "done")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Зеркало загрузок и раздача кэша (core.mirror): раскладка путей,
+защита от выхода за папки раздачи и загрузка через CacheServer.
+"""
+import os
+import sys
+import shutil
+import hashlib
+import tempfile
+import unittest
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.http import HttpClient, PART_SUFFIX
+from core.mirror import CacheServer, mirror_url
+
+LIBRARY_PATH = "/org/example/demo/1.0/demo-1.0.jar"
+LIBRARY_URL = "https://libraries.minecraft.net" + LIBRARY_PATH
+LIBRARY_DATA = bytes(range(256)) * 1024 # 256 КБ - несколько кусков загрузки
+
+
+class MirrorUrlTest(unittest.TestCase):
+    def test_mojang_hosts_are_mirrored(self):
+        self.assertEqual(mirror_url("http://lan:8770/", LIBRARY_URL),
+                         "http://lan:8770/libraries.minecraft.net" + LIBRARY_PATH)
+
+    def test_other_hosts_and_no_mirror(self):
+        self.assertIsNone(mirror_url("http://lan:8770", "https://example.com/file.jar"))
+        self.assertIsNone(mirror_url("", LIBRARY_URL))
+
+
+class CacheServerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.root, "data")
+        library = os.path.join(self.data_dir, "libraries", *LIBRARY_PATH.strip("/").split("/"))
+        os.makedirs(os.path.dirname(library))
+        with open(library, 'wb') as f:
+            f.write(LIBRARY_DATA)
+        with open(os.path.join(self.data_dir, "settings.json"), 'w', encoding='utf-8') as f:
+            f.write("{}")
+        self.server = CacheServer(self.data_dir, host="127.0.0.1", port=0, fetch_missing=False)
+        self.server.start()
+        self.base = f"http://127.0.0.1:{self.server.port}"
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_local_path_stays_inside_roots(self):
+        host = "libraries.minecraft.net"
+        libraries = os.path.realpath(os.path.join(self.data_dir, "libraries"))
+        self.assertEqual(self.server.local_path(host, LIBRARY_PATH),
+                         os.path.join(libraries, *LIBRARY_PATH.strip("/").split("/")))
+        for path in ("/../settings.json", "/a/../../settings.json", "/..\\..\\..\\settings.json",
+                     "/C:\\Windows\\win.ini", "/C:/Windows/win.ini", "/\\\\server\\share\\file",
+                     "/a\\..\\..\\settings.json", "/"):
+            self.assertIsNone(self.server.local_path(host, path), path)
+        self.assertIsNone(self.server.local_path("example.com", LIBRARY_PATH))
+
+    @unittest.skipUnless(hasattr(os, "symlink") and os.name != "nt", "нужны символические ссылки")
+    def test_symlink_out_of_root_is_refused(self):
+        link = os.path.join(self.data_dir, "libraries", "escape")
+        os.symlink(self.data_dir, link)
+        self.assertIsNone(self.server.local_path("libraries.minecraft.net", "/escape/settings.json"))
+
+    def test_traversal_requests_get_404(self):
+        for path in ("/libraries.minecraft.net/..%5C..%5C..%5Csettings.json",
+                     "/libraries.minecraft.net/C:%5CWindows%5Cwin.ini",
+                     "/libraries.minecraft.net/%2E%2E/settings.json"):
+            response = requests.get(self.base + path, timeout=5)
+            self.assertEqual(response.status_code, 404, path)
+
+    def test_range_request(self):
+        response = requests.get(self.base + "/libraries.minecraft.net" + LIBRARY_PATH,
+                                headers={"Range": "bytes=100-199"}, timeout=5)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers["Content-Range"], f"bytes 100-199/{len(LIBRARY_DATA)}")
+        self.assertEqual(response.content, LIBRARY_DATA[100:200])
+
+    def test_download_through_mirror_resumes_part(self):
+        client = HttpClient(mirror=self.base, retries=0)
+        target = os.path.join(self.root, "client", "demo-1.0.jar")
+        os.makedirs(os.path.dirname(target))
+        with open(target + PART_SUFFIX, 'wb') as f:
+            f.write(LIBRARY_DATA[:1000]) # Прерванная загрузка - докачивается запросом Range
+        served = self.server.served
+        self.assertTrue(client.download(LIBRARY_URL, target, sha1=hashlib.sha1(LIBRARY_DATA).hexdigest(),
+                                        size=len(LIBRARY_DATA)))
+        with open(target, 'rb') as f:
+            self.assertEqual(f.read(), LIBRARY_DATA)
+        self.assertEqual(self.server.served, served + 1)
+        self.assertEqual(client.received_bytes(), len(LIBRARY_DATA) - 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()